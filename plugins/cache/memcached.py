@@ -12,6 +12,7 @@ name: memcached
 short_description: Use memcached DB for cache
 description:
   - This cache uses JSON formatted, per host records saved in memcached.
+  - The records can optionally be compressed, see O(_compression).
 requirements:
   - memcache (python lib)
 options:
@@ -35,6 +36,31 @@ options:
     ini:
       - key: fact_caching_prefix
         section: defaults
+  _compression:
+    description:
+      - Compression applied to the JSON formatted records before they are stored in memcached.
+      - Records are only compressed if they are at least O(_compression_threshold) bytes long.
+      - Records written with any compression, or by older versions of this plugin, can always be read.
+    type: string
+    choices: [none, zlib, lzma]
+    default: none
+    env:
+      - name: ANSIBLE_CACHE_MEMCACHED_COMPRESSION
+    ini:
+      - key: fact_caching_memcached_compression
+        section: defaults
+    version_added: 10.5.0
+  _compression_threshold:
+    description:
+      - Minimum size in bytes of a JSON formatted record for O(_compression) to be applied.
+    type: integer
+    default: 1024
+    env:
+      - name: ANSIBLE_CACHE_MEMCACHED_COMPRESSION_THRESHOLD
+    ini:
+      - key: fact_caching_memcached_compression_threshold
+        section: defaults
+    version_added: 10.5.0
   _timeout:
     default: 86400
     type: integer
@@ -56,8 +82,15 @@ from itertools import chain
 from ansible.errors import AnsibleError
 from ansible.module_utils.common._collections_compat import MutableSet
 from ansible.plugins.cache import BaseCacheModule
+from ansible.module_utils.six import binary_type, text_type
 from ansible.utils.display import Display
 
+from ansible_collections.community.general.plugins.plugin_utils.cache_codec import (
+    check_compression,
+    decode_value,
+    encode_value,
+)
+
 try:
     import memcache
     HAS_MEMCACHE = True
@@ -181,6 +214,9 @@ class CacheModule(BaseCacheModule):
             connection = self.get_option('_uri')
         self._timeout = self.get_option('_timeout')
         self._prefix = self.get_option('_prefix')
+        self._compression = self.get_option('_compression')
+        self._compression_threshold = int(self.get_option('_compression_threshold'))
+        check_compression(self._compression)
 
         if not HAS_MEMCACHE:
             raise AnsibleError("python-memcached is required for the memcached fact cache")
@@ -206,12 +242,18 @@ class CacheModule(BaseCacheModule):
             if value is None:
                 self.delete(key)
                 raise KeyError
+            # records written by older versions of this plugin are pickled by the memcache library
+            if isinstance(value, (binary_type, text_type)):
+                value = decode_value(value)
             self._cache[key] = value
 
         return self._cache.get(key)
 
     def set(self, key, value):
-        self._db.set(self._make_key(key), value, time=self._timeout, min_compress_len=1)
+        # let the memcache library compress the record unless the codec already did
+        min_compress_len = 1 if self._compression == 'none' else 0
+        self._db.set(self._make_key(key), encode_value(value, self._compression, self._compression_threshold),
+                     time=self._timeout, min_compress_len=min_compress_len)
         self._cache[key] = value
         self._keys.add(key)
 
@@ -11,6 +11,7 @@ name: redis
 short_description: Use Redis DB for cache
 description:
   - This cache uses JSON formatted, per host records saved in Redis.
+  - The records can optionally be compressed, see O(_compression).
 requirements:
   - redis>=2.4.5 (python lib)
 options:
@@ -55,6 +56,67 @@ options:
       - key: fact_caching_redis_sentinel
         section: defaults
     version_added: 1.3.0
+  _batch_size:
+    description:
+      - Number of keys fetched with a single C(MGET) command when several hosts are read at once, for example when copying the cache.
+    type: integer
+    default: 500
+    env:
+      - name: ANSIBLE_CACHE_REDIS_BATCH_SIZE
+    ini:
+      - key: fact_caching_redis_batch_size
+        section: defaults
+    version_added: 10.5.0
+  _compression:
+    description:
+      - Compression applied to the JSON formatted records before they are stored in Redis.
+      - Records are only compressed if they are at least O(_compression_threshold) bytes long.
+      - Records written with any compression, or by older versions of this plugin, can always be read.
+    type: string
+    choices: [none, zlib, lzma]
+    default: none
+    env:
+      - name: ANSIBLE_CACHE_REDIS_COMPRESSION
+    ini:
+      - key: fact_caching_redis_compression
+        section: defaults
+    version_added: 10.5.0
+  _compression_threshold:
+    description:
+      - Minimum size in bytes of a JSON formatted record for O(_compression) to be applied.
+    type: integer
+    default: 1024
+    env:
+      - name: ANSIBLE_CACHE_REDIS_COMPRESSION_THRESHOLD
+    ini:
+      - key: fact_caching_redis_compression_threshold
+        section: defaults
+    version_added: 10.5.0
+  _expire_interval:
+    description:
+      - Minimum number of seconds between two removals of expired keys from the keyset.
+      - Set to V(0) to remove expired keys on every key lookup.
+    type: float
+    default: 0
+    env:
+      - name: ANSIBLE_CACHE_REDIS_EXPIRE_INTERVAL
+    ini:
+      - key: fact_caching_redis_expire_interval
+        section: defaults
+    version_added: 10.5.0
+  _local_cache_size:
+    description:
+      - Maximum number of host records kept in memory by the plugin. The least recently used records are evicted first,
+        and read again from Redis when needed.
+      - Set to V(0) to keep all records in memory.
+    type: integer
+    default: 5000
+    env:
+      - name: ANSIBLE_CACHE_REDIS_LOCAL_CACHE_SIZE
+    ini:
+      - key: fact_caching_redis_local_cache_size
+        section: defaults
+    version_added: 10.5.0
   _timeout:
     default: 86400
     type: integer
@@ -69,13 +131,19 @@ options:
 
 import re
 import time
-import json
+
+from collections import OrderedDict
 
 from ansible.errors import AnsibleError
-from ansible.parsing.ajson import AnsibleJSONEncoder, AnsibleJSONDecoder
 from ansible.plugins.cache import BaseCacheModule
 from ansible.utils.display import Display
 
+from ansible_collections.community.general.plugins.plugin_utils.cache_codec import (
+    check_compression,
+    decode_value,
+    encode_value,
+)
+
 try:
     from redis import StrictRedis, VERSION
     HAS_REDIS = True
@@ -93,6 +161,9 @@ class CacheModule(BaseCacheModule):
     when they are inserted. This allows for the usage of 'zremrangebyscore'
     to expire keys. This mechanism is used or a pattern matched 'scan' for
     performance.
+
+    Values read from or written to redis are kept in a local LRU cache,
+    and several keys are read with a single 'mget' where possible.
     """
     _sentinel_service_name = None
     re_url_conn = re.compile(r'^([^:]+|\[[^]]+\]):(\d+):(\d+)(?::(.*))?$')
@@ -108,11 +179,18 @@ class CacheModule(BaseCacheModule):
         self._prefix = self.get_option('_prefix')
         self._keys_set = self.get_option('_keyset_name')
         self._sentinel_service_name = self.get_option('_sentinel_service_name')
+        self._batch_size = max(int(self.get_option('_batch_size')), 1)
+        self._expire_interval = float(self.get_option('_expire_interval'))
+        self._local_cache_size = int(self.get_option('_local_cache_size'))
+        self._last_expiry = None
+        self._compression = self.get_option('_compression')
+        self._compression_threshold = int(self.get_option('_compression_threshold'))
+        check_compression(self._compression)
 
         if not HAS_REDIS:
             raise AnsibleError("The 'redis' python module (version 2.4.5 or newer) is required for the redis fact cache, 'pip install redis'")
 
-        self._cache = {}
+        self._cache = OrderedDict()
         kw = {}
 
         # tls connection
@@ -172,36 +250,79 @@ class CacheModule(BaseCacheModule):
     def _make_key(self, key):
         return self._prefix + key
 
+    def _cache_value(self, key, value):
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        if self._local_cache_size > 0:
+            while len(self._cache) > self._local_cache_size:
+                self._cache.popitem(last=False)
+
+    def _load_value(self, key, value):
+        # guard against the key not being removed from the zset;
+        # this could happen in cases where the timeout value is changed
+        # between invocations
+        if value is None:
+            self.delete(key)
+            raise KeyError
+        value = decode_value(value)
+        self._cache_value(key, value)
+        return value
+
     def get(self, key):
 
-        if key not in self._cache:
-            value = self._db.get(self._make_key(key))
-            # guard against the key not being removed from the zset;
-            # this could happen in cases where the timeout value is changed
-            # between invocations
-            if value is None:
-                self.delete(key)
-                raise KeyError
-            self._cache[key] = json.loads(value, cls=AnsibleJSONDecoder)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        return self._load_value(key, self._db.get(self._make_key(key)))
 
-        return self._cache.get(key)
+    def get_many(self, keys):
+        """
+        Return a dict with the values of all given keys which are present
+        in the cache. Values missing from the local cache are read from
+        redis in batches of _batch_size keys.
+        """
+        ret = {}
+        missing = []
+        for key in keys:
+            if key in self._cache:
+                ret[key] = self.get(key)
+            else:
+                missing.append(key)
+
+        for start in range(0, len(missing), self._batch_size):
+            batch = missing[start:start + self._batch_size]
+            values = self._db.mget([self._make_key(key) for key in batch])
+            for key, value in zip(batch, values):
+                try:
+                    ret[key] = self._load_value(key, value)
+                except KeyError:
+                    pass
+
+        return ret
 
     def set(self, key, value):
 
-        value2 = json.dumps(value, cls=AnsibleJSONEncoder, sort_keys=True, indent=4)
+        value2 = encode_value(value, self._compression, self._compression_threshold)
+        pipe = self._db.pipeline(transaction=False)
         if self._timeout > 0:  # a timeout of 0 is handled as meaning 'never expire'
-            self._db.setex(self._make_key(key), int(self._timeout), value2)
+            pipe.setex(self._make_key(key), int(self._timeout), value2)
         else:
-            self._db.set(self._make_key(key), value2)
+            pipe.set(self._make_key(key), value2)
 
         if VERSION[0] == 2:
-            self._db.zadd(self._keys_set, time.time(), key)
+            pipe.zadd(self._keys_set, time.time(), key)
         else:
-            self._db.zadd(self._keys_set, {key: time.time()})
-        self._cache[key] = value
+            pipe.zadd(self._keys_set, {key: time.time()})
+        pipe.execute()
+        self._cache_value(key, value)
 
     def _expire_keys(self):
         if self._timeout > 0:
+            now = time.monotonic()
+            if self._last_expiry is not None and now - self._last_expiry < self._expire_interval:
+                return
+            self._last_expiry = now
             expiry_age = time.time() - self._timeout
             self._db.zremrangebyscore(self._keys_set, 0, expiry_age)
 
@@ -216,17 +337,17 @@ class CacheModule(BaseCacheModule):
     def delete(self, key):
         if key in self._cache:
             del self._cache[key]
-        self._db.delete(self._make_key(key))
-        self._db.zrem(self._keys_set, key)
+        pipe = self._db.pipeline(transaction=False)
+        pipe.delete(self._make_key(key))
+        pipe.zrem(self._keys_set, key)
+        pipe.execute()
 
     def flush(self):
         for key in list(self.keys()):
             self.delete(key)
 
     def copy(self):
-        # TODO: there is probably a better way to do this in redis
-        ret = {k: self.get(k) for k in self.keys()}
-        return ret
+        return self.get_many(self.keys())
 
     def __getstate__(self):
         return dict()
@@ -17,6 +17,8 @@ version_added: "2.4.0"
 requirements:
   - Whitelisting this callback plugin.
   - An Azure log analytics work space has been established.
+extends_documentation_fragment:
+  - community.general.event_shipper
 options:
   workspace_id:
     description: Workspace ID of the Azure log analytics workspace.
@@ -36,6 +38,42 @@ options:
     ini:
       - section: callback_loganalytics
         key: shared_key
+  async_delivery:
+    env:
+      - name: LOGANALYTICS_ASYNC_DELIVERY
+    ini:
+      - section: callback_loganalytics
+        key: async_delivery
+  batch_max_events:
+    env:
+      - name: LOGANALYTICS_BATCH_MAX_EVENTS
+    ini:
+      - section: callback_loganalytics
+        key: batch_max_events
+  batch_max_bytes:
+    env:
+      - name: LOGANALYTICS_BATCH_MAX_BYTES
+    ini:
+      - section: callback_loganalytics
+        key: batch_max_bytes
+  flush_interval:
+    env:
+      - name: LOGANALYTICS_FLUSH_INTERVAL
+    ini:
+      - section: callback_loganalytics
+        key: flush_interval
+  queue_size:
+    env:
+      - name: LOGANALYTICS_QUEUE_SIZE
+    ini:
+      - section: callback_loganalytics
+        key: queue_size
+  retries:
+    env:
+      - name: LOGANALYTICS_RETRIES
+    ini:
+      - section: callback_loganalytics
+        key: retries
 """
 
 EXAMPLES = r"""
@@ -69,6 +107,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper
 
 
 class AzureLogAnalyticsSource(object):
@@ -80,6 +119,7 @@ class AzureLogAnalyticsSource(object):
         self.host = socket.gethostname()
         self.user = getpass.getuser()
         self.extra_vars = ""
+        self.shipper = None
 
     def __build_signature(self, date, workspace_id, shared_key, content_length):
         # Build authorisation signature for Azure log analytics API call
@@ -98,6 +138,24 @@ class AzureLogAnalyticsSource(object):
     def __rfc1123date(self):
         return now().strftime('%a, %d %b %Y %H:%M:%S GMT')
 
+    def post(self, workspace_id, shared_key, jsondata):
+        content_length = len(jsondata)
+        rfc1123date = self.__rfc1123date()
+        signature = self.__build_signature(rfc1123date, workspace_id, shared_key, content_length)
+        workspace_url = self.__build_workspace_url(workspace_id)
+
+        open_url(
+            workspace_url,
+            jsondata,
+            headers={
+                'content-type': 'application/json',
+                'Authorization': signature,
+                'Log-Type': 'ansible_playbook',
+                'x-ms-date': rfc1123date
+            },
+            method='POST'
+        )
+
     def send_event(self, workspace_id, shared_key, state, result, runtime):
         if result._task_fields['args'].get('_ansible_check_mode') is True:
             self.ansible_check_mode = True
@@ -137,22 +195,11 @@ class AzureLogAnalyticsSource(object):
 
         # Preparing the playbook logs as JSON format and send to Azure log analytics
         jsondata = json.dumps({'event': data}, cls=AnsibleJSONEncoder, sort_keys=True)
-        content_length = len(jsondata)
-        rfc1123date = self.__rfc1123date()
-        signature = self.__build_signature(rfc1123date, workspace_id, shared_key, content_length)
-        workspace_url = self.__build_workspace_url(workspace_id)
 
-        open_url(
-            workspace_url,
-            jsondata,
-            headers={
-                'content-type': 'application/json',
-                'Authorization': signature,
-                'Log-Type': 'ansible_playbook',
-                'x-ms-date': rfc1123date
-            },
-            method='POST'
-        )
+        if self.shipper is not None:
+            self.shipper.put(jsondata)
+        else:
+            self.post(workspace_id, shared_key, jsondata)
 
 
 class CallbackModule(CallbackBase):
@@ -179,6 +226,11 @@ class CallbackModule(CallbackBase):
         self.workspace_id = self.get_option('workspace_id')
         self.shared_key = self.get_option('shared_key')
 
+        if self.get_option('async_delivery'):
+            # the data collector API accepts a JSON array of records
+            self.loganalytics.shipper = EventShipper.from_options(
+                self, lambda events: self.loganalytics.post(self.workspace_id, self.shared_key, f"[{','.join(events)}]"))
+
     def v2_playbook_on_play_start(self, play):
         vm = play.get_variable_manager()
         extra_vars = vm.extra_vars
@@ -187,6 +239,10 @@ class CallbackModule(CallbackBase):
     def v2_playbook_on_start(self, playbook):
         self.loganalytics.ansible_playbook = basename(playbook._file_name)
 
+    def v2_playbook_on_stats(self, stats):
+        if self.loganalytics.shipper is not None:
+            self.loganalytics.shipper.report('Azure Log Analytics')
+
     def v2_playbook_on_task_start(self, task, is_conditional):
         self.start_datetimes[task._uuid] = now()
 
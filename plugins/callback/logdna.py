@@ -15,6 +15,8 @@ description:
 requirements:
   - LogDNA Python Library (U(https://github.com/logdna/python))
   - whitelisting in configuration
+extends_documentation_fragment:
+  - community.general.event_shipper
 options:
   conf_key:
     required: true
@@ -54,6 +56,42 @@ options:
       - section: callback_logdna
         key: conf_tags
     default: ansible
+  async_delivery:
+    env:
+      - name: LOGDNA_ASYNC_DELIVERY
+    ini:
+      - section: callback_logdna
+        key: async_delivery
+  batch_max_events:
+    env:
+      - name: LOGDNA_BATCH_MAX_EVENTS
+    ini:
+      - section: callback_logdna
+        key: batch_max_events
+  batch_max_bytes:
+    env:
+      - name: LOGDNA_BATCH_MAX_BYTES
+    ini:
+      - section: callback_logdna
+        key: batch_max_bytes
+  flush_interval:
+    env:
+      - name: LOGDNA_FLUSH_INTERVAL
+    ini:
+      - section: callback_logdna
+        key: flush_interval
+  queue_size:
+    env:
+      - name: LOGDNA_QUEUE_SIZE
+    ini:
+      - section: callback_logdna
+        key: queue_size
+  retries:
+    env:
+      - name: LOGDNA_RETRIES
+    ini:
+      - section: callback_logdna
+        key: retries
 """
 
 import logging
@@ -63,6 +101,8 @@ from uuid import getnode
 from ansible.plugins.callback import CallbackBase
 from ansible.parsing.ajson import AnsibleJSONEncoder
 
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper
+
 try:
     from logdna import LogDNAHandler
     HAS_LOGDNA = True
@@ -124,6 +164,7 @@ class CallbackModule(CallbackBase):
         self.plugin_ignore_errors = None
         self.conf_hostname = None
         self.conf_tags = None
+        self.shipper = None
 
     def set_options(self, task_keys=None, var_options=None, direct=None):
         super(CallbackModule, self).set_options(task_keys=task_keys, var_options=var_options, direct=direct)
@@ -146,6 +187,8 @@ class CallbackModule(CallbackBase):
             self.options = {'hostname': self.conf_hostname, 'mac': self.mac, 'index_meta': True}
             self.log.addHandler(LogDNAHandler(self.conf_key, self.options))
             self.disabled = False
+            if self.get_option('async_delivery'):
+                self.shipper = EventShipper.from_options(self, self.flush_batch)
         else:
             self.disabled = True
             self._display.warning('WARNING:\nPlease, install LogDNA Python Package: `pip install logdna`')
@@ -171,7 +214,15 @@ class CallbackModule(CallbackBase):
 
     def flush(self, log, options):
         if HAS_LOGDNA:
-            self.log.info(json.dumps(log), options)
+            if self.shipper is not None:
+                msg = json.dumps(log)
+                self.shipper.put((msg, options), size=len(msg))
+            else:
+                self.log.info(json.dumps(log), options)
+
+    def flush_batch(self, logs):
+        for msg, options in logs:
+            self.log.info(msg, options)
 
     def sendLog(self, host, category, logdata):
         options = {'app': 'ansible', 'meta': {'playbook': self.playbook_name, 'host': host, 'category': category}}
@@ -190,6 +241,8 @@ class CallbackModule(CallbackBase):
         for host in stats.processed.keys():
             result[host] = stats.summarize(host)
         self.sendLog(self.conf_hostname, 'STATS', {'info': self.sanitizeJSON(result)})
+        if self.shipper is not None:
+            self.shipper.report('LogDNA')
 
     def runner_on_failed(self, host, res, ignore_errors=False):
         if self.plugin_ignore_errors:
@@ -16,6 +16,8 @@ requirements:
   - whitelisting in configuration
   - certifi (Python library)
   - flatdict (Python library), if you want to use the O(flatten) option
+extends_documentation_fragment:
+  - community.general.event_shipper
 options:
   api:
     description: URI to the Logentries API.
@@ -72,6 +74,42 @@ options:
     ini:
       - section: callback_logentries
         key: flatten
+  async_delivery:
+    env:
+      - name: LOGENTRIES_ASYNC_DELIVERY
+    ini:
+      - section: callback_logentries
+        key: async_delivery
+  batch_max_events:
+    env:
+      - name: LOGENTRIES_BATCH_MAX_EVENTS
+    ini:
+      - section: callback_logentries
+        key: batch_max_events
+  batch_max_bytes:
+    env:
+      - name: LOGENTRIES_BATCH_MAX_BYTES
+    ini:
+      - section: callback_logentries
+        key: batch_max_bytes
+  flush_interval:
+    env:
+      - name: LOGENTRIES_FLUSH_INTERVAL
+    ini:
+      - section: callback_logentries
+        key: flush_interval
+  queue_size:
+    env:
+      - name: LOGENTRIES_QUEUE_SIZE
+    ini:
+      - section: callback_logentries
+        key: queue_size
+  retries:
+    env:
+      - name: LOGENTRIES_RETRIES
+    ini:
+      - section: callback_logentries
+        key: retries
 """
 
 EXAMPLES = r"""
@@ -117,6 +155,8 @@ except ImportError:
 from ansible.module_utils.common.text.converters import to_bytes, to_text
 from ansible.plugins.callback import CallbackBase
 
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper
+
 # Todo:
 #  * Better formatting of output before sending out to logentries data/api nodes.
 
@@ -169,11 +209,16 @@ class PlainTextSocketAppender(object):
             self._conn.close()
 
     def put(self, data):
+        self.put_batch([data])
+
+    def put_batch(self, data_list):
         # Replace newlines with Unicode line separator
         # for multi-line events
-        data = to_text(data, errors='surrogate_or_strict')
-        multiline = data.replace('\n', self.LINE_SEP)
-        multiline += "\n"
+        multiline = ''
+        for data in data_list:
+            data = to_text(data, errors='surrogate_or_strict')
+            multiline += data.replace('\n', self.LINE_SEP)
+            multiline += "\n"
         # Send data, reconnect if needed
         while True:
             try:
@@ -233,6 +278,7 @@ class CallbackModule(CallbackBase):
 
         # FIXME: make configurable, move to options
         self.timeout = 10
+        self.shipper = None
 
     def set_options(self, task_keys=None, var_options=None, direct=None):
 
@@ -261,6 +307,10 @@ class CallbackModule(CallbackBase):
 
         self._initialize_connections()
 
+        if self.get_option('async_delivery') and not self.disabled:
+            # send the queued events over a single connection
+            self.shipper = EventShipper.from_options(self, lambda events: self._appender.put_batch(events))
+
     def _initialize_connections(self):
 
         if not self.disabled:
@@ -282,8 +332,11 @@ class CallbackModule(CallbackBase):
     def emit(self, record):
         msg = record.rstrip('\n')
         msg = f"{self.token} {msg}"
-        self._appender.put(msg)
-        self._display.vvvv("Sent event to logentries")
+        if self.shipper is not None:
+            self.shipper.put(msg)
+        else:
+            self._appender.put(msg)
+            self._display.vvvv("Sent event to logentries")
 
     def _set_info(self, host, res):
         return {'le_jobid': self.le_jobid, 'hostname': host, 'results': res}
@@ -326,4 +379,6 @@ class CallbackModule(CallbackBase):
 
     def playbook_on_stats(self, stats):
         """ close connection """
+        if self.shipper is not None:
+            self.shipper.report('Logentries')
         self._appender.close_connection()
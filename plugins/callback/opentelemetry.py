@@ -110,6 +110,53 @@ options:
       - section: callback_opentelemetry
         key: otel_exporter_otlp_traces_protocol
     version_added: 9.0.0
+  incremental_export:
+    type: bool
+    description:
+      - Export the spans of a task as soon as the next task starts, instead of keeping the data of all tasks and hosts in
+        memory until the end of the playbook.
+      - With the C(linear) strategy all hosts have reported their result for a task when the next task starts. With other
+        strategies, results reported later are exported when the next task starts, or at the end of the playbook.
+    default: false
+    env:
+      - name: ANSIBLE_OPENTELEMETRY_INCREMENTAL_EXPORT
+    ini:
+      - section: callback_opentelemetry
+        key: incremental_export
+    version_added: 10.5.0
+  span_processor_max_queue_size:
+    type: int
+    description:
+      - Maximum number of spans kept in the queue of the batch span processor before they are dropped.
+      - If not set, the OpenTelemetry SDK default or E(OTEL_BSP_MAX_QUEUE_SIZE) is used.
+    env:
+      - name: ANSIBLE_OPENTELEMETRY_SPAN_PROCESSOR_MAX_QUEUE_SIZE
+    ini:
+      - section: callback_opentelemetry
+        key: span_processor_max_queue_size
+    version_added: 10.5.0
+  span_processor_max_export_batch_size:
+    type: int
+    description:
+      - Maximum number of spans exported by the batch span processor in a single request.
+      - If not set, the OpenTelemetry SDK default or E(OTEL_BSP_MAX_EXPORT_BATCH_SIZE) is used.
+    env:
+      - name: ANSIBLE_OPENTELEMETRY_SPAN_PROCESSOR_MAX_EXPORT_BATCH_SIZE
+    ini:
+      - section: callback_opentelemetry
+        key: span_processor_max_export_batch_size
+    version_added: 10.5.0
+  span_processor_schedule_delay:
+    type: int
+    description:
+      - Delay in milliseconds between two exports of the batch span processor.
+      - If not set, the OpenTelemetry SDK default or E(OTEL_BSP_SCHEDULE_DELAY) is used.
+    env:
+      - name: ANSIBLE_OPENTELEMETRY_SPAN_PROCESSOR_SCHEDULE_DELAY
+    ini:
+      - section: callback_opentelemetry
+        key: span_processor_schedule_delay
+    version_added: 10.5.0
 requirements:
   - opentelemetry-api (Python library)
   - opentelemetry-exporter-otlp (Python library)
@@ -174,6 +221,8 @@ class TaskData:
     Data about an individual task.
     """
 
+    __slots__ = ('uuid', 'name', 'path', 'play', 'host_data', 'start', 'action', 'args', 'dump')
+
     def __init__(self, uuid, name, path, play, action, args):
         self.uuid = uuid
         self.name = name
@@ -201,6 +250,8 @@ class HostData:
     Data about an individual host.
     """
 
+    __slots__ = ('uuid', 'name', 'status', 'result', 'finish')
+
     def __init__(self, uuid, name, status, result):
         self.uuid = uuid
         self.name = name
@@ -222,6 +273,9 @@ class OpenTelemetrySource(object):
         self.user = getpass.getuser()
 
         self._display = display
+        self.tracer = None
+        self.otel_exporter = None
+        self.parent_span = None
 
     def traceparent_context(self, traceparent):
         carrier = dict()
@@ -266,24 +320,8 @@ class OpenTelemetrySource(object):
         task.dump = dump
         task.add_host(HostData(host_uuid, host_name, status, result))
 
-    def generate_distributed_traces(self,
-                                    otel_service_name,
-                                    ansible_playbook,
-                                    tasks_data,
-                                    status,
-                                    traceparent,
-                                    disable_logs,
-                                    disable_attributes_in_logs,
-                                    otel_exporter_otlp_traces_protocol,
-                                    store_spans_in_file):
-        """ generate distributed traces from the collected TaskData and HostData """
-
-        tasks = []
-        parent_start_time = None
-        for task_uuid, task in tasks_data.items():
-            if parent_start_time is None:
-                parent_start_time = task.start
-            tasks.append(task)
+    def init_tracer(self, otel_service_name, otel_exporter_otlp_traces_protocol, store_spans_in_file, span_processor_options=None):
+        """ set up the tracer provider and return a tracer and the span exporter """
 
         trace.set_tracer_provider(
             TracerProvider(
@@ -300,23 +338,50 @@ class OpenTelemetrySource(object):
                 otel_exporter = GRPCOTLPSpanExporter()
             else:
                 otel_exporter = HTTPOTLPSpanExporter()
-            processor = BatchSpanProcessor(otel_exporter)
+            processor = BatchSpanProcessor(otel_exporter, **(span_processor_options or {}))
 
         trace.get_tracer_provider().add_span_processor(processor)
 
-        tracer = trace.get_tracer(__name__)
+        return trace.get_tracer(__name__), otel_exporter
+
+    def set_parent_attributes(self, parent, status):
+        """ set the status and the trace metadata attributes of the playbook span """
+
+        parent.set_status(status)
+        # Populate trace metadata attributes
+        if self.ansible_version is not None:
+            parent.set_attribute("ansible.version", self.ansible_version)
+        parent.set_attribute("ansible.session", self.session)
+        parent.set_attribute("ansible.host.name", self.host)
+        if self.ip_address is not None:
+            parent.set_attribute("ansible.host.ip", self.ip_address)
+        parent.set_attribute("ansible.host.user", self.user)
+
+    def generate_distributed_traces(self,
+                                    otel_service_name,
+                                    ansible_playbook,
+                                    tasks_data,
+                                    status,
+                                    traceparent,
+                                    disable_logs,
+                                    disable_attributes_in_logs,
+                                    otel_exporter_otlp_traces_protocol,
+                                    store_spans_in_file,
+                                    span_processor_options=None):
+        """ generate distributed traces from the collected TaskData and HostData """
+
+        tasks = []
+        parent_start_time = None
+        for task_uuid, task in tasks_data.items():
+            if parent_start_time is None:
+                parent_start_time = task.start
+            tasks.append(task)
+
+        tracer, otel_exporter = self.init_tracer(otel_service_name, otel_exporter_otlp_traces_protocol, store_spans_in_file, span_processor_options)
 
         with tracer.start_as_current_span(ansible_playbook, context=self.traceparent_context(traceparent),
                                           start_time=parent_start_time, kind=SpanKind.SERVER) as parent:
-            parent.set_status(status)
-            # Populate trace metadata attributes
-            if self.ansible_version is not None:
-                parent.set_attribute("ansible.version", self.ansible_version)
-            parent.set_attribute("ansible.session", self.session)
-            parent.set_attribute("ansible.host.name", self.host)
-            if self.ip_address is not None:
-                parent.set_attribute("ansible.host.ip", self.ip_address)
-            parent.set_attribute("ansible.host.user", self.user)
+            self.set_parent_attributes(parent, status)
             for task in tasks:
                 for host_uuid, host_data in task.host_data.items():
                     with tracer.start_as_current_span(task.name, start_time=task.start, end_on_exit=False) as span:
@@ -324,6 +389,38 @@ class OpenTelemetrySource(object):
 
         return otel_exporter
 
+    def start_trace(self,
+                    otel_service_name,
+                    ansible_playbook,
+                    start_time,
+                    traceparent,
+                    otel_exporter_otlp_traces_protocol,
+                    store_spans_in_file,
+                    span_processor_options=None):
+        """ start the playbook span, to which the spans of the tasks are added with export_task """
+
+        self.tracer, self.otel_exporter = self.init_tracer(
+            otel_service_name, otel_exporter_otlp_traces_protocol, store_spans_in_file, span_processor_options)
+        self.parent_span = self.tracer.start_span(ansible_playbook, context=self.traceparent_context(traceparent),
+                                                  start_time=start_time, kind=SpanKind.SERVER)
+
+    def export_task(self, task, disable_logs, disable_attributes_in_logs):
+        """ create the spans of the hosts which reported a result for the task, and release their data """
+
+        context = trace.set_span_in_context(self.parent_span)
+        for host_uuid, host_data in task.host_data.items():
+            span = self.tracer.start_span(task.name, context=context, start_time=task.start)
+            self.update_span_data(task, host_data, span, disable_logs, disable_attributes_in_logs)
+        task.host_data.clear()
+        task.dump = None
+
+    def end_trace(self, status):
+        """ end the playbook span started by start_trace and return the span exporter """
+
+        self.set_parent_attributes(self.parent_span, status)
+        self.parent_span.end()
+        return self.otel_exporter
+
     def update_span_data(self, task_data, host_data, span, disable_logs, disable_attributes_in_logs):
         """ update the span with the given TaskData and HostData """
 
@@ -497,6 +594,9 @@ class CallbackModule(CallbackBase):
         self.traceparent = False
         self.store_spans_in_file = False
         self.otel_exporter_otlp_traces_protocol = None
+        self.incremental_export = False
+        self.span_processor_options = None
+        self.pending_tasks = OrderedDict()
 
         if OTEL_LIBRARY_IMPORT_ERROR:
             raise_from(
@@ -537,6 +637,40 @@ class CallbackModule(CallbackBase):
 
         self.otel_exporter_otlp_traces_protocol = self.get_option('otel_exporter_otlp_traces_protocol')
 
+        self.incremental_export = self.get_option('incremental_export')
+
+        self.span_processor_options = {}
+        for option, argument in (('span_processor_max_queue_size', 'max_queue_size'),
+                                 ('span_processor_max_export_batch_size', 'max_export_batch_size'),
+                                 ('span_processor_schedule_delay', 'schedule_delay_millis')):
+            if self.get_option(option) is not None:
+                self.span_processor_options[argument] = self.get_option(option)
+
+    def export_finished_tasks(self, current_task=None):
+        """ export the spans of the tasks with results, except the current task, if incremental_export is enabled """
+        if not self.incremental_export:
+            return
+
+        if self.opentelemetry.parent_span is None:
+            if current_task is not None:
+                start_time = self.tasks_data[current_task._uuid].start
+            else:
+                start_time = time_ns()
+            self.opentelemetry.start_trace(
+                self.otel_service_name,
+                self.ansible_playbook,
+                start_time,
+                self.traceparent,
+                self.otel_exporter_otlp_traces_protocol,
+                self.store_spans_in_file,
+                self.span_processor_options
+            )
+
+        for task_uuid in list(self.pending_tasks):
+            if current_task is None or task_uuid != current_task._uuid:
+                self.opentelemetry.export_task(self.tasks_data[task_uuid], self.disable_logs, self.disable_attributes_in_logs)
+                del self.pending_tasks[task_uuid]
+
     def dump_results(self, task, result):
         """ dump the results if disable_logs is not enabled """
         if self.disable_logs:
@@ -564,6 +698,7 @@ class CallbackModule(CallbackBase):
             self.play_name,
             task
         )
+        self.export_finished_tasks(task)
 
     def v2_playbook_on_task_start(self, task, is_conditional):
         self.opentelemetry.start_task(
@@ -572,6 +707,7 @@ class CallbackModule(CallbackBase):
             self.play_name,
             task
         )
+        self.export_finished_tasks(task)
 
     def v2_playbook_on_cleanup_task_start(self, task):
         self.opentelemetry.start_task(
@@ -580,6 +716,7 @@ class CallbackModule(CallbackBase):
             self.play_name,
             task
         )
+        self.export_finished_tasks(task)
 
     def v2_playbook_on_handler_task_start(self, task):
         self.opentelemetry.start_task(
@@ -588,6 +725,17 @@ class CallbackModule(CallbackBase):
             self.play_name,
             task
         )
+        self.export_finished_tasks(task)
+
+    def finish_task(self, status, result, dump):
+        self.opentelemetry.finish_task(
+            self.tasks_data,
+            status,
+            result,
+            dump
+        )
+        if self.incremental_export:
+            self.pending_tasks[result._task._uuid] = None
 
     def v2_runner_on_failed(self, result, ignore_errors=False):
         if ignore_errors:
@@ -596,32 +744,28 @@ class CallbackModule(CallbackBase):
             status = 'failed'
             self.errors += 1
 
-        self.opentelemetry.finish_task(
-            self.tasks_data,
+        self.finish_task(
             status,
             result,
             self.dump_results(self.tasks_data[result._task._uuid], result)
         )
 
     def v2_runner_on_ok(self, result):
-        self.opentelemetry.finish_task(
-            self.tasks_data,
+        self.finish_task(
             'ok',
             result,
             self.dump_results(self.tasks_data[result._task._uuid], result)
         )
 
     def v2_runner_on_skipped(self, result):
-        self.opentelemetry.finish_task(
-            self.tasks_data,
+        self.finish_task(
             'skipped',
             result,
             self.dump_results(self.tasks_data[result._task._uuid], result)
         )
 
     def v2_playbook_on_include(self, included_file):
-        self.opentelemetry.finish_task(
-            self.tasks_data,
+        self.finish_task(
             'included',
             included_file,
             ""
@@ -632,17 +776,22 @@ class CallbackModule(CallbackBase):
             status = Status(status_code=StatusCode.OK)
         else:
             status = Status(status_code=StatusCode.ERROR)
-        otel_exporter = self.opentelemetry.generate_distributed_traces(
-            self.otel_service_name,
-            self.ansible_playbook,
-            self.tasks_data,
-            status,
-            self.traceparent,
-            self.disable_logs,
-            self.disable_attributes_in_logs,
-            self.otel_exporter_otlp_traces_protocol,
-            self.store_spans_in_file
-        )
+        if self.incremental_export:
+            self.export_finished_tasks()
+            otel_exporter = self.opentelemetry.end_trace(status)
+        else:
+            otel_exporter = self.opentelemetry.generate_distributed_traces(
+                self.otel_service_name,
+                self.ansible_playbook,
+                self.tasks_data,
+                status,
+                self.traceparent,
+                self.disable_logs,
+                self.disable_attributes_in_logs,
+                self.otel_exporter_otlp_traces_protocol,
+                self.store_spans_in_file,
+                self.span_processor_options
+            )
 
         if self.store_spans_in_file:
             spans = [json.loads(span.to_json()) for span in otel_exporter.get_finished_spans()]
@@ -18,6 +18,8 @@ requirements:
   - Whitelisting this callback plugin
   - 'Create a HTTP Event Collector in Splunk'
   - 'Define the URL and token in C(ansible.cfg)'
+extends_documentation_fragment:
+  - community.general.event_shipper
 options:
   url:
     description: URL to the Splunk HTTP collector source.
@@ -68,6 +70,42 @@ options:
         key: batch
     type: str
     version_added: 3.3.0
+  async_delivery:
+    env:
+      - name: SPLUNK_ASYNC_DELIVERY
+    ini:
+      - section: callback_splunk
+        key: async_delivery
+  batch_max_events:
+    env:
+      - name: SPLUNK_BATCH_MAX_EVENTS
+    ini:
+      - section: callback_splunk
+        key: batch_max_events
+  batch_max_bytes:
+    env:
+      - name: SPLUNK_BATCH_MAX_BYTES
+    ini:
+      - section: callback_splunk
+        key: batch_max_bytes
+  flush_interval:
+    env:
+      - name: SPLUNK_FLUSH_INTERVAL
+    ini:
+      - section: callback_splunk
+        key: flush_interval
+  queue_size:
+    env:
+      - name: SPLUNK_QUEUE_SIZE
+    ini:
+      - section: callback_splunk
+        key: queue_size
+  retries:
+    env:
+      - name: SPLUNK_RETRIES
+    ini:
+      - section: callback_splunk
+        key: retries
 """
 
 EXAMPLES = r"""
@@ -98,6 +136,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper
 
 
 class SplunkHTTPCollectorSource(object):
@@ -109,6 +148,19 @@ class SplunkHTTPCollectorSource(object):
         self.host = socket.gethostname()
         self.ip_address = socket.gethostbyname(socket.gethostname())
         self.user = getpass.getuser()
+        self.shipper = None
+
+    def post(self, url, authtoken, validate_certs, jsondata):
+        open_url(
+            url,
+            jsondata,
+            headers={
+                'Content-type': 'application/json',
+                'Authorization': f"Splunk {authtoken}"
+            },
+            method='POST',
+            validate_certs=validate_certs
+        )
 
     def send_event(self, url, authtoken, validate_certs, include_milliseconds, batch, state, result, runtime):
         if result._task_fields['args'].get('_ansible_check_mode') is True:
@@ -154,16 +206,10 @@ class SplunkHTTPCollectorSource(object):
         # This wraps the json payload in and outer json event needed by Splunk
         jsondata = json.dumps({"event": data}, cls=AnsibleJSONEncoder, sort_keys=True)
 
-        open_url(
-            url,
-            jsondata,
-            headers={
-                'Content-type': 'application/json',
-                'Authorization': f"Splunk {authtoken}"
-            },
-            method='POST',
-            validate_certs=validate_certs
-        )
+        if self.shipper is not None:
+            self.shipper.put(jsondata)
+        else:
+            self.post(url, authtoken, validate_certs, jsondata)
 
 
 class CallbackModule(CallbackBase):
@@ -219,6 +265,11 @@ class CallbackModule(CallbackBase):
 
         self.batch = self.get_option('batch')
 
+        if self.get_option('async_delivery') and not self.disabled:
+            # the HTTP collector accepts several events concatenated in one request
+            self.splunk.shipper = EventShipper.from_options(
+                self, lambda events: self.splunk.post(self.url, self.authtoken, self.validate_certs, '\n'.join(events)))
+
     def v2_playbook_on_start(self, playbook):
         self.splunk.ansible_playbook = basename(playbook._file_name)
 
@@ -287,3 +338,7 @@ class CallbackModule(CallbackBase):
             result,
             self._runtime(result)
         )
+
+    def v2_playbook_on_stats(self, stats):
+        if self.splunk.shipper is not None:
+            self.splunk.shipper.report('Splunk HTTP collector')
@@ -16,6 +16,10 @@ requirements:
   - Whitelisting this callback plugin
   - 'Create a HTTP collector source in Sumologic and specify a custom timestamp format of V(yyyy-MM-dd HH:mm:ss ZZZZ) and
     a custom timestamp locator of V("timestamp": "(.*\)")'
+notes:
+  - With O(async_delivery=true), a request can contain the events of several hosts, so the C(X-Sumo-Host) header is not set.
+extends_documentation_fragment:
+  - community.general.event_shipper
 options:
   url:
     description: URL to the Sumologic HTTP collector source.
@@ -25,6 +29,53 @@ options:
     ini:
       - section: callback_sumologic
         key: url
+  async_delivery:
+    env:
+      - name: SUMOLOGIC_ASYNC_DELIVERY
+    ini:
+      - section: callback_sumologic
+        key: async_delivery
+  batch_max_events:
+    env:
+      - name: SUMOLOGIC_BATCH_MAX_EVENTS
+    ini:
+      - section: callback_sumologic
+        key: batch_max_events
+  batch_max_bytes:
+    env:
+      - name: SUMOLOGIC_BATCH_MAX_BYTES
+    ini:
+      - section: callback_sumologic
+        key: batch_max_bytes
+  flush_interval:
+    env:
+      - name: SUMOLOGIC_FLUSH_INTERVAL
+    ini:
+      - section: callback_sumologic
+        key: flush_interval
+  queue_size:
+    env:
+      - name: SUMOLOGIC_QUEUE_SIZE
+    ini:
+      - section: callback_sumologic
+        key: queue_size
+  retries:
+    env:
+      - name: SUMOLOGIC_RETRIES
+    ini:
+      - section: callback_sumologic
+        key: retries
+  compress:
+    description:
+      - Whether to compress the requests sent to the Sumologic HTTP collector with gzip.
+    env:
+      - name: SUMOLOGIC_COMPRESS
+    ini:
+      - section: callback_sumologic
+        key: compress
+    type: bool
+    default: false
+    version_added: 10.5.0
 """
 
 EXAMPLES = r"""
@@ -55,6 +106,7 @@ from ansible.plugins.callback import CallbackBase
 from ansible_collections.community.general.plugins.module_utils.datetime import (
     now,
 )
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper, gzip_payload
 
 
 class SumologicHTTPCollectorSource(object):
@@ -66,6 +118,22 @@ class SumologicHTTPCollectorSource(object):
         self.host = socket.gethostname()
         self.ip_address = socket.gethostbyname(socket.gethostname())
         self.user = getpass.getuser()
+        self.shipper = None
+        self.compress = False
+
+    def post(self, url, jsondata, headers=None):
+        headers = dict(headers or {})
+        headers['Content-type'] = 'application/json'
+        if self.compress:
+            jsondata = gzip_payload(jsondata)
+            headers['Content-Encoding'] = 'gzip'
+
+        open_url(
+            url,
+            data=jsondata,
+            headers=headers,
+            method='POST'
+        )
 
     def send_event(self, url, state, result, runtime):
         if result._task_fields['args'].get('_ansible_check_mode') is True:
@@ -100,15 +168,12 @@ class SumologicHTTPCollectorSource(object):
         data['ansible_task'] = result._task_fields
         data['ansible_result'] = result._result
 
-        open_url(
-            url,
-            data=json.dumps(data, cls=AnsibleJSONEncoder, sort_keys=True),
-            headers={
-                'Content-type': 'application/json',
-                'X-Sumo-Host': data['ansible_host']
-            },
-            method='POST'
-        )
+        jsondata = json.dumps(data, cls=AnsibleJSONEncoder, sort_keys=True)
+
+        if self.shipper is not None:
+            self.shipper.put(jsondata)
+        else:
+            self.post(url, jsondata, headers={'X-Sumo-Host': data['ansible_host']})
 
 
 class CallbackModule(CallbackBase):
@@ -142,6 +207,13 @@ class CallbackModule(CallbackBase):
                                   '`SUMOLOGIC_URL` environment variable or '
                                   'in the ansible.cfg file.')
 
+        self.sumologic.compress = self.get_option('compress')
+
+        if self.get_option('async_delivery') and not self.disabled:
+            # the HTTP collector accepts one event per line
+            self.sumologic.shipper = EventShipper.from_options(
+                self, lambda events: self.sumologic.post(self.url, '\n'.join(events)))
+
     def v2_playbook_on_start(self, playbook):
         self.sumologic.ansible_playbook = basename(playbook._file_name)
 
@@ -190,3 +262,7 @@ class CallbackModule(CallbackBase):
             result,
             self._runtime(result)
         )
+
+    def v2_playbook_on_stats(self, stats):
+        if self.sumologic.shipper is not None:
+            self.sumologic.shipper.report('Sumologic')
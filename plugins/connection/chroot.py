@@ -61,6 +61,25 @@ options:
     default: false
     type: bool
     version_added: 7.3.0
+  direct_transfer:
+    description:
+      - Transfer files by copying them directly from or to the path below the chroot directory,
+        instead of running C(dd) in the chroot for every file.
+      - The path is resolved one component at a time relative to the chroot directory without following
+        symbolic links, so that a path cannot escape the chroot.
+      - Files whose path contains a symbolic link, files that are not regular files and paths that cannot
+        be opened this way are transferred with C(dd) as before.
+      - Files written directly are created by the controller process, so their mode depends on its umask.
+    ini:
+      - section: chroot_connection
+        key: direct_transfer
+    env:
+      - name: ANSIBLE_CHROOT_DIRECT_TRANSFER
+    vars:
+      - name: ansible_chroot_direct_transfer
+    default: false
+    type: bool
+    version_added: 10.5.0
 """
 
 EXAMPLES = r"""
@@ -71,8 +90,10 @@ EXAMPLES = r"""
         msg: "This is coming from chroot environment"
 """
 
+import errno
 import os
 import os.path
+import stat
 import subprocess
 import traceback
 
@@ -86,6 +107,39 @@ from ansible.utils.display import Display
 
 display = Display()
 
+# Maximum number of bytes copied by one copy_file_range() or sendfile() call
+COPY_CHUNK_SIZE = 16 * 1024 * 1024
+
+# errno values telling that a copy system call cannot be used for a pair of files
+_COPY_UNSUPPORTED = frozenset((errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF))
+
+
+def _copy_fd(in_fd, out_fd):
+    """ copy the rest of in_fd to out_fd, in the kernel if possible """
+    for name in ('copy_file_range', 'sendfile'):
+        copy = getattr(os, name, None)
+        if copy is None:
+            continue
+        try:
+            if name == 'copy_file_range':
+                while copy(in_fd, out_fd, COPY_CHUNK_SIZE):
+                    pass
+            else:
+                while copy(out_fd, in_fd, None, COPY_CHUNK_SIZE):
+                    pass
+            return
+        except OSError as e:
+            # Both calls copy from the current offsets, so the next method
+            # continues where this one stopped
+            if e.errno not in _COPY_UNSUPPORTED:
+                raise
+
+    chunk = os.read(in_fd, BUFSIZE)
+    while chunk:
+        while chunk:
+            chunk = chunk[os.write(out_fd, chunk):]
+        chunk = os.read(in_fd, BUFSIZE)
+
 
 class Connection(ConnectionBase):
     """ Local chroot based connections """
@@ -178,11 +232,82 @@ class Connection(ConnectionBase):
             remote_path = os.path.join(os.path.sep, remote_path)
         return os.path.normpath(remote_path)
 
+    def _open_in_chroot(self, path, flags, mode=0o666):
+        """ open a path of the chroot without following symbolic links
+
+            Every directory is opened relative to its parent with O_NOFOLLOW,
+            starting at the chroot directory, so neither a symbolic link nor
+            '..' can make the path resolve outside of the chroot.
+            Raises OSError (ELOOP for a symbolic link) if the path cannot be
+            opened this way, or if it is not a regular file.
+        """
+        parts = [to_bytes(part, errors='surrogate_or_strict') for part in path.split(os.path.sep) if part]
+        if not parts or any(part in (b'.', b'..') for part in parts):
+            raise OSError(errno.EINVAL, f"unsupported path {path}")
+
+        dir_flags = os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW | os.O_CLOEXEC
+        dir_fd = os.open(to_bytes(self.chroot, errors='surrogate_or_strict'), os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+        try:
+            for part in parts[:-1]:
+                next_fd = os.open(part, dir_flags, dir_fd=dir_fd)
+                os.close(dir_fd)
+                dir_fd = next_fd
+            # O_NONBLOCK keeps opening a FIFO from blocking; it has no effect on regular files
+            fd = os.open(parts[-1], flags | os.O_NOFOLLOW | os.O_NONBLOCK | os.O_CLOEXEC, mode, dir_fd=dir_fd)
+        finally:
+            os.close(dir_fd)
+
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            os.close(fd)
+            raise OSError(errno.EINVAL, f"{path} is not a regular file")
+        return fd
+
+    def _put_file_direct(self, in_file, out_path):
+        """ copy a file to the chroot without running dd, return False if that is not possible """
+        try:
+            # Do not truncate the file before knowing that it is a regular file
+            out_fd = self._open_in_chroot(out_path, os.O_WRONLY | os.O_CREAT)
+        except OSError as e:
+            display.vvvv(f"cannot transfer {out_path} directly, using dd: {e}", host=self.chroot)
+            return False
+        try:
+            os.ftruncate(out_fd, 0)
+            _copy_fd(in_file.fileno(), out_fd)
+        except OSError as e:
+            raise AnsibleError(f"failed to transfer file to {out_path}: {e}")
+        finally:
+            os.close(out_fd)
+        return True
+
+    def _fetch_file_direct(self, in_path, out_path):
+        """ copy a file from the chroot without running dd, return False if that is not possible """
+        try:
+            in_fd = self._open_in_chroot(in_path, os.O_RDONLY)
+        except OSError as e:
+            display.vvvv(f"cannot transfer {in_path} directly, using dd: {e}", host=self.chroot)
+            return False
+        try:
+            with open(to_bytes(out_path, errors='surrogate_or_strict'), 'wb+') as out_file:
+                _copy_fd(in_fd, out_file.fileno())
+        except (IOError, OSError) as e:
+            raise AnsibleError(f"failed to transfer file {in_path} to {out_path}: {e}")
+        finally:
+            os.close(in_fd)
+        return True
+
     def put_file(self, in_path, out_path):
         """ transfer a file from local to chroot """
         super(Connection, self).put_file(in_path, out_path)
         display.vvv(f"PUT {in_path} TO {out_path}", host=self.chroot)
 
+        if self.get_option('direct_transfer'):
+            try:
+                with open(to_bytes(in_path, errors='surrogate_or_strict'), 'rb') as in_file:
+                    if self._put_file_direct(in_file, self._prefix_login_path(out_path)):
+                        return
+            except IOError:
+                raise AnsibleError(f"file or module does not exist at: {in_path}")
+
         out_path = shlex_quote(self._prefix_login_path(out_path))
         try:
             with open(to_bytes(in_path, errors='surrogate_or_strict'), 'rb') as in_file:
@@ -209,6 +334,9 @@ class Connection(ConnectionBase):
         super(Connection, self).fetch_file(in_path, out_path)
         display.vvv(f"FETCH {in_path} TO {out_path}", host=self.chroot)
 
+        if self.get_option('direct_transfer') and self._fetch_file_direct(self._prefix_login_path(in_path), out_path):
+            return
+
         in_path = shlex_quote(self._prefix_login_path(in_path))
         try:
             p = self._buffered_exec_command(f'dd if={in_path} bs={BUFSIZE}')
@@ -73,6 +73,17 @@ options:
     default: default
     vars:
       - name: ansible_incus_project
+  persistent_shell:
+    description:
+      - Start one shell in the instance with C(incus exec) and run all commands of the connection through it,
+        instead of running C(incus exec) for every command.
+      - Commands are run with their stdin redirected from C(/dev/null). Commands with input data, as used by pipelining,
+        are still run with their own C(incus exec).
+    type: bool
+    default: false
+    vars:
+      - name: ansible_incus_persistent_shell
+    version_added: 10.5.0
 """
 
 import os
@@ -82,6 +93,7 @@ from ansible.errors import AnsibleError, AnsibleConnectionFailure, AnsibleFileNo
 from ansible.module_utils.common.process import get_bin_path
 from ansible.module_utils._text import to_bytes, to_text
 from ansible.plugins.connection import ConnectionBase
+from ansible_collections.community.general.plugins.plugin_utils.persistent_shell import PersistentShell
 
 
 class Connection(ConnectionBase):
@@ -93,6 +105,9 @@ class Connection(ConnectionBase):
     def __init__(self, play_context, new_stdin, *args, **kwargs):
         super(Connection, self).__init__(play_context, new_stdin, *args, **kwargs)
 
+        self._shell_process = None
+        self._remote_uid_gid = {}
+
         self._incus_cmd = get_bin_path("incus")
 
         if not self._incus_cmd:
@@ -107,7 +122,7 @@ class Connection(ConnectionBase):
                               host=self._instance())
             self._connected = True
 
-    def _build_command(self, cmd) -> str:
+    def _build_command(self, cmd=None) -> str:
         """build the command to execute on the incus host"""
 
         exec_cmd = [
@@ -127,7 +142,11 @@ class Connection(ConnectionBase):
                 [self.get_option("incus_become_method"), self.get_option("remote_user"), "-c"]
             )
 
-        exec_cmd.extend([self.get_option("executable"), "-c", cmd])
+        if cmd is None:
+            # The shell reads its commands from stdin
+            exec_cmd.append(self.get_option("executable"))
+        else:
+            exec_cmd.extend([self.get_option("executable"), "-c", cmd])
 
         return exec_cmd
 
@@ -143,14 +162,23 @@ class Connection(ConnectionBase):
         self._display.vvv(f"EXEC {cmd}",
                           host=self._instance())
 
-        local_cmd = self._build_command(cmd)
-        self._display.vvvvv(f"EXEC {local_cmd}", host=self._instance())
+        if in_data is None and self.get_option("persistent_shell"):
+            if self._shell_process is None:
+                local_cmd = self._build_command()
+                self._display.vvvvv(f"EXEC persistent shell {local_cmd}", host=self._instance())
+                local_cmd = [to_bytes(i, errors='surrogate_or_strict') for i in local_cmd]
+                self._shell_process = PersistentShell(local_cmd, executable=self.get_option("executable"))
+            returncode, stdout, stderr = self._shell_process.run(cmd)
+        else:
+            local_cmd = self._build_command(cmd)
+            self._display.vvvvv(f"EXEC {local_cmd}", host=self._instance())
 
-        local_cmd = [to_bytes(i, errors='surrogate_or_strict') for i in local_cmd]
-        in_data = to_bytes(in_data, errors='surrogate_or_strict', nonstring='passthru')
+            local_cmd = [to_bytes(i, errors='surrogate_or_strict') for i in local_cmd]
+            in_data = to_bytes(in_data, errors='surrogate_or_strict', nonstring='passthru')
 
-        process = Popen(local_cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-        stdout, stderr = process.communicate(in_data)
+            process = Popen(local_cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+            stdout, stderr = process.communicate(in_data)
+            returncode = process.returncode
 
         stdout = to_text(stdout)
         stderr = to_text(stderr)
@@ -161,26 +189,24 @@ class Connection(ConnectionBase):
         if stderr == "Error: Instance not found\n":
             raise AnsibleConnectionFailure(f"instance not found: {self._instance()}")
 
-        return process.returncode, stdout, stderr
+        return returncode, stdout, stderr
 
     def _get_remote_uid_gid(self) -> tuple[int, int]:
         """Get the user and group ID of 'remote_user' from the instance."""
 
-        rc, uid_out, err = self.exec_command("/bin/id -u")
-        if rc != 0:
-            raise AnsibleError(
-                f"Failed to get remote uid for user {self.get_option('remote_user')}: {err}"
-            )
-        uid = uid_out.strip()
+        remote_user = self.get_option('remote_user')
+        if remote_user in self._remote_uid_gid:
+            return self._remote_uid_gid[remote_user]
 
-        rc, gid_out, err = self.exec_command("/bin/id -g")
+        rc, id_out, err = self.exec_command("/bin/id -u && /bin/id -g")
         if rc != 0:
             raise AnsibleError(
-                f"Failed to get remote gid for user {self.get_option('remote_user')}: {err}"
+                f"Failed to get remote uid and gid for user {remote_user}: {err}"
             )
-        gid = gid_out.strip()
+        uid, gid = id_out.split()
 
-        return int(uid), int(gid)
+        self._remote_uid_gid[remote_user] = int(uid), int(gid)
+        return self._remote_uid_gid[remote_user]
 
     def put_file(self, in_path, out_path):
         """ put a file from local to Incus """
@@ -245,7 +271,11 @@ class Connection(ConnectionBase):
         call(local_cmd)
 
     def close(self):
-        """ close the connection (nothing to do here) """
+        """ close the connection """
         super(Connection, self).close()
 
+        if self._shell_process is not None:
+            self._shell_process.close()
+            self._shell_process = None
+
         self._connected = False
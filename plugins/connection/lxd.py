@@ -72,6 +72,17 @@ options:
     vars:
       - name: ansible_lxd_project
     version_added: 2.0.0
+  persistent_shell:
+    description:
+      - Start one shell in the instance with C(lxc exec) and run all commands of the connection through it,
+        instead of running C(lxc exec) for every command.
+      - Commands are run with their stdin redirected from C(/dev/null). Commands with input data, as used by pipelining,
+        are still run with their own C(lxc exec).
+    type: bool
+    default: false
+    vars:
+      - name: ansible_lxd_persistent_shell
+    version_added: 10.5.0
 """
 
 import os
@@ -81,6 +92,7 @@ from ansible.errors import AnsibleError, AnsibleConnectionFailure, AnsibleFileNo
 from ansible.module_utils.common.process import get_bin_path
 from ansible.module_utils.common.text.converters import to_bytes, to_text
 from ansible.plugins.connection import ConnectionBase
+from ansible_collections.community.general.plugins.plugin_utils.persistent_shell import PersistentShell
 
 
 class Connection(ConnectionBase):
@@ -92,6 +104,9 @@ class Connection(ConnectionBase):
     def __init__(self, play_context, new_stdin, *args, **kwargs):
         super(Connection, self).__init__(play_context, new_stdin, *args, **kwargs)
 
+        self._shell_process = None
+        self._remote_uid_gid = {}
+
         try:
             self._lxc_cmd = get_bin_path("lxc")
         except ValueError:
@@ -109,7 +124,7 @@ class Connection(ConnectionBase):
             self._display.vvv(f"ESTABLISH LXD CONNECTION FOR USER: {self.get_option('remote_user')}", host=self._host())
             self._connected = True
 
-    def _build_command(self, cmd) -> str:
+    def _build_command(self, cmd=None) -> str:
         """build the command to execute on the lxd host"""
 
         exec_cmd = [self._lxc_cmd]
@@ -129,7 +144,11 @@ class Connection(ConnectionBase):
                 [self.get_option("lxd_become_method"), self.get_option("remote_user"), "-c"]
             )
 
-        exec_cmd.extend([self.get_option("executable"), "-c", cmd])
+        if cmd is None:
+            # The shell reads its commands from stdin
+            exec_cmd.append(self.get_option("executable"))
+        else:
+            exec_cmd.extend([self.get_option("executable"), "-c", cmd])
 
         return exec_cmd
 
@@ -139,14 +158,23 @@ class Connection(ConnectionBase):
 
         self._display.vvv(f"EXEC {cmd}", host=self._host())
 
-        local_cmd = self._build_command(cmd)
-        self._display.vvvvv(f"EXEC {local_cmd}", host=self._host())
+        if in_data is None and self.get_option("persistent_shell"):
+            if self._shell_process is None:
+                local_cmd = self._build_command()
+                self._display.vvvvv(f"EXEC persistent shell {local_cmd}", host=self._host())
+                local_cmd = [to_bytes(i, errors='surrogate_or_strict') for i in local_cmd]
+                self._shell_process = PersistentShell(local_cmd, executable=self.get_option("executable"))
+            returncode, stdout, stderr = self._shell_process.run(cmd)
+        else:
+            local_cmd = self._build_command(cmd)
+            self._display.vvvvv(f"EXEC {local_cmd}", host=self._host())
 
-        local_cmd = [to_bytes(i, errors='surrogate_or_strict') for i in local_cmd]
-        in_data = to_bytes(in_data, errors='surrogate_or_strict', nonstring='passthru')
+            local_cmd = [to_bytes(i, errors='surrogate_or_strict') for i in local_cmd]
+            in_data = to_bytes(in_data, errors='surrogate_or_strict', nonstring='passthru')
 
-        process = Popen(local_cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
-        stdout, stderr = process.communicate(in_data)
+            process = Popen(local_cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+            stdout, stderr = process.communicate(in_data)
+            returncode = process.returncode
 
         stdout = to_text(stdout)
         stderr = to_text(stderr)
@@ -159,26 +187,24 @@ class Connection(ConnectionBase):
         if stderr.strip() == "Error: Instance not found" or stderr.strip() == "error: not found":
             raise AnsibleConnectionFailure(f"instance not found: {self._host()}")
 
-        return process.returncode, stdout, stderr
+        return returncode, stdout, stderr
 
     def _get_remote_uid_gid(self) -> tuple[int, int]:
         """Get the user and group ID of 'remote_user' from the instance."""
 
-        rc, uid_out, err = self.exec_command("/bin/id -u")
-        if rc != 0:
-            raise AnsibleError(
-                f"Failed to get remote uid for user {self.get_option('remote_user')}: {err}"
-            )
-        uid = uid_out.strip()
+        remote_user = self.get_option('remote_user')
+        if remote_user in self._remote_uid_gid:
+            return self._remote_uid_gid[remote_user]
 
-        rc, gid_out, err = self.exec_command("/bin/id -g")
+        rc, id_out, err = self.exec_command("/bin/id -u && /bin/id -g")
         if rc != 0:
             raise AnsibleError(
-                f"Failed to get remote gid for user {self.get_option('remote_user')}: {err}"
+                f"Failed to get remote uid and gid for user {remote_user}: {err}"
             )
-        gid = gid_out.strip()
+        uid, gid = id_out.split()
 
-        return int(uid), int(gid)
+        self._remote_uid_gid[remote_user] = int(uid), int(gid)
+        return self._remote_uid_gid[remote_user]
 
     def put_file(self, in_path, out_path):
         """ put a file from local to lxd """
@@ -245,7 +271,11 @@ class Connection(ConnectionBase):
         process.communicate()
 
     def close(self):
-        """ close the connection (nothing to do here) """
+        """ close the connection """
         super(Connection, self).close()
 
+        if self._shell_process is not None:
+            self._shell_process.close()
+            self._shell_process = None
+
         self._connected = False
@@ -232,6 +232,32 @@ options:
     default: sudo
     vars:
       - name: proxmox_become_method
+  transfer_compression:
+    description:
+      - Compress the content of files transferred to and from the container on the wire.
+      - V(gzip) requires the C(gzip) command in the container, or on the Proxmox host when the file is transferred
+        with C(pct push) or C(pct pull).
+    type: str
+    choices:
+      - none
+      - gzip
+    default: none
+    vars:
+      - name: proxmox_transfer_compression
+    version_added: 10.5.0
+  pct_transfer_threshold:
+    description:
+      - Files of at least this size in bytes are transferred with C(pct push) and C(pct pull) through a temporary file
+        on the Proxmox host, instead of being streamed through C(pct exec) and C(cat).
+      - As the size of a file fetched from the container is not known in advance, all fetched files are transferred
+        with C(pct pull) when this is set.
+      - V(0) never uses C(pct push) and C(pct pull).
+      - The temporary file needs free space for the whole file on the Proxmox host.
+    type: int
+    default: 0
+    vars:
+      - name: proxmox_pct_transfer_threshold
+    version_added: 10.5.0
 notes:
   - >
     When NOT using this plugin as root, you need to have a become mechanism,
@@ -398,7 +424,9 @@ import os
 import pathlib
 import socket
 import tempfile
+import time
 import typing as t
+import zlib
 
 from ansible.errors import (
     AnsibleAuthenticationFailure,
@@ -413,10 +441,17 @@ from ansible.plugins.connection import ConnectionBase
 from ansible.utils.display import Display
 from ansible.utils.path import makedirs_safe
 from binascii import hexlify
+from functools import partial
 
 
 display = Display()
 
+# Size of the chunks read from and sent to the SSH channel when transferring files
+TRANSFER_CHUNK_SIZE = 65536
+
+# zlib window bits value selecting the gzip format, as used by the gzip command
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
 
 def authenticity_msg(hostname: str, ktype: str, fingerprint: str) -> str:
     msg = f"""
@@ -650,12 +685,8 @@ class Connection(ConnectionBase):
                         host=self.get_option('remote_addr'))
         return ' '.join(cmd)
 
-    def exec_command(self, cmd: str, in_data: bytes | None = None, sudoable: bool = True) -> tuple[int, bytes, bytes]:
-        """ run a command on inside the LXC container """
-
-        cmd = self._build_pct_command(cmd)
-
-        super(Connection, self).exec_command(cmd, in_data=in_data, sudoable=sudoable)
+    def _open_channel(self, cmd: str, sudoable: bool = True) -> tuple[t.Any, bytes, bytes]:
+        """ run a command on the Proxmox host, return the channel and the output read while waiting for a become prompt """
 
         bufsize = 4096
 
@@ -722,6 +753,23 @@ class Connection(ConnectionBase):
                     no_prompt_out += become_output
                     no_prompt_err += become_output
 
+        except socket.timeout:
+            raise AnsibleError('ssh timed out waiting for privilege escalation.\n' + to_text(become_output))
+
+        return chan, no_prompt_out, no_prompt_err
+
+    def exec_command(self, cmd: str, in_data: bytes | None = None, sudoable: bool = True) -> tuple[int, bytes, bytes]:
+        """ run a command on inside the LXC container """
+
+        cmd = self._build_pct_command(cmd)
+
+        super(Connection, self).exec_command(cmd, in_data=in_data, sudoable=sudoable)
+
+        bufsize = 4096
+
+        chan, no_prompt_out, no_prompt_err = self._open_channel(cmd, sudoable)
+
+        try:
             if in_data:
                 for i in range(0, len(in_data), bufsize):
                     chan.send(in_data[i:i + bufsize])
@@ -730,7 +778,7 @@ class Connection(ConnectionBase):
                 chan.shutdown_write()
 
         except socket.timeout:
-            raise AnsibleError('ssh timed out waiting for privilege escalation.\n' + to_text(become_output))
+            raise AnsibleError('ssh timed out waiting for privilege escalation.\n' + to_text(no_prompt_out))
 
         stdout = b''.join(chan.makefile('rb', bufsize))
         stderr = b''.join(chan.makefile_stderr('rb', bufsize))
@@ -742,25 +790,98 @@ class Connection(ConnectionBase):
 
         return (returncode, no_prompt_out + stdout, no_prompt_out + stderr)
 
+    def _build_pct_transfer_command(self, action: str, src: str, dest: str) -> str:
+        """ build a command for the Proxmox host running C(pct push) or C(pct pull) """
+
+        cmd = ['/usr/sbin/pct', action, str(self.get_option('vmid')), src, dest]
+        if self.get_option('remote_user') != 'root':
+            if action == 'pull':
+                # The temporary file has to stay readable for the remote user
+                cmd += ['--user', self.get_option('remote_user')]
+            cmd = [self.get_option('proxmox_become_method')] + cmd
+        return ' '.join(cmd)
+
+    def _build_transfer_command(self, direction: str, path: str, use_pct: bool) -> str:
+        """ build the command receiving (put) or sending (fetch) the content of a file """
+
+        compress = self.get_option('transfer_compression') == 'gzip'
+        if direction == 'put':
+            stream = 'gzip -dc >' if compress else 'cat >'
+        else:
+            stream = 'gzip -c' if compress else 'cat'
+
+        if not use_pct:
+            return self._build_pct_command(
+                ' '.join([self._shell.executable, '-c', self._shell.quote(f'{stream} {path}')]))
+
+        # Transfer the file through a temporary file on the Proxmox host
+        path = self._shell.quote(path)
+        tmp = '"$tmp"'
+        if direction == 'put':
+            transfer = f'{stream} {tmp} && {self._build_pct_transfer_command("push", tmp, path)}'
+        else:
+            transfer = f'{self._build_pct_transfer_command("pull", path, tmp)} && {stream} {tmp}'
+        script = f'tmp=$(mktemp) || exit 1; trap \'rm -f {tmp}\' EXIT; {transfer}'
+        return ' '.join(['/bin/sh', '-c', self._shell.quote(script)])
+
+    def _use_pct_transfer(self, size: int | None = None) -> bool:
+        threshold = self.get_option('pct_transfer_threshold')
+        return threshold > 0 and (size is None or size >= threshold)
+
+    def _finish_transfer(self, chan: t.Any, stdout: bytes = b'') -> None:
+        """ wait for the end of a transfer command and raise an error if it failed """
+
+        stdout += b''.join(chan.makefile('rb', TRANSFER_CHUNK_SIZE))
+        stderr = b''.join(chan.makefile_stderr('rb', TRANSFER_CHUNK_SIZE))
+        returncode = chan.recv_exit_status()
+        if returncode != 0:
+            stderr = stderr.decode('utf-8', errors='replace')
+            if 'pct: not found' in stderr:
+                raise AnsibleError(
+                    f'pct not found in path of host: {to_text(self.get_option("remote_addr"))}')
+            for command in ('cat', 'gzip'):
+                if f'{command}: not found' in stderr:
+                    raise AnsibleError(
+                        f'{command} not found in path of container: {to_text(self.get_option("vmid"))}')
+            raise AnsibleError(
+                f'{to_text(stdout)}\n{stderr}')
+
+    def _display_throughput(self, action: str, path: str, size: int, wire_size: int, start: float) -> None:
+        duration = max(time.monotonic() - start, 1e-6)
+        display.vvvv(f'{action} {path}: {size} bytes ({wire_size} bytes transferred) in {duration:.2f}s, '
+                     f'{size / duration / 1048576:.2f} MiB/s',
+                     host=self.get_option('remote_addr'))
+
     def put_file(self, in_path: str, out_path: str) -> None:
         """ transfer a file from local to remote """
 
+        super(Connection, self).put_file(in_path, out_path)
         display.vvv(f'PUT {in_path} TO {out_path}', host=self.get_option('remote_addr'))
         try:
             with open(in_path, 'rb') as f:
-                data = f.read()
-                returncode, stdout, stderr = self.exec_command(
-                    ' '.join([
-                        self._shell.executable, '-c',
-                        self._shell.quote(f'cat > {out_path}')]),
-                    in_data=data,
-                    sudoable=False)
-            if returncode != 0:
-                if 'cat: not found' in stderr.decode('utf-8'):
-                    raise AnsibleError(
-                        f'cat not found in path of container: {to_text(self.get_option("vmid"))}')
-                raise AnsibleError(
-                    f'{to_text(stdout)}\n{to_text(stderr)}')
+                use_pct = self._use_pct_transfer(os.fstat(f.fileno()).st_size)
+                cmd = self._build_transfer_command('put', out_path, use_pct)
+                chan, stdout, dummy = self._open_channel(cmd, sudoable=False)
+
+                start = time.monotonic()
+                size = wire_size = 0
+                compressor = None
+                if self.get_option('transfer_compression') == 'gzip':
+                    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+                for chunk in iter(partial(f.read, TRANSFER_CHUNK_SIZE), b''):
+                    size += len(chunk)
+                    if compressor:
+                        chunk = compressor.compress(chunk)
+                    wire_size += len(chunk)
+                    chan.sendall(chunk)
+                if compressor:
+                    chunk = compressor.flush()
+                    wire_size += len(chunk)
+                    chan.sendall(chunk)
+                chan.shutdown_write()
+
+            self._finish_transfer(chan, stdout)
+            self._display_throughput('PUT', out_path, size, wire_size, start)
         except Exception as e:
             raise AnsibleError(
                 f'error occurred while putting file from {in_path} to {out_path}!\n{to_text(e)}')
@@ -768,21 +889,44 @@ class Connection(ConnectionBase):
     def fetch_file(self, in_path: str, out_path: str) -> None:
         """ save a remote file to the specified path """
 
+        super(Connection, self).fetch_file(in_path, out_path)
         display.vvv(f'FETCH {in_path} TO {out_path}', host=self.get_option('remote_addr'))
         try:
-            returncode, stdout, stderr = self.exec_command(
-                ' '.join([
-                    self._shell.executable, '-c',
-                    self._shell.quote(f'cat {in_path}')]),
-                sudoable=False)
-            if returncode != 0:
-                if 'cat: not found' in stderr.decode('utf-8'):
-                    raise AnsibleError(
-                        f'cat not found in path of container: {to_text(self.get_option("vmid"))}')
-                raise AnsibleError(
-                    f'{to_text(stdout)}\n{to_text(stderr)}')
-            with open(out_path, 'wb') as f:
-                f.write(stdout)
+            cmd = self._build_transfer_command('fetch', in_path, self._use_pct_transfer())
+            chan, stdout, dummy = self._open_channel(cmd, sudoable=False)
+
+            start = time.monotonic()
+            size = wire_size = 0
+            decompressor = None
+            if self.get_option('transfer_compression') == 'gzip':
+                decompressor = zlib.decompressobj(wbits=GZIP_WBITS)
+            # The file is only created once there is data for it, so that a failing
+            # command is reported with its error instead of leaving an empty file
+            f = None
+            try:
+                # Output read while waiting for a become prompt belongs to the file
+                chunk = stdout or chan.recv(TRANSFER_CHUNK_SIZE)
+                while chunk:
+                    wire_size += len(chunk)
+                    if decompressor:
+                        chunk = decompressor.decompress(chunk)
+                    size += len(chunk)
+                    if f is None:
+                        f = open(out_path, 'wb')
+                    f.write(chunk)
+                    chunk = chan.recv(TRANSFER_CHUNK_SIZE)
+                self._finish_transfer(chan)
+                if f is None:
+                    f = open(out_path, 'wb')
+                if decompressor:
+                    chunk = decompressor.flush()
+                    size += len(chunk)
+                    f.write(chunk)
+            finally:
+                if f is not None:
+                    f.close()
+
+            self._display_throughput('FETCH', in_path, size, wire_size, start)
         except Exception as e:
             raise AnsibleError(
                 f'error occurred while fetching file from {in_path} to {out_path}!\n{to_text(e)}')
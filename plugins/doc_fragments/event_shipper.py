@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2026 Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+
+class ModuleDocFragment(object):
+
+    # Options of callback plugins sending their events with plugin_utils.event_shipper.
+    # The plugins add the env and ini entries of these options.
+    DOCUMENTATION = r"""
+options:
+  async_delivery:
+    description:
+      - Whether to send the events from a background thread instead of sending every event on the controller's main thread
+        before the playbook can continue.
+      - Several events are then sent together, see O(batch_max_events), O(batch_max_bytes) and O(flush_interval).
+      - All pending events are sent at the end of the playbook run, and the number of sent and dropped events is displayed.
+    type: bool
+    default: false
+    version_added: 10.5.0
+  batch_max_events:
+    description:
+      - Maximum number of events sent together when O(async_delivery=true).
+    type: int
+    default: 100
+    version_added: 10.5.0
+  batch_max_bytes:
+    description:
+      - Maximum size in bytes of the events sent together when O(async_delivery=true).
+    type: int
+    default: 1048576
+    version_added: 10.5.0
+  flush_interval:
+    description:
+      - Maximum number of seconds an event waits for more events to be sent with when O(async_delivery=true).
+    type: float
+    default: 2
+    version_added: 10.5.0
+  queue_size:
+    description:
+      - Maximum number of events waiting to be sent when O(async_delivery=true). Further events are dropped until the queue
+        has room again.
+    type: int
+    default: 10000
+    version_added: 10.5.0
+  retries:
+    description:
+      - Number of times sending a batch of events is retried, with an exponential backoff, when O(async_delivery=true).
+    type: int
+    default: 3
+    version_added: 10.5.0
+"""
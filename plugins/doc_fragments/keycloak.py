@@ -82,6 +82,26 @@ options:
     type: str
     default: Ansible
     version_added: 5.4.0
+
+  token_cache:
+    description:
+      - Store the tokens obtained from O(auth_username) and O(auth_password) in a cache file on the controller,
+        and reuse them in later tasks until they expire instead of authenticating again.
+      - Expired access tokens are renewed with the refresh token returned by Keycloak when it is still valid.
+      - The cache file is locked while it is used, so that modules running in parallel do not request tokens at the same time.
+      - The cache is keyed by O(auth_keycloak_url), O(auth_realm), O(auth_client_id) and a hash of the credentials.
+      - The cache is not used when O(token) is set.
+    type: bool
+    default: false
+    version_added: 10.5.0
+
+  token_cache_dir:
+    description:
+      - Directory in which the token cache files are stored when O(token_cache=true).
+      - The directory is created with mode C(0700) if it does not exist, and must be owned by the user running the module.
+      - Defaults to a C(ansible-keycloak-tokens-<uid>) directory in the temporary directory of the system.
+    type: path
+    version_added: 10.5.0
 """
 
     ACTIONGROUP_KEYCLOAK = r"""
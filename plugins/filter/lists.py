@@ -5,26 +5,63 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+
 from ansible.errors import AnsibleFilterError
 from ansible.module_utils.common.collections import is_sequence
 
 
+# Markers distinguishing the frozen forms of dicts, lists and tuples
+_DICT = object()
+_LIST = object()
+_TUPLE = object()
+
+
+def _freeze(item):
+    """Return a hashable key for item.
+
+    Hashable items are their own key. Dicts, lists, tuples and sets containing
+    unhashable values are converted recursively, so that two items have equal
+    keys exactly when they compare equal. Raises TypeError for other unhashable
+    values.
+    """
+    # Check the common container types first, which is faster than failing to hash them
+    if isinstance(item, dict):
+        return (_DICT, frozenset((key, _freeze(value)) for key, value in item.items()))
+    if isinstance(item, list):
+        return (_LIST, tuple(_freeze(value) for value in item))
+    try:
+        hash(item)
+        return item
+    except TypeError:
+        pass
+    if isinstance(item, Mapping):
+        return (_DICT, frozenset((key, _freeze(value)) for key, value in item.items()))
+    if isinstance(item, tuple):
+        return (_TUPLE, tuple(_freeze(value) for value in item))
+    if isinstance(item, set):
+        return frozenset(item)
+    raise TypeError(f"unhashable type: '{type(item).__name__}'")
+
+
 def remove_duplicates(lst):
     seen = set()
     seen_add = seen.add
     result = []
-    for item in lst:
-        try:
-            if item not in seen:
-                seen_add(item)
+    try:
+        for item in lst:
+            key = _freeze(item)
+            if key not in seen:
+                seen_add(key)
                 result.append(item)
-        except TypeError:
-            # This happens for unhashable values `item`. If this happens,
-            # convert `seen` to a list and continue.
-            seen = list(seen)
-            seen_add = seen.append
+    except TypeError:
+        # This happens for values that cannot be frozen. If this happens,
+        # compare the values with a list instead and redo.
+        seen = []
+        result = []
+        for item in lst:
             if item not in seen:
-                seen_add(item)
+                seen.append(item)
                 result.append(item)
     return result
 
@@ -105,10 +142,10 @@ def lists_intersect(*args, **kwargs):
 def do_intersect(a, b):
     isect = []
     try:
-        other = set(b)
-        isect = [item for item in a if item in other]
+        other = set(_freeze(item) for item in b)
+        isect = [item for item in a if _freeze(item) in other]
     except TypeError:
-        # This happens for unhashable values,
+        # This happens for values that cannot be frozen,
         # use a list instead and redo.
         other = list(b)
         isect = [item for item in a if item in other]
@@ -145,10 +182,10 @@ def lists_difference(*args, **kwargs):
 def do_difference(a, b):
     diff = []
     try:
-        other = set(b)
-        diff = [item for item in a if item not in other]
+        other = set(_freeze(item) for item in b)
+        diff = [item for item in a if _freeze(item) not in other]
     except TypeError:
-        # This happens for unhashable values,
+        # This happens for values that cannot be frozen,
         # use a list instead and redo.
         other = list(b)
         diff = [item for item in a if item not in other]
@@ -184,14 +221,21 @@ def lists_symmetric_difference(*args, **kwargs):
 
 def do_symmetric_difference(a, b):
     sym_diff = []
-    union = lists_union(a, b)
     try:
-        isect = set(a) & set(b)
-        sym_diff = [item for item in union if item not in isect]
+        keys_a = [_freeze(item) for item in a]
+        keys_b = [_freeze(item) for item in b]
+        # Items in the intersection are marked as seen, so that only the
+        # first occurrence of the other items is kept
+        seen = set(keys_a) & set(keys_b)
+        for item, key in zip(a + b, keys_a + keys_b):
+            if key not in seen:
+                seen.add(key)
+                sym_diff.append(item)
     except TypeError:
-        # This happens for unhashable values,
+        # This happens for values that cannot be frozen,
         # build the intersection of `a` and `b` backed
         # by a list instead of a set and redo.
+        union = lists_union(a, b)
         isect = lists_intersect(a, b)
         sym_diff = [item for item in union if item not in isect]
     return sym_diff
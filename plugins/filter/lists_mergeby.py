@@ -197,27 +197,50 @@ _value:
 
 from ansible.errors import AnsibleFilterError
 from ansible.module_utils.six import string_types
-from ansible.module_utils.common._collections_compat import Mapping, Sequence
+from ansible.module_utils.common._collections_compat import Mapping, MutableMapping, Sequence
 from ansible.utils.vars import merge_hash
 
-from collections import defaultdict
+from itertools import chain
 from operator import itemgetter
 
 
+def _merge_into(target, elem, recursive, list_merge):
+    '''Merge the dictionary 'elem' into the dictionary 'target' in place,
+       with the same result as updating 'target' with merge_hash(target, elem).
+    '''
+
+    if not recursive and list_merge == 'replace' and isinstance(elem, MutableMapping):
+        # merge_hash would only copy target and update the copy
+        target.update(elem)
+    else:
+        target.update(merge_hash(target, elem, recursive, list_merge))
+
+
+def _merge_elements(elems, index, recursive=False, list_merge='replace'):
+    '''Merge the dictionaries of the iterable 'elems' in order, by
+       attribute 'index'. Returns a dict of the merged dictionaries
+       keyed by their value of 'index'.
+    '''
+
+    d = {}
+    for elem in elems:
+        if not isinstance(elem, Mapping):
+            msg = "Elements of list arguments for lists_mergeby must be dictionaries. %s is %s"
+            raise AnsibleFilterError(msg % (elem, type(elem)))
+        if index in elem.keys():
+            key = elem[index]
+            if key not in d:
+                d[key] = {}
+            _merge_into(d[key], elem, recursive, list_merge)
+    return d
+
+
 def list_mergeby(x, y, index, recursive=False, list_merge='replace'):
     '''Merge 2 lists by attribute 'index'. The function 'merge_hash'
-       from ansible.utils.vars is used.  This function is used by the
-       function lists_mergeby.
+       from ansible.utils.vars is used.
     '''
 
-    d = defaultdict(dict)
-    for lst in (x, y):
-        for elem in lst:
-            if not isinstance(elem, Mapping):
-                msg = "Elements of list arguments for lists_mergeby must be dictionaries. %s is %s"
-                raise AnsibleFilterError(msg % (elem, type(elem)))
-            if index in elem.keys():
-                d[elem[index]].update(merge_hash(d[elem[index]], elem, recursive, list_merge))
+    d = _merge_elements(chain(x, y), index, recursive, list_merge)
     return sorted(d.values(), key=itemgetter(index))
 
 
@@ -262,12 +285,23 @@ def lists_mergeby(*terms, **kwargs):
                "%s is %s")
         raise AnsibleFilterError(msg % (index, type(index)))
 
-    high_to_low_prio_list_iterator = reversed(lists)
-    result = next(high_to_low_prio_list_iterator)
-    for list in high_to_low_prio_list_iterator:
-        result = list_mergeby(list, result, index, recursive, list_merge)
-
-    return result
+    # The result is the same as folding the lists pairwise with
+    # list_mergeby, from the highest to the lowest priority:
+    #   list_mergeby(list1, list_mergeby(list2, list_mergeby(list3, list4)))
+    # merge_hash is not associative (for instance, it does not append
+    # equal lists), so the grouping of the merges is kept: the two lists
+    # of highest priority are merged in one sequence, and each other list
+    # is merged on its own, then merged with the result of the lists of
+    # higher priority. Only the merged dictionaries are updated, and the
+    # result is sorted once.
+    merged = _merge_elements(chain(lists[-2], lists[-1]), index, recursive, list_merge)
+    for lst in reversed(lists[:-2]):
+        for key, elem in _merge_elements(lst, index, recursive, list_merge).items():
+            if key in merged:
+                _merge_into(elem, merged[key], recursive, list_merge)
+            merged[key] = elem
+
+    return sorted(merged.values(), key=itemgetter(index))
 
 
 class FilterModule(object):
@@ -16,6 +16,8 @@ DOCUMENTATION = r'''
     requirements:
         - ipaddress
         - lxd >= 4.0
+    extends_documentation_fragment:
+        - inventory_cache
     options:
         plugin:
             description: Token that ensures this is a source file for the 'lxd' plugin.
@@ -104,6 +106,15 @@ DOCUMENTATION = r'''
             - Create groups by the following keywords C(location), C(network_range), C(os), C(pattern), C(profile), C(release), C(type), C(vlanid).
             - See example for syntax.
             type: dict
+        use_recursion:
+            description:
+            - Fetch all instances together with their state in a single request with C(recursion=2),
+              instead of fetching the configuration and state of every instance with two separate requests.
+            - This is much faster for LXD servers and clusters with many instances, but also returns the
+              snapshots and backups of every instance, which are not used by this plugin.
+            type: bool
+            default: false
+            version_added: 10.5.0
 '''
 
 EXAMPLES = '''
@@ -124,6 +135,16 @@ plugin: community.general.lxd
 url: unix:/var/snap/lxd/common/lxd/unix.socket
 type_filter: both
 
+---
+# lxd.yml for a large cluster, fetching all instances at once and caching the result
+plugin: community.general.lxd
+url: https://lxd.example.com:8443
+use_recursion: true
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: /tmp/lxd_inventory
+cache_timeout: 300
+
 # grouping lxd.yml
 groupby:
   locationBerlin:
@@ -167,11 +188,12 @@ groupby:
     attribute: internals
 '''
 
+import copy
 import json
 import re
 import time
 import os
-from ansible.plugins.inventory import BaseInventoryPlugin
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable
 from ansible.module_utils.common.text.converters import to_native, to_text
 from ansible.module_utils.common.dict_transformations import dict_merge
 from ansible.module_utils.six import raise_from
@@ -188,12 +210,18 @@ else:
     IPADDRESS_IMPORT_ERROR = None
 
 
-class InventoryModule(BaseInventoryPlugin):
+class InventoryModule(BaseInventoryPlugin, Cacheable):
     DEBUG = 4
     NAME = 'community.general.lxd'
     SNAP_SOCKET_URL = 'unix:/var/snap/lxd/common/lxd/unix.socket'
     SOCKET_URL = 'unix:/var/lib/lxd/unix.socket'
 
+    def __init__(self):
+        super(InventoryModule, self).__init__()
+        self.cache_key = None
+        self.use_cache = False
+        self.update_cache = False
+
     @staticmethod
     def load_json_data(path):
         """Load json data
@@ -407,11 +435,41 @@ class InventoryModule(BaseInventoryPlugin):
         # tuple(('instances','metadata/templates')) to get section in branch
         # e.g. /1.0/instances/<name>/metadata/templates
         branches = ['instances', ('instances', 'state')]
-        instance_config = {}
+        instances = self.data.setdefault('instances', {})
         for branch in branches:
             for name in names:
-                instance_config['instances'] = self._get_config(branch, name)
-                self.data = dict_merge(instance_config, self.data)
+                instances.setdefault(name, {}).update(self._get_config(branch, name)[name])
+
+    def get_instance_data_recursive(self):
+        """Create Inventory of all instances with a single request
+
+        Get all instances including their state with recursion=2 and store them
+        in the same layout as get_instance_data().
+
+        Args:
+            None
+        Kwargs:
+            None
+        Source:
+            https://documentation.ubuntu.com/lxd/en/latest/rest-api/#recursion
+        Raises:
+            None
+        Returns:
+            None"""
+        query = dict(recursion=2)
+        if self.project:
+            query['project'] = self.project
+        response = self.socket.do('GET', f'/1.0/instances?{urlencode(query)}')
+        instances = self.data.setdefault('instances', {})
+        for instance in response['metadata']:
+            instance = dict(instance)
+            state = instance.pop('state', None) or {}
+            # Snapshots and backups are not used by the inventory
+            instance.pop('snapshots', None)
+            instance.pop('backups', None)
+            instance_response = dict(response, metadata=instance)
+            state_response = dict(response, metadata=state)
+            instances[instance['name']] = {'instances': instance_response, 'state': state_response}
 
     def get_network_data(self, names):
         """Create Inventory of the instance
@@ -429,14 +487,15 @@ class InventoryModule(BaseInventoryPlugin):
         # tuple(('instances','metadata/templates')) to get section in branch
         # e.g. /1.0/instances/<name>/metadata/templates
         branches = [('networks', 'state')]
-        network_config = {}
+        networks = self.data.setdefault('networks', {})
         for branch in branches:
             for name in names:
                 try:
-                    network_config['networks'] = self._get_config(branch, name)
+                    network_config = self._get_config(branch, name)[name]
                 except LXDClientException:
-                    network_config['networks'] = {name: None}
-                self.data = dict_merge(network_config, self.data)
+                    networks[name] = None
+                else:
+                    networks.setdefault(name, {}).update(network_config)
 
     def extract_network_information_from_instance_config(self, instance_name):
         """Returns the network interface configuration
@@ -1058,10 +1117,23 @@ class InventoryModule(BaseInventoryPlugin):
         Returns:
             None"""
 
+        if len(self.data) == 0 and self.use_cache:
+            try:
+                self.data = copy.deepcopy(self._cache[self.cache_key])
+            except KeyError:
+                self.update_cache = True
+
         if len(self.data) == 0:  # If no data is injected by unittests open socket
             self.socket = self._connect_to_socket()
-            self.get_instance_data(self._get_instances())
+            if self.get_option('use_recursion'):
+                self.get_instance_data_recursive()
+            else:
+                self.get_instance_data(self._get_instances())
             self.get_network_data(self._get_networks())
+            self.data.setdefault('instances', {})
+            self.data.setdefault('networks', {})
+            if self.update_cache:
+                self._cache[self.cache_key] = copy.deepcopy(self.data)
 
         # The first version of the inventory only supported containers.
         # This will change in the future.
@@ -1075,7 +1147,7 @@ class InventoryModule(BaseInventoryPlugin):
 
         self.build_inventory()
 
-    def parse(self, inventory, loader, path, cache):
+    def parse(self, inventory, loader, path, cache=True):
         """Return dynamic inventory from source
 
         Returns the processed inventory from the lxd import
@@ -1120,6 +1192,9 @@ class InventoryModule(BaseInventoryPlugin):
                 self.filter = self.get_option('state').lower()
             self.trust_password = self.get_option('trust_password')
             self.url = self.get_option('url')
+            self.cache_key = self.get_cache_key(path)
+            self.use_cache = cache and self.get_option('cache')
+            self.update_cache = not cache and self.get_option('cache')
         except Exception as err:
             raise AnsibleParserError(
                 f'All correct options required: {err}')
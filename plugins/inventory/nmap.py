@@ -91,6 +91,28 @@ DOCUMENTATION = '''
             type: boolean
             default: true
             version_added: 7.4.0
+        xml_output:
+            description:
+              - Make nmap write its results as XML (C(-oX -)) and parse the hosts one by one while nmap is still running,
+                instead of parsing the complete human readable output once nmap has finished.
+            type: boolean
+            default: false
+            version_added: 10.5.0
+        shard_prefix_length:
+            description:
+              - Split an O(address) in CIDR notation into networks with this prefix length, which are scanned by separate nmap processes.
+              - For example, V(24) splits V(10.0.0.0/16) into 256 scans of C(/24) networks.
+              - Addresses which are no CIDR network, or whose prefix length is not shorter than this value, are scanned by a single nmap process.
+              - When caching is enabled, the results of every network are cached separately. When the inventory is refreshed
+                or the cache of some networks has expired, only these networks are scanned again.
+            type: int
+            version_added: 10.5.0
+        max_parallel_scans:
+            description:
+              - The maximum number of nmap processes run at the same time when scanning the networks created by O(shard_prefix_length).
+            type: int
+            default: 4
+            version_added: 10.5.0
     notes:
         - At least one of O(ipv4) or O(ipv6) is required to be V(true); both can be V(true), but they cannot both be V(false).
         - 'TODO: add OS fingerprinting'
@@ -117,11 +139,26 @@ exclude: 192.168.0.1, web.example.com
 port: 22, 443
 groups:
   web_servers: "ports | selectattr('port', 'equalto', '443')"
+
+---
+# scan a /16 network with up to 8 nmap processes scanning one /24 network each
+plugin: community.general.nmap
+address: 10.10.0.0/16
+xml_output: true
+shard_prefix_length: 24
+max_parallel_scans: 8
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: /tmp/nmap_inventory
 '''
 
+import ipaddress
 import os
 import re
+import tempfile
+import xml.etree.ElementTree as ET
 
+from concurrent.futures import ThreadPoolExecutor
 from subprocess import Popen, PIPE
 
 from ansible import constants as C
@@ -163,6 +200,221 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
             # Create groups based on variable values and add the corresponding hosts to it
             self._add_host_to_keyed_groups(self.get_option('keyed_groups'), host, hostname, strict=strict)
 
+    def _build_command(self):
+        cmd = [self._nmap]
+
+        if self.get_option('sudo'):
+            cmd.insert(0, 'sudo')
+
+        if self.get_option('port'):
+            cmd.append('-p')
+            cmd.append(self.get_option('port'))
+
+        if not self.get_option('ports'):
+            cmd.append('-sP')
+
+        if self.get_option('ipv4') and not self.get_option('ipv6'):
+            cmd.append('-4')
+        elif self.get_option('ipv6') and not self.get_option('ipv4'):
+            cmd.append('-6')
+        elif not self.get_option('ipv6') and not self.get_option('ipv4'):
+            raise AnsibleParserError('One of ipv4 or ipv6 must be enabled for this plugin')
+
+        if self.get_option('exclude'):
+            cmd.append('--exclude')
+            cmd.append(','.join(self.get_option('exclude')))
+
+        if self.get_option('dns_resolve'):
+            cmd.append('-n')
+
+        if self.get_option('udp_scan'):
+            cmd.append('-sU')
+
+        if self.get_option('icmp_timestamp'):
+            cmd.append('-PP')
+
+        if self.get_option('open'):
+            cmd.append('--open')
+
+        if not self.get_option('use_arp_ping'):
+            cmd.append('--disable-arp-ping')
+
+        if self.get_option('xml_output'):
+            cmd.extend(['-oX', '-'])
+
+        return cmd
+
+    def _get_shards(self, address):
+        prefix_length = self.get_option('shard_prefix_length')
+        if prefix_length:
+            try:
+                network = ipaddress.ip_network(address, strict=False)
+            except ValueError:
+                # ranges, host names and lists of addresses are not split
+                network = None
+            if network is not None and network.prefixlen < prefix_length <= network.max_prefixlen:
+                return [str(shard) for shard in network.subnets(new_prefix=prefix_length)]
+        return [address]
+
+    def _scan_shards(self, cmd, shards, cache_key, read_cache, update_cache):
+        results = {}
+        if read_cache:
+            for shard in shards:
+                try:
+                    results[shard] = self._cache[self._get_shard_cache_key(cache_key, shard)]
+                except KeyError:
+                    pass
+
+        missing = [shard for shard in shards if shard not in results]
+        if missing:
+            with ThreadPoolExecutor(max_workers=max(self.get_option('max_parallel_scans'), 1)) as executor:
+                for shard, shard_results in zip(missing, executor.map(lambda shard: self._scan(cmd, shard), missing)):
+                    results[shard] = shard_results
+                    if update_cache:
+                        self._cache[self._get_shard_cache_key(cache_key, shard)] = shard_results
+
+        return [host for shard in shards for host in results[shard]]
+
+    @staticmethod
+    def _get_shard_cache_key(cache_key, shard):
+        return f"{cache_key}_{re.sub('[^0-9a-zA-Z]', '_', shard)}"
+
+    def _scan(self, cmd, address):
+        cmd = cmd + [address]
+        if self.get_option('xml_output'):
+            return self._scan_xml(cmd)
+
+        # execute
+        p = Popen(cmd, stdout=PIPE, stderr=PIPE)
+        stdout, stderr = p.communicate()
+        if p.returncode != 0:
+            raise AnsibleParserError(f'Failed to run nmap, rc={p.returncode}: {to_native(stderr)}')
+
+        try:
+            t_stdout = to_text(stdout, errors='surrogate_or_strict')
+        except UnicodeError as e:
+            raise AnsibleParserError(f'Invalid (non unicode) input returned: {e}')
+
+        return self._parse_text_output(t_stdout)
+
+    def _parse_text_output(self, t_stdout):
+        # parse results
+        host = None
+        ip = None
+        ports = []
+        results = []
+
+        for line in t_stdout.splitlines():
+            hits = self.find_host.match(line)
+            if hits:
+                if host is not None and ports:
+                    results[-1]['ports'] = ports
+
+                # if dns only shows arpa, just use ip instead as hostname
+                if hits.group(1).endswith('.in-addr.arpa'):
+                    host = hits.group(2)
+                else:
+                    host = hits.group(1)
+
+                # if no reverse dns exists, just use ip instead as hostname
+                if hits.group(2) is not None:
+                    ip = hits.group(2)
+                else:
+                    ip = hits.group(1)
+
+                if host is not None:
+                    # update inventory
+                    results.append(dict())
+                    results[-1]['name'] = host
+                    results[-1]['ip'] = ip
+                    ports = []
+                continue
+
+            host_ports = self.find_port.match(line)
+            if host is not None and host_ports:
+                ports.append({'port': host_ports.group(1),
+                              'protocol': host_ports.group(2),
+                              'state': host_ports.group(3),
+                              'service': host_ports.group(4)})
+                continue
+
+        # if any leftovers
+        if host and ports:
+            results[-1]['ports'] = ports
+
+        return results
+
+    def _scan_xml(self, cmd):
+        # stderr goes to a file, so that nmap cannot block on a full pipe while its output is parsed
+        with tempfile.TemporaryFile() as stderr:
+            p = Popen(cmd, stdout=PIPE, stderr=stderr)
+            try:
+                results = self._parse_xml_output(p.stdout)
+                parse_error = None
+            except ET.ParseError as e:
+                results = []
+                parse_error = e
+            finally:
+                p.stdout.close()
+            if p.wait() != 0:
+                stderr.seek(0)
+                raise AnsibleParserError(f'Failed to run nmap, rc={p.returncode}: {to_native(stderr.read())}')
+        if parse_error is not None:
+            raise AnsibleParserError(f'Invalid XML returned by nmap: {parse_error}')
+        return results
+
+    def _parse_xml_output(self, stream):
+        results = []
+        root = None
+        for event, element in ET.iterparse(stream, events=('start', 'end')):
+            if root is None:
+                root = element
+            if event != 'end' or element.tag != 'host':
+                continue
+
+            result = self._parse_xml_host(element)
+            if result is not None:
+                results.append(result)
+
+            # drop the parsed host, so that the memory used does not grow with the size of the scan
+            root.clear()
+        return results
+
+    @staticmethod
+    def _parse_xml_host(element):
+        status = element.find('status')
+        if status is not None and status.get('state') != 'up':
+            return None
+
+        ip = None
+        for address in element.findall('address'):
+            if address.get('addrtype') in ('ipv4', 'ipv6'):
+                ip = address.get('addr')
+                break
+        if ip is None:
+            return None
+
+        host = ip
+        for hostname in element.findall('hostnames/hostname'):
+            name = hostname.get('name')
+            # if dns only shows arpa, just use ip instead as hostname
+            if name and not name.endswith('.in-addr.arpa'):
+                host = name
+                break
+
+        result = {'name': host, 'ip': ip}
+        ports = []
+        for port in element.findall('ports/port'):
+            state = port.find('state')
+            service = port.find('service')
+            ports.append({'port': port.get('portid'),
+                          'protocol': port.get('protocol'),
+                          'state': state.get('state') if state is not None else 'unknown',
+                          'service': service.get('name', 'unknown') if service is not None else 'unknown'})
+        if ports:
+            result['ports'] = ports
+        return result
+
     def verify_file(self, path):
 
         valid = False
@@ -196,6 +448,18 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         # update if the user has caching enabled and the cache is being refreshed; update this value to True if the cache has expired below
         cache_needs_update = user_cache_setting and not cache
 
+        cmd = self._build_command()
+        shards = self._get_shards(self.get_option('address'))
+
+        if len(shards) > 1:
+            # every shard is cached separately, only the shards missing in the cache are scanned
+            try:
+                results = self._scan_shards(cmd, shards, cache_key, attempt_to_read_cache, user_cache_setting)
+            except Exception as e:
+                raise AnsibleParserError(f"failed to parse {to_native(path)}: {e} ")
+            self._populate(results)
+            return
+
         if attempt_to_read_cache:
             try:
                 results = self._cache[cache_key]
@@ -204,102 +468,8 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
                 cache_needs_update = True
 
         if not user_cache_setting or cache_needs_update:
-            # setup command
-            cmd = [self._nmap]
-
-            if self.get_option('sudo'):
-                cmd.insert(0, 'sudo')
-
-            if self.get_option('port'):
-                cmd.append('-p')
-                cmd.append(self.get_option('port'))
-
-            if not self.get_option('ports'):
-                cmd.append('-sP')
-
-            if self.get_option('ipv4') and not self.get_option('ipv6'):
-                cmd.append('-4')
-            elif self.get_option('ipv6') and not self.get_option('ipv4'):
-                cmd.append('-6')
-            elif not self.get_option('ipv6') and not self.get_option('ipv4'):
-                raise AnsibleParserError('One of ipv4 or ipv6 must be enabled for this plugin')
-
-            if self.get_option('exclude'):
-                cmd.append('--exclude')
-                cmd.append(','.join(self.get_option('exclude')))
-
-            if self.get_option('dns_resolve'):
-                cmd.append('-n')
-
-            if self.get_option('udp_scan'):
-                cmd.append('-sU')
-
-            if self.get_option('icmp_timestamp'):
-                cmd.append('-PP')
-
-            if self.get_option('open'):
-                cmd.append('--open')
-
-            if not self.get_option('use_arp_ping'):
-                cmd.append('--disable-arp-ping')
-
-            cmd.append(self.get_option('address'))
             try:
-                # execute
-                p = Popen(cmd, stdout=PIPE, stderr=PIPE)
-                stdout, stderr = p.communicate()
-                if p.returncode != 0:
-                    raise AnsibleParserError(f'Failed to run nmap, rc={p.returncode}: {to_native(stderr)}')
-
-                # parse results
-                host = None
-                ip = None
-                ports = []
-                results = []
-
-                try:
-                    t_stdout = to_text(stdout, errors='surrogate_or_strict')
-                except UnicodeError as e:
-                    raise AnsibleParserError(f'Invalid (non unicode) input returned: {e}')
-
-                for line in t_stdout.splitlines():
-                    hits = self.find_host.match(line)
-                    if hits:
-                        if host is not None and ports:
-                            results[-1]['ports'] = ports
-
-                        # if dns only shows arpa, just use ip instead as hostname
-                        if hits.group(1).endswith('.in-addr.arpa'):
-                            host = hits.group(2)
-                        else:
-                            host = hits.group(1)
-
-                        # if no reverse dns exists, just use ip instead as hostname
-                        if hits.group(2) is not None:
-                            ip = hits.group(2)
-                        else:
-                            ip = hits.group(1)
-
-                        if host is not None:
-                            # update inventory
-                            results.append(dict())
-                            results[-1]['name'] = host
-                            results[-1]['ip'] = ip
-                            ports = []
-                        continue
-
-                    host_ports = self.find_port.match(line)
-                    if host is not None and host_ports:
-                        ports.append({'port': host_ports.group(1),
-                                      'protocol': host_ports.group(2),
-                                      'state': host_ports.group(3),
-                                      'service': host_ports.group(4)})
-                        continue
-
-                # if any leftovers
-                if host and ports:
-                    results[-1]['ports'] = ports
-
+                results = self._scan(cmd, shards[0])
             except Exception as e:
                 raise AnsibleParserError(f"failed to parse {to_native(path)}: {e} ")
 
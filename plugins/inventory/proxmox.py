@@ -120,6 +120,29 @@ DOCUMENTATION = '''
         type: bool
         default: false
         version_added: 8.1.0
+      fetch_workers:
+        description:
+          - Number of worker threads used to query the Proxmox API.
+          - When set to a value higher than V(1), the node, guest and pool requests are sent concurrently over
+            the shared HTTP session. Hosts and groups are still added to the inventory in the same order as
+            with serial fetching.
+          - The default V(1) queries the API serially.
+        type: int
+        default: 1
+        version_added: 10.5.0
+      use_cluster_resources:
+        description:
+          - Use the C(/cluster/resources) API endpoint to list the LXC containers and QEMU VMs of the whole cluster
+            with a single request, instead of querying every node separately.
+          - The status, node placement and pool membership of the guests are then taken from this response, so
+            no per-pool requests are made.
+          - Per-guest requests are only made for options that need them. Guest configuration, snapshots and
+            interfaces are only queried with O(want_facts), and the QEMU status details are only queried for
+            running VMs with O(qemu_extended_statuses). As a consequence the C(qmpstatus) fact is not set for
+            QEMU VMs unless O(qemu_extended_statuses) is enabled.
+        type: bool
+        default: false
+        version_added: 10.5.0
       filters:
         version_added: 4.6.0
         description: A list of Jinja templates that allow filtering hosts.
@@ -222,6 +245,8 @@ want_proxmox_nodes_ansible_host: true
 import itertools
 import re
 
+from concurrent.futures import ThreadPoolExecutor
+
 from ansible.module_utils.common._collections_compat import MutableMapping
 
 from ansible.errors import AnsibleError
@@ -260,6 +285,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         self.session = None
         self.cache_key = None
         self.use_cache = None
+        self._executor = None
 
     def verify_file(self, path):
 
@@ -275,8 +301,22 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         if not self.session:
             self.session = requests.session()
             self.session.verify = self.get_option('validate_certs')
+            fetch_workers = self.get_option('fetch_workers')
+            if fetch_workers and fetch_workers > 1:
+                # make sure every worker thread can keep its own connection open
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=fetch_workers)
+                self.session.mount('https://', adapter)
+                self.session.mount('http://', adapter)
         return self.session
 
+    def _fetch_all(self, func, args_list):
+        '''Call func for every tuple of arguments in args_list. The calls are
+        run in the worker pool when O(fetch_workers) is higher than 1, the
+        results are always returned in the order of args_list.'''
+        if self._executor is None:
+            return [func(*args) for args in args_list]
+        return list(self._executor.map(lambda args: func(*args), args_list))
+
     def _get_auth(self):
         validate_certs = self.get_option('validate_certs')
 
@@ -353,6 +393,9 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     def _get_pools(self):
         return self._get_json(f"{self.proxmox_url}/api2/json/pools")
 
+    def _get_cluster_resources(self):
+        return self._get_json(f"{self.proxmox_url}/api2/json/cluster/resources?type=vm")
+
     def _get_lxc_per_node(self, node):
         return self._get_json(f"{self.proxmox_url}/api2/json/nodes/{node}/lxc")
 
@@ -545,26 +588,35 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         self._add_host_to_composed_groups(self.get_option('groups'), variables, name, strict=self.strict)
         self._add_host_to_keyed_groups(self.get_option('keyed_groups'), variables, name, strict=self.strict)
 
-    def _handle_item(self, node, ittype, item):
-        '''Handle an item from the list of LXC containers and Qemu VM. The
-        return value will be either None if the item was skipped or the name of
-        the item if it was added to the inventory.'''
-        if item.get('template'):
-            return None
-
+    def _get_item_properties(self, node, ittype, item):
+        '''Fetch the status, config and snapshots of an LXC container or Qemu
+        VM if want_facts is enabled, and return them as a dict of properties.'''
         properties = dict()
         name, vmid = item['name'], item['vmid']
 
         # get status, config and snapshots if want_facts == True
-        want_facts = self.get_option('want_facts')
-        if want_facts:
-            self._get_vm_status(properties, node, vmid, ittype, name)
+        if self.get_option('want_facts'):
+            if not self.get_option('use_cluster_resources'):
+                self._get_vm_status(properties, node, vmid, ittype, name)
+            elif ittype == 'qemu' and item['status'] == 'running' and self.get_option('qemu_extended_statuses'):
+                # only the QEMU status details are missing from the cluster resources
+                self._get_vm_status(properties, node, vmid, ittype, name)
+            else:
+                properties[self._fact('status')] = item['status']
             self._get_vm_config(properties, node, vmid, ittype, name)
             self._get_vm_snapshots(properties, node, vmid, ittype, name)
 
             if ittype == 'lxc':
                 self._get_lxc_interfaces(properties, node, vmid)
 
+        return properties
+
+    def _handle_item(self, node, ittype, item, properties):
+        '''Handle an item from the list of LXC containers and Qemu VM. The
+        return value will be either None if the item was skipped or the name of
+        the item if it was added to the inventory.'''
+        name = item['name']
+
         # ensure the host satisfies filters
         if not self._can_add_host(name, properties):
             return None
@@ -577,24 +629,32 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
         item_status = item['status']
         if item_status == 'running':
-            if want_facts and ittype == 'qemu' and self.get_option('qemu_extended_statuses'):
+            if self.get_option('want_facts') and ittype == 'qemu' and self.get_option('qemu_extended_statuses'):
                 # get more details about the status of the qemu VM
                 item_status = properties.get(self._fact('qmpstatus'), item_status)
         self.inventory.add_child(self._group(f'all_{item_status}'), name)
 
         return name
 
-    def _populate_pool_groups(self, added_hosts):
+    def _populate_pool_groups(self, added_hosts, cluster_resources=None):
         '''Generate groups from Proxmox resource pools, ignoring VMs and
-        containers that were skipped.'''
-        for pool in self._get_pools():
-            poolid = pool.get('poolid')
-            if not poolid:
-                continue
+        containers that were skipped. When the cluster resources are given,
+        the pool members are taken from them instead of querying every pool.'''
+        poolids = [pool.get('poolid') for pool in self._get_pools() if pool.get('poolid')]
+        if cluster_resources is None:
+            pool_members = self._fetch_all(self._get_members_per_pool, [(poolid,) for poolid in poolids])
+        else:
+            members_per_pool = {}
+            for item in cluster_resources:
+                if item.get('pool'):
+                    members_per_pool.setdefault(item['pool'], []).append(item)
+            pool_members = [members_per_pool.get(poolid, []) for poolid in poolids]
+
+        for poolid, members in zip(poolids, pool_members):
             pool_group = self._group(f"pool_{poolid}")
             self.inventory.add_group(pool_group)
 
-            for member in self._get_members_per_pool(poolid):
+            for member in members:
                 name = member.get('name')
                 if name and name in added_hosts:
                     self.inventory.add_child(pool_group, name)
@@ -617,10 +677,40 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
         # gather vm's on nodes
         self._get_auth()
+        nodes = [node for node in self._get_nodes() if node.get('node')]
+        online_nodes = [node['node'] for node in nodes if node['status'] != 'offline']
+
+        # query the API up front, so the requests can be run concurrently
+        node_ips = {}
+        if want_proxmox_nodes_ansible_host and not self.exclude_nodes:
+            node_ips = dict(zip(online_nodes, self._fetch_all(self._get_node_ip, [(node,) for node in online_nodes])))
+
+        cluster_resources = None
+        node_items = {}
+        if self.get_option('use_cluster_resources'):
+            # a single request lists the guests of all nodes
+            cluster_resources = self._get_cluster_resources()
+            for node in online_nodes:
+                node_items[node] = []
+            for ittype in ('lxc', 'qemu'):
+                for item in cluster_resources:
+                    if item.get('type') == ittype and item.get('node') in node_items and not item.get('template'):
+                        node_items[item['node']].append((item['node'], ittype, item))
+        else:
+            node_args = [(node,) for node in online_nodes]
+            for node, lxc_list, qemu_list in zip(online_nodes,
+                                                 self._fetch_all(self._get_lxc_per_node, node_args),
+                                                 self._fetch_all(self._get_qemu_per_node, node_args)):
+                lxc_objects = zip(itertools.repeat('lxc'), lxc_list)
+                qemu_objects = zip(itertools.repeat('qemu'), qemu_list)
+                node_items[node] = [(node, ittype, item) for ittype, item in itertools.chain(lxc_objects, qemu_objects)
+                                    if not item.get('template')]
+
+        item_args = list(itertools.chain.from_iterable(node_items[node] for node in online_nodes))
+        item_properties = iter(self._fetch_all(self._get_item_properties, item_args))
+
         hosts = []
-        for node in self._get_nodes():
-            if not node.get('node'):
-                continue
+        for node in nodes:
             if not self.exclude_nodes:
                 self.inventory.add_host(node['node'])
             if node['type'] == 'node' and not self.exclude_nodes:
@@ -631,8 +721,7 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
             # get node IP address
             if want_proxmox_nodes_ansible_host and not self.exclude_nodes:
-                ip = self._get_node_ip(node['node'])
-                self.inventory.set_variable(node['node'], 'ansible_host', ip)
+                self.inventory.set_variable(node['node'], 'ansible_host', node_ips[node['node']])
 
             # Setting composite variables
             if not self.exclude_nodes:
@@ -644,16 +733,14 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
                 node_type_group = self._group(f"{node['node']}_{ittype}")
                 self.inventory.add_group(node_type_group)
 
-            # get LXC containers and Qemu VMs for this node
-            lxc_objects = zip(itertools.repeat('lxc'), self._get_lxc_per_node(node['node']))
-            qemu_objects = zip(itertools.repeat('qemu'), self._get_qemu_per_node(node['node']))
-            for ittype, item in itertools.chain(lxc_objects, qemu_objects):
-                name = self._handle_item(node['node'], ittype, item)
+            # add LXC containers and Qemu VMs for this node
+            for node_name, ittype, item in node_items[node['node']]:
+                name = self._handle_item(node_name, ittype, item, next(item_properties))
                 if name is not None:
                     hosts.append(name)
 
         # gather vm's in pools
-        self._populate_pool_groups(hosts)
+        self._populate_pool_groups(hosts, cluster_resources)
 
     def parse(self, inventory, loader, path, cache=True):
         if not HAS_REQUESTS:
@@ -690,8 +777,20 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
         self.facts_prefix = self.get_option('facts_prefix')
         self.strict = self.get_option('strict')
 
+        fetch_workers = self.get_option('fetch_workers')
+        if fetch_workers < 1:
+            raise AnsibleError('fetch_workers must be at least 1.')
+
         # actually populate inventory
         self._results = {}
-        self._populate()
+        if fetch_workers > 1:
+            with ThreadPoolExecutor(max_workers=fetch_workers) as executor:
+                self._executor = executor
+                try:
+                    self._populate()
+                finally:
+                    self._executor = None
+        else:
+            self._populate()
         if self.update_cache:
             self._cache[self.cache_key] = self._results
@@ -52,6 +52,21 @@ DOCUMENTATION = '''
             default: false
             type: bool
             version_added: 9.2.0
+        enumerate_properties:
+            description:
+              - Read all guest properties of a VM with a single C(VBoxManage guestproperty enumerate) call, instead of calling
+                C(VBoxManage guestproperty get) for O(network_info_path) and every property in O(query).
+              - The properties of several VMs are read concurrently, see O(enumerate_workers).
+            default: false
+            type: bool
+            version_added: 10.5.0
+        enumerate_workers:
+            description:
+              - The maximum number of C(VBoxManage guestproperty enumerate) processes run at the same time when
+                O(enumerate_properties=true).
+            default: 4
+            type: int
+            version_added: 10.5.0
 '''
 
 EXAMPLES = '''
@@ -72,7 +87,9 @@ groups:
 '''
 
 import os
+import re
 
+from concurrent.futures import ThreadPoolExecutor
 from subprocess import Popen, PIPE
 
 from ansible.errors import AnsibleParserError
@@ -90,11 +107,50 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
     NAME = 'community.general.virtualbox'
     VBOX = "VBoxManage"
 
+    # Lines of 'VBoxManage guestproperty enumerate', before and since VirtualBox 7.0
+    GUEST_PROPERTY_PATTERNS = (
+        re.compile(r"^Name: (?P<name>.+?), value: (?P<value>.*?), timestamp: "),
+        # Since 7.0 the names are padded to align the values, the timestamp and the flags are optional
+        re.compile(r"^(?P<name>\S+)\s+=\s+'(?P<value>.*)'(?: @ \S+)?(?: \[[^]]*\])?$"),
+    )
+
     def __init__(self):
         self._vbox_path = None
+        self._guest_properties = {}
         super(InventoryModule, self).__init__()
 
+    def _enumerate_vbox_data(self, host):
+        properties = None
+        try:
+            cmd = [self._vbox_path, b'guestproperty', b'enumerate',
+                   to_bytes(host, errors='surrogate_or_strict')]
+            x = Popen(cmd, stdout=PIPE)
+            output = to_text(x.stdout.read(), errors='surrogate_or_strict')
+            if x.wait() == 0:
+                properties = {}
+                for line in output.splitlines():
+                    for pattern in self.GUEST_PROPERTY_PATTERNS:
+                        match = pattern.match(line)
+                        if match:
+                            properties[match.group('name')] = match.group('value').strip()
+                            break
+        except Exception:
+            pass
+        return properties
+
+    def _prefetch_vbox_data(self, hosts):
+        ''' read the guest properties of all hosts, with one process per host '''
+        hosts = list(hosts)
+        with ThreadPoolExecutor(max_workers=max(self.get_option('enumerate_workers'), 1)) as executor:
+            for host, properties in zip(hosts, executor.map(self._enumerate_vbox_data, hosts)):
+                # hosts whose properties could not be enumerated fall back to querying single properties
+                if properties is not None:
+                    self._guest_properties[host] = properties
+
     def _query_vbox_data(self, host, property_path):
+        if host in self._guest_properties:
+            return self._guest_properties[host].get(property_path)
+
         ret = None
         try:
             cmd = [self._vbox_path, b'guestproperty', b'get',
@@ -188,11 +244,6 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
                     hostvars[current_host] = {}
                     self.inventory.add_host(current_host)
 
-                # try to get network info
-                netdata = self._query_vbox_data(current_host, netinfo)
-                if netdata:
-                    self.inventory.set_variable(current_host, 'ansible_host', make_unsafe(netdata))
-
             # found groups
             elif k == 'Groups':
                 if self.get_option('enable_advanced_group_parsing'):
@@ -221,6 +272,15 @@ class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
 
                 prevkey = pref_k
 
+        if self.get_option('enumerate_properties'):
+            self._prefetch_vbox_data(hostvars)
+
+        # try to get network info
+        for host in hostvars:
+            netdata = self._query_vbox_data(host, netinfo)
+            if netdata:
+                self.inventory.set_variable(host, 'ansible_host', make_unsafe(netdata))
+
         self._set_variables(hostvars)
         for host in hostvars:
             h = self.inventory.get_host(host)
@@ -62,6 +62,23 @@ DOCUMENTATION = """
             is set but does not match the number of query results. Leave empty to skip this check.
         type: int
         version_added: 10.4.0
+      cache:
+        description:
+          - Run C(bw list items) only once per collection and organization, and answer the lookups from the listed items
+            instead of running C(bw) for every term.
+          - The decrypted items are only kept in memory, for O(cache_ttl) seconds. They are shared by the lookups evaluated
+            in the same Ansible process, for example by all terms and loop items of a task.
+          - Terms are compared with the O(search) field of all items. Without cache, C(bw list items --search) first selects
+            the items where the term appears in one of the fields searched by C(bw).
+        type: bool
+        default: false
+        version_added: 10.5.0
+      cache_ttl:
+        description:
+          - Number of seconds during which the items listed with O(cache=true) are reused.
+        type: int
+        default: 300
+        version_added: 10.5.0
 """
 
 EXAMPLES = """
@@ -105,6 +122,11 @@ EXAMPLES = """
     msg: >-
       {{ lookup('community.general.bitwarden', None, collection_name='my_collections/test_collection') }}
 
+- name: "Get several passwords with a single call of 'bw list items'"
+  ansible.builtin.debug:
+    msg: >-
+      {{ lookup('community.general.bitwarden', 'a_test', 'b_test', field='password', cache=true) }}
+
 - name: "Get Bitwarden record named 'a_test', ensure there is exactly one match"
   ansible.builtin.debug:
     msg: >-
@@ -121,6 +143,8 @@ RETURN = """
     elements: list
 """
 
+import copy
+import time
 from subprocess import Popen, PIPE
 
 from ansible.errors import AnsibleError, AnsibleOptionsError
@@ -133,11 +157,39 @@ class BitwardenException(AnsibleError):
     pass
 
 
+class BitwardenItemIndex(object):
+    """Items listed by C(bw list items), indexed by the values of their fields.
+
+    The index of a field is built the first time items are searched by this field.
+    """
+
+    def __init__(self, items):
+        self._items = items
+        self._by_field = {}
+
+    def search(self, search_value, search_field):
+        if not search_value or not search_field:
+            matches = self._items
+        else:
+            if search_field not in self._by_field:
+                by_value = {}
+                for item in self._items:
+                    value = item.get(search_field)
+                    if isinstance(value, (str, int, float, bool)):
+                        by_value.setdefault(value, []).append(item)
+                self._by_field[search_field] = by_value
+            matches = self._by_field[search_field].get(search_value, [])
+        # The items are shared by all searches
+        return copy.deepcopy(matches)
+
+
 class Bitwarden(object):
 
     def __init__(self, path='bw'):
         self._cli_path = path
         self._session = None
+        self._cache_ttl = None
+        self._cache = {}
 
     @property
     def cli_path(self):
@@ -151,12 +203,35 @@ class Bitwarden(object):
     def session(self, value):
         self._session = value
 
+    @property
+    def cache_ttl(self):
+        """Number of seconds during which results of bw are reused, or None to disable caching."""
+        return self._cache_ttl
+
+    @cache_ttl.setter
+    def cache_ttl(self, value):
+        self._cache_ttl = value
+
     @property
     def unlocked(self):
+        return self._cached(('status',), self._get_unlocked)
+
+    def _get_unlocked(self):
         out, err = self._run(['status'], stdin="")
         decoded = AnsibleJSONDecoder().raw_decode(out)[0]
         return decoded['status'] == 'unlocked'
 
+    def _cached(self, key, func):
+        """Return the result of func(), reused for cache_ttl seconds for the same key and session if caching is enabled."""
+        if self.cache_ttl is None:
+            return func()
+
+        key = (self.session,) + key
+        now = time.time()
+        if key not in self._cache or self._cache[key][0] <= now:
+            self._cache[key] = (now + self.cache_ttl, func())
+        return self._cache[key][1]
+
     def _run(self, args, stdin=None, expected_rc=0):
         if self.session:
             args += ['--session', self.session]
@@ -174,6 +249,11 @@ class Bitwarden(object):
         """Return matching records whose search_field is equal to key.
         """
 
+        if self.cache_ttl is not None:
+            index = self._cached(('items', collection_id, organization_id),
+                                 lambda: self._get_item_index(collection_id, organization_id))
+            return index.search(search_value, search_field)
+
         # Prepare set of params for Bitwarden CLI
         if search_field == 'id':
             params = ['get', 'item', search_value]
@@ -202,6 +282,16 @@ class Bitwarden(object):
         return [item for item in initial_matches
                 if not search_value or not search_field or item.get(search_field) == search_value]
 
+    def _get_item_index(self, collection_id=None, organization_id=None):
+        params = ['list', 'items']
+        if collection_id:
+            params.extend(['--collectionid', collection_id])
+        if organization_id:
+            params.extend(['--organizationid', organization_id])
+
+        out, err = self._run(params)
+        return BitwardenItemIndex(AnsibleJSONDecoder().raw_decode(out)[0])
+
     def get_field(self, field, search_value, search_field="name", collection_id=None, organization_id=None):
         """Return a list of the specified field for records whose search_field match search_value
         and filtered by collection if collection has been provided.
@@ -238,6 +328,10 @@ class Bitwarden(object):
     def get_collection_ids(self, collection_name: str, organization_id=None) -> list[str]:
         """Return matching IDs of collections whose name is equal to collection_name."""
 
+        return self._cached(('collections', collection_name, organization_id),
+                            lambda: self._get_collection_ids(collection_name, organization_id))
+
+    def _get_collection_ids(self, collection_name, organization_id=None):
         # Prepare set of params for Bitwarden CLI
         params = ['list', 'collections', '--search', collection_name]
 
@@ -265,6 +359,7 @@ class LookupModule(LookupBase):
         organization_id = self.get_option('organization_id')
         result_count = self.get_option('result_count')
         _bitwarden.session = self.get_option('bw_session')
+        _bitwarden.cache_ttl = self.get_option('cache_ttl') if self.get_option('cache') else None
 
         if not _bitwarden.unlocked:
             raise AnsibleError("Bitwarden Vault locked. Run 'bw unlock'.")
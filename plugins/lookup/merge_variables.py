@@ -69,6 +69,15 @@ DOCUMENTATION = """
         type: list
         elements: str
         version_added: 8.5.0
+      memoize_values:
+        description:
+          - Template every matching variable of a host only once per lookup call, and reuse the templated value when
+            several terms match the same variable.
+          - Variables whose templates do not give the same result every time they are evaluated, for example because
+            they use the P(ansible.builtin.password#lookup) lookup or the current time, should not be merged with this option.
+        type: bool
+        default: false
+        version_added: 10.5.0
 """
 
 EXAMPLES = """
@@ -120,6 +129,7 @@ RETURN = """
     elements: raw
 """
 
+import copy
 import re
 
 from ansible.errors import AnsibleError
@@ -145,22 +155,34 @@ class LookupModule(LookupBase):
         self._override = self.get_option('override', 'error')
         self._pattern_type = self.get_option('pattern_type', 'regex')
         self._groups = self.get_option('groups', None)
+        self._memoize_values = self.get_option('memoize_values', False)
+        self._templated_values = {}
 
-        ret = []
+        # Compile the patterns once per term
+        matchers = []
         for term in terms:
             if not isinstance(term, str):
                 raise AnsibleError(f"Non-string type '{type(term)}' passed, only 'str' types are allowed!")
+            matchers.append((term, self._get_var_matcher(term)))
+
+        # Collect the variables and the sorted variable names of the hosts once, for all terms
+        if not self._groups:  # consider only own variables
+            hosts = [(variables.get('inventory_hostname'), variables, sorted(variables.keys()))]
+        else:  # consider variables of hosts in given groups
+            hosts = []
+            for host in variables["hostvars"]:
+                if self._is_host_in_allowed_groups(variables["hostvars"][host]["group_names"]):
+                    host_variables = dict(variables["hostvars"].raw_get(host))
+                    host_variables["hostvars"] = variables["hostvars"]  # re-add hostvars
+                    hosts.append((host, host_variables, sorted(host_variables.keys())))
 
-            if not self._groups:  # consider only own variables
-                ret.append(self._merge_vars(term, initial_value, variables))
-            else:  # consider variables of hosts in given groups
-                cross_host_merge_result = initial_value
-                for host in variables["hostvars"]:
-                    if self._is_host_in_allowed_groups(variables["hostvars"][host]["group_names"]):
-                        host_variables = dict(variables["hostvars"].raw_get(host))
-                        host_variables["hostvars"] = variables["hostvars"]  # re-add hostvars
-                        cross_host_merge_result = self._merge_vars(term, cross_host_merge_result, host_variables)
-                ret.append(cross_host_merge_result)
+        ret = []
+        for term, matcher in matchers:
+            result = initial_value
+            for host, host_variables, var_names in hosts:
+                var_merge_names = [var_name for var_name in var_names if matcher(var_name)]
+                result = self._merge_vars(term, result, host, host_variables, var_merge_names)
+            ret.append(result)
 
         return ret
 
@@ -174,20 +196,30 @@ class LookupModule(LookupBase):
 
         return False
 
-    def _var_matches(self, key, search_pattern):
+    def _get_var_matcher(self, search_pattern):
         if self._pattern_type == "prefix":
-            return key.startswith(search_pattern)
+            return lambda key: key.startswith(search_pattern)
         elif self._pattern_type == "suffix":
-            return key.endswith(search_pattern)
+            return lambda key: key.endswith(search_pattern)
         elif self._pattern_type == "regex":
-            matcher = re.compile(search_pattern)
-            return matcher.search(key)
+            return re.compile(search_pattern).search
 
-        return False
+        return lambda key: False
+
+    def _template_var(self, host, variables, var_name):
+        if self._memoize_values and (host, var_name) in self._templated_values:
+            # The merge modifies the values, so hand out copies of the memoized value
+            return copy.deepcopy(self._templated_values[(host, var_name)])
+
+        with self._templar.set_temporary_context(available_variables=variables):  # tmp. switch renderer to context of current variables
+            var_value = self._templar.template(variables[var_name])  # Render jinja2 templates
+
+        if self._memoize_values:
+            self._templated_values[(host, var_name)] = copy.deepcopy(var_value)
+        return var_value
 
-    def _merge_vars(self, search_pattern, initial_value, variables):
+    def _merge_vars(self, search_pattern, initial_value, host, variables, var_merge_names):
         display.vvv(f"Merge variables with {self._pattern_type}: {search_pattern}")
-        var_merge_names = sorted([key for key in variables.keys() if self._var_matches(key, search_pattern)])
         display.vvv(f"The following variables will be merged: {var_merge_names}")
         prev_var_type = None
         result = None
@@ -197,8 +229,7 @@ class LookupModule(LookupBase):
             result = initial_value
 
         for var_name in var_merge_names:
-            with self._templar.set_temporary_context(available_variables=variables):  # tmp. switch renderer to context of current variables
-                var_value = self._templar.template(variables[var_name])  # Render jinja2 templates
+            var_value = self._template_var(host, variables, var_name)
             var_type = _verify_and_get_type(var_value)
 
             if prev_var_type is None:
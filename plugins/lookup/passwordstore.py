@@ -157,6 +157,29 @@ DOCUMENTATION = '''
         ini:
           - section: passwordstore_lookup
             key: missing_subkey
+      cache:
+        description:
+          - Keep the content of the password files that were read in memory, and reuse it when the same password file
+            of the same store is looked up again, instead of decrypting it again.
+          - The content is kept for the lifetime of the Ansible process evaluating the lookup. Ansible evaluates lookups in
+            the worker process of a task, so the cache is shared by the terms and loop items of a task.
+          - The cached content of a password file is dropped when the lookup creates or overwrites it.
+        type: bool
+        default: false
+        ini:
+          - section: passwordstore_lookup
+            key: cache
+        version_added: 10.5.0
+      workers:
+        description:
+          - Number of password files read in parallel when several terms are looked up at once.
+          - Ignored when O(lock=readwrite), as gpg-agent must then not be called in parallel.
+        type: int
+        default: 1
+        ini:
+          - section: passwordstore_lookup
+            key: workers
+        version_added: 10.5.0
     notes:
       - The lookup supports passing all options as lookup parameters since community.general 6.0.0.
 '''
@@ -228,6 +251,10 @@ tasks.yml: |
     ansible.builtin.debug:
       msg: "{{ lookup('community.general.passwordstore', 'example/test', subkey='user')}}"
 
+  - name: Read several passwords at once, decrypting up to 4 password files in parallel
+    ansible.builtin.debug:
+      msg: "{{ lookup('community.general.passwordstore', 'example/test', 'example/other', 'example/third', workers=4, cache=true) }}"
+
   - name: Return the entire password file content
     ansible.builtin.set_fact:
       passfilecontent: "{{ lookup('community.general.passwordstore', 'example/test', returnall=true)}}"
@@ -241,6 +268,7 @@ _raw:
   elements: str
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 import os
 import re
@@ -260,6 +288,9 @@ from ansible_collections.community.general.plugins.module_utils._filelock import
 
 display = Display()
 
+# Content of the password files read with cache=true, keyed by backend, store directory and pass name
+_pass_cache = {}
+
 
 # backhacked check_output with input for python 2.7
 # http://stackoverflow.com/questions/10103551/passing-data-to-subprocess-check-output
@@ -375,13 +406,59 @@ class LookupModule(LookupBase):
                 else:
                     self.env['PASSWORD_STORE_UMASK'] = self.paramvals['umask']
 
+    def get_cache_key(self):
+        return (self.backend, self.paramvals['directory'], self.passname)
+
+    def run_show(self, passname, env):
+        return to_text(
+            check_output2([self.pass_cmd, 'show'] +
+                          [passname], env=env),
+            errors='surrogate_or_strict'
+        )
+
+    def show_pass(self):
+        # Use the content read in advance by prefetch() or kept in the cache if possible
+        key = self.get_cache_key()
+        if key in self.prefetched:
+            output = self.prefetched[key]
+            if isinstance(output, Exception):
+                raise output
+        elif self.cache and key in _pass_cache:
+            output = _pass_cache[key]
+        else:
+            output = self.run_show(self.passname, self.env)
+        if self.cache:
+            _pass_cache[key] = output
+        return output
+
+    def forget_pass(self):
+        # The password file was written, or must be read again
+        key = self.get_cache_key()
+        self.prefetched.pop(key, None)
+        _pass_cache.pop(key, None)
+
+    def prefetch(self, terms):
+        # Read the password files of all terms in parallel, before the terms are processed one by one
+        paramvals = dict(self.paramvals)
+        jobs = {}
+        for term in terms:
+            self.parse_params(term)
+            key = self.get_cache_key()
+            if key not in jobs and not (self.cache and key in _pass_cache):
+                jobs[key] = (self.passname, self.env)
+        self.paramvals = paramvals
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = dict((key, executor.submit(self.run_show, passname, env)) for key, (passname, env) in jobs.items())
+        for key, future in futures.items():
+            try:
+                self.prefetched[key] = future.result()
+            except subprocess.CalledProcessError as e:
+                self.prefetched[key] = e
+
     def check_pass(self):
         try:
-            self.passoutput = to_text(
-                check_output2([self.pass_cmd, 'show'] +
-                              [self.passname], env=self.env),
-                errors='surrogate_or_strict'
-            ).splitlines()
+            self.passoutput = self.show_pass().splitlines()
             self.password = self.passoutput[0]
             self.passdict = {}
             try:
@@ -464,6 +541,7 @@ class LookupModule(LookupBase):
                 if self.paramvals['timestamp'] and self.paramvals['backup']:
                     msg += f"lookup_pass: old password was {self.password} (Updated on {datetime})\n"
 
+        self.forget_pass()
         try:
             check_output2([self.pass_cmd, 'insert', '-f', '-m', self.passname], input=msg, env=self.env)
         except (subprocess.CalledProcessError) as e:
@@ -485,6 +563,7 @@ class LookupModule(LookupBase):
         if self.paramvals['timestamp']:
             msg += f"\nlookup_pass: First generated by ansible on {datetime}\n"
 
+        self.forget_pass()
         try:
             check_output2([self.pass_cmd, 'insert', '-f', '-m', self.passname], input=msg, env=self.env)
         except (subprocess.CalledProcessError) as e:
@@ -563,12 +642,18 @@ class LookupModule(LookupBase):
             'preserve': self.get_option('preserve'),
             "missing_subkey": self.get_option("missing_subkey"),
         }
+        self.cache = self.get_option('cache')
+        self.workers = self.get_option('workers')
+        self.prefetched = {}
 
     def run(self, terms, variables, **kwargs):
         self.set_options(var_options=variables, direct=kwargs)
         self.setup(variables)
         result = []
 
+        if self.workers > 1 and len(terms) > 1 and self.get_option('lock') != 'readwrite':
+            self.prefetch(terms)
+
         for term in terms:
             self.parse_params(term)   # parse the input into paramvals
             with self.opt_lock('readwrite'):
@@ -588,6 +673,8 @@ class LookupModule(LookupBase):
                 else:  # password does not exist
                     if self.paramvals['missing'] == 'create':
                         with self.opt_lock('write'):
+                            if self.locked == 'write':
+                                self.forget_pass()
                             if self.locked == 'write' and self.check_pass():  # lookup password again if under write lock
                                 result.append(self.get_passresult())
                             else:
@@ -8,9 +8,19 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 import json
+import hashlib
+import os
+import tempfile
+import time
 import traceback
 import copy
 
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
 from ansible.module_utils.urls import open_url
 from ansible.module_utils.six.moves.urllib.parse import urlencode, quote
 from ansible.module_utils.six.moves.urllib.error import HTTPError
@@ -125,6 +135,9 @@ URL_AUTHZ_RESOURCES = "{url}/admin/realms/{realm}/clients/{client_id}/authz/reso
 URL_AUTHZ_CUSTOM_POLICY = "{url}/admin/realms/{realm}/clients/{client_id}/authz/resource-server/policy/{policy_type}"
 URL_AUTHZ_CUSTOM_POLICIES = "{url}/admin/realms/{realm}/clients/{client_id}/authz/resource-server/policy"
 
+# Number of items requested at once from list resources supporting the first/max query parameters
+LOOKUP_PAGE_SIZE = 100
+
 
 def keycloak_argument_spec():
     """
@@ -144,6 +157,8 @@ def keycloak_argument_spec():
         token=dict(type='str', no_log=True),
         refresh_token=dict(type='str', no_log=True),
         http_agent=dict(type='str', default='Ansible'),
+        token_cache=dict(type='bool', default=False),
+        token_cache_dir=dict(type='path'),
     )
 
 
@@ -175,6 +190,15 @@ def _token_request(module_params, payload):
            'refresh_token' for type 'refresh_token'.
     :return: access token
     """
+    return _token_response(module_params, payload)['access_token']
+
+
+def _token_response(module_params, payload):
+    """ Requests a token from the token endpoint of the authentication realm
+    :param module_params: parameters of the module
+    :param payload: authentication request payload, see _token_request()
+    :return: token response, containing at least 'access_token'
+    """
     base_url = module_params.get('auth_keycloak_url')
     if not base_url.lower().startswith(('http', 'https')):
         raise KeycloakError("auth_url '%s' should either start with 'http' or 'https'." % base_url)
@@ -189,7 +213,9 @@ def _token_request(module_params, payload):
                                           validate_certs=validate_certs, http_agent=http_agent, timeout=connection_timeout,
                                           data=urlencode(payload)).read()))
 
-        return r['access_token']
+        if 'access_token' not in r:
+            raise KeyError('access_token')
+        return r
     except ValueError as e:
         raise KeycloakError(
             'API returned invalid JSON when trying to obtain access token from %s: %s'
@@ -208,6 +234,10 @@ def _request_token_using_credentials(module_params):
     :param module_params: parameters of the module. Must include 'auth_username' and 'auth_password'.
     :return: connection header
     """
+    return _token_request(module_params, _credentials_payload(module_params))
+
+
+def _credentials_payload(module_params):
     client_id = module_params.get('auth_client_id')
     auth_username = module_params.get('auth_username')
     auth_password = module_params.get('auth_password')
@@ -221,9 +251,7 @@ def _request_token_using_credentials(module_params):
         'password': auth_password,
     }
     # Remove empty items, for instance missing client_secret
-    payload = {k: v for k, v in temp_payload.items() if v is not None}
-
-    return _token_request(module_params, payload)
+    return {k: v for k, v in temp_payload.items() if v is not None}
 
 
 def _request_token_using_refresh_token(module_params):
@@ -248,6 +276,115 @@ def _request_token_using_refresh_token(module_params):
     return _token_request(module_params, payload)
 
 
+# Cached tokens are renewed when they expire within this number of seconds
+TOKEN_CACHE_EXPIRY_MARGIN = 30
+
+
+def _token_cache_path(module_params):
+    """ Returns the path of the token cache file for the Keycloak instance, realm,
+    client and credentials of the module.
+    :param module_params: parameters of the module
+    :return: path of the cache file
+    """
+    cache_dir = module_params.get('token_cache_dir')
+    if not cache_dir:
+        cache_dir = os.path.join(tempfile.gettempdir(), 'ansible-keycloak-tokens-%s' % os.getuid())
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir, 0o700)
+    if os.stat(cache_dir).st_uid != os.getuid():
+        raise KeycloakError("The token cache directory '%s' is not owned by the current user" % cache_dir)
+
+    # The credentials are part of the key, so that tokens are never shared between users,
+    # and are only stored as a hash
+    key = json.dumps([module_params.get(option) for option in (
+        'auth_keycloak_url', 'auth_realm', 'auth_client_id', 'auth_client_secret', 'auth_username', 'auth_password')])
+    return os.path.join(cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+
+def _read_token_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def _write_token_cache(path, response):
+    now = time.time()
+    entry = {'access_token': response['access_token'], 'expires_at': None,
+             'refresh_token': response.get('refresh_token'), 'refresh_expires_at': None}
+    if response.get('expires_in'):
+        entry['expires_at'] = now + response['expires_in']
+    # A refresh_expires_in of 0 marks an offline token, which does not expire
+    if response.get('refresh_expires_in'):
+        entry['refresh_expires_at'] = now + response['refresh_expires_in']
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entry, f)
+        os.rename(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def _is_valid(expires_at):
+    return expires_at is None or expires_at - TOKEN_CACHE_EXPIRY_MARGIN > time.time()
+
+
+def _request_token_using_cache(module_params, invalidate=False):
+    """ Obtains a token from the on-disk token cache. Tokens that expired are renewed with
+    their refresh token if possible, and with the credentials otherwise. The cache file is
+    locked while it is used, so that concurrent modules do not request tokens at the same time.
+    :param module_params: parameters of the module. Must include 'auth_username' and 'auth_password'.
+    :param invalidate: whether to ignore the cached access token, for instance because it was revoked
+    :return: access token
+    """
+    try:
+        path = _token_cache_path(module_params)
+        lock = open(path + '.lock', 'a')
+    except (IOError, OSError) as e:
+        raise KeycloakError('Could not open the token cache: %s' % e)
+    try:
+        if HAS_FCNTL:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+        entry = _read_token_cache(path)
+        if entry and not invalidate and _is_valid(entry.get('expires_at')):
+            return entry['access_token']
+
+        response = None
+        if entry and entry.get('refresh_token') and _is_valid(entry.get('refresh_expires_at')):
+            payload = {
+                'grant_type': 'refresh_token',
+                'client_id': module_params.get('auth_client_id'),
+                'client_secret': module_params.get('auth_client_secret'),
+                'refresh_token': entry['refresh_token'],
+            }
+            try:
+                response = _token_response(module_params, {k: v for k, v in payload.items() if v is not None})
+            except KeycloakError:
+                # The refresh token was revoked or the session ended; log in again
+                response = None
+        if response is None:
+            response = _token_response(module_params, _credentials_payload(module_params))
+
+        try:
+            _write_token_cache(path, response)
+        except (IOError, OSError) as e:
+            raise KeycloakError('Could not write the token cache: %s' % e)
+        return response['access_token']
+    finally:
+        lock.close()
+
+
+def _request_token(module_params, invalidate=False):
+    if module_params.get('token_cache'):
+        return _request_token_using_cache(module_params, invalidate=invalidate)
+    return _request_token_using_credentials(module_params)
+
+
 def get_token(module_params):
     """ Obtains connection header with token for the authentication,
     token already given or obtained from credentials
@@ -257,7 +394,7 @@ def get_token(module_params):
     token = module_params.get('token')
 
     if token is None:
-        token = _request_token_using_credentials(module_params)
+        token = _request_token(module_params)
 
     return {
         'Authorization': 'Bearer ' + token,
@@ -336,6 +473,8 @@ class KeycloakAPI(object):
         self.connection_timeout = self.module.params.get('connection_timeout')
         self.restheaders = connection_header
         self.http_agent = self.module.params.get('http_agent')
+        # Name to id maps of the objects looked up during this run, see _get_lookup_index()
+        self._lookup_index = {}
 
     def _request(self, url, method, data=None):
         """ Makes a request to Keycloak and returns the raw response.
@@ -382,7 +521,7 @@ class KeycloakAPI(object):
             auth_username = self.module.params.get('auth_username')
             auth_password = self.module.params.get('auth_password')
             if auth_username is not None and auth_password is not None:
-                token = _request_token_using_credentials(self.module.params)
+                token = _request_token(self.module.params, invalidate=True)
                 self.restheaders['Authorization'] = 'Bearer ' + token
 
                 r = make_request_catching_401()
@@ -403,6 +542,45 @@ class KeycloakAPI(object):
         """
         return json.loads(to_native(self._request(url, method, data).read()))
 
+    def _request_paged(self, url, params=None, total=None):
+        """ Fetches all items of a list resource supporting the first/max query parameters,
+        requesting LOOKUP_PAGE_SIZE items at once.
+
+        :param url: request path, without query
+        :param params: (optional) dict of additional query parameters
+        :param total: (optional) number of items of the resource, if known
+        :return: list of items
+        """
+        items = []
+        while total is None or len(items) < total:
+            query = dict(params or {}, first=len(items), max=LOOKUP_PAGE_SIZE)
+            page = self._request_and_deserialize('%s?%s' % (url, urlencode(sorted(query.items()))), method='GET')
+            if items and page[:1] == items[:1]:
+                # The server ignores the first parameter and already returned everything
+                break
+            items.extend(page)
+            if len(page) != LOOKUP_PAGE_SIZE:
+                break
+        return items
+
+    def _get_lookup_index(self, kind, realm, scope=None):
+        """ Returns the name to id map of a kind of objects memoized for this run.
+
+        :param kind: kind of objects, for instance 'groups' or 'clients'
+        :param realm: realm of the objects
+        :param scope: (optional) id of the object the objects belong to, for instance a client for client roles
+        :return: dict mapping names to ids
+        """
+        return self._lookup_index.setdefault((kind, realm, scope), {})
+
+    def _clear_lookup_index(self, kind):
+        """ Forgets the names and ids memoized for a kind of objects, after objects of that kind were changed.
+
+        :param kind: kind of objects, see _get_lookup_index()
+        """
+        for key in [key for key in self._lookup_index if key[0] == kind]:
+            del self._lookup_index[key]
+
     def get_realm_info_by_id(self, realm='master'):
         """ Obtain realm public info by id
 
@@ -532,7 +710,7 @@ class KeycloakAPI(object):
         """
         clientlist_url = URL_CLIENTS.format(url=self.baseurl, realm=realm)
         if filter is not None:
-            clientlist_url += '?clientId=%s' % filter
+            clientlist_url += '?' + urlencode({'clientId': filter})
 
         try:
             return self._request_and_deserialize(clientlist_url, method='GET')
@@ -587,11 +765,13 @@ class KeycloakAPI(object):
         :param realm: client template from this realm
         :return: id of client (usually a UUID)
         """
-        result = self.get_client_by_clientid(client_id, realm)
-        if isinstance(result, dict) and 'id' in result:
-            return result['id']
-        else:
-            return None
+        index = self._get_lookup_index('clients', realm)
+        if client_id not in index:
+            result = self.get_client_by_clientid(client_id, realm)
+            if not isinstance(result, dict) or 'id' not in result:
+                return None
+            index[client_id] = result['id']
+        return index[client_id]
 
     def update_client(self, id, clientrep, realm="master"):
         """ Update an existing client
@@ -601,6 +781,7 @@ class KeycloakAPI(object):
         :return: HTTPResponse object on success
         """
         client_url = URL_CLIENT.format(url=self.baseurl, realm=realm, id=id)
+        self._clear_lookup_index('clients')
 
         try:
             return self._request(client_url, method='PUT', data=json.dumps(clientrep))
@@ -615,6 +796,7 @@ class KeycloakAPI(object):
         :return: HTTPResponse object on success
         """
         client_url = URL_CLIENTS.format(url=self.baseurl, realm=realm)
+        self._clear_lookup_index('clients')
 
         try:
             return self._request(client_url, method='POST', data=json.dumps(clientrep))
@@ -630,6 +812,8 @@ class KeycloakAPI(object):
         :return: HTTPResponse object on success
         """
         client_url = URL_CLIENT.format(url=self.baseurl, realm=realm, id=id)
+        self._clear_lookup_index('clients')
+        self._clear_lookup_index('client_roles')
 
         try:
             return self._request(client_url, method='DELETE')
@@ -659,11 +843,20 @@ class KeycloakAPI(object):
         :param realm: Realm from which to obtain the rolemappings.
         :return: The ID of the role, None if not found.
         """
-        rolemappings = self.get_client_roles_by_id(cid, realm=realm)
-        for role in rolemappings:
-            if name == role['name']:
-                return role['id']
-        return None
+        index = self._get_lookup_index('client_roles', realm, cid)
+        if name not in index:
+            role_url = URL_CLIENT_ROLE.format(url=self.baseurl, realm=realm, id=cid, name=quote(name, safe=''))
+            try:
+                index[name] = self._request_and_deserialize(role_url, method="GET")['id']
+            except HTTPError as e:
+                if e.code == 404:
+                    return None
+                self.fail_request(e, msg="Could not fetch role %s for client %s in realm %s: %s"
+                                         % (name, cid, realm, str(e)))
+            except Exception as e:
+                self.fail_request(e, msg="Could not fetch role %s for client %s in realm %s: %s"
+                                         % (name, cid, realm, str(e)))
+        return index[name]
 
     def get_client_group_rolemapping_by_id(self, gid, cid, rid, realm='master'):
         """ Obtain client representation by id
@@ -926,7 +1119,7 @@ class KeycloakAPI(object):
         :param realm: Realm in which the user resides; default 'master'
         """
         users_url = URL_USERS.format(url=self.baseurl, realm=realm)
-        users_url += '?username=%s&exact=true' % username
+        users_url += '?' + urlencode([('username', username), ('exact', 'true')])
         try:
             userrep = None
             users = self._request_and_deserialize(users_url, method='GET')
@@ -1543,16 +1736,26 @@ class KeycloakAPI(object):
             self.module.fail_json(msg="Could not fetch group %s in realm %s: %s"
                                       % (gid, realm, str(e)))
 
-    def get_subgroups(self, parent, realm="master"):
+    def get_subgroups(self, parent, realm="master", search=None):
+        """ Fetch the direct subgroups of a group.
+
+        :param parent: GroupRepresentation of the parent group
+        :param realm: Realm in which the group resides; default 'master'
+        :param search: Optional name of the subgroup to look for. Keycloak versions supporting
+                       it then only return this subgroup, others return all subgroups.
+        """
         if 'subGroupCount' in parent:
             # Since version 23, when GETting a group Keycloak does not
             # return subGroups but only a subGroupCount.
-            # Children must be fetched in a second request.
+            # Children must be fetched in a second request, page by page.
             if parent['subGroupCount'] == 0:
                 group_children = []
             else:
                 group_children_url = URL_GROUP_CHILDREN.format(url=self.baseurl, realm=realm, groupid=parent['id'])
-                group_children = self._request_and_deserialize(group_children_url, method="GET")
+                params = {}
+                if search is not None:
+                    params = {'search': search, 'exact': 'true'}
+                group_children = self._request_paged(group_children_url, params, total=parent['subGroupCount'])
             subgroups = group_children
         else:
             subgroups = parent['subGroups']
@@ -1561,8 +1764,7 @@ class KeycloakAPI(object):
     def get_group_by_name(self, name, realm="master", parents=None):
         """ Fetch a keycloak group within a realm based on its name.
 
-        The Keycloak API does not allow filtering of the Groups resource by name.
-        As a result, this method first retrieves the entire list of groups - name and ID -
+        This method first looks up the ID of the group with a search by name,
         then performs a second query to fetch the group.
 
         If the group does not exist, None is returned.
@@ -1577,20 +1779,41 @@ class KeycloakAPI(object):
                 if not parent:
                     return None
 
-                all_groups = self.get_subgroups(parent, realm)
-            else:
-                all_groups = self.get_groups(realm=realm)
+                for group in self.get_subgroups(parent, realm, search=name):
+                    if group['name'] == name:
+                        return self.get_group_by_groupid(group['id'], realm=realm)
 
-            for group in all_groups:
-                if group['name'] == name:
-                    return self.get_group_by_groupid(group['id'], realm=realm)
+                return None
 
-            return None
+            gid = self.get_group_id_by_name(name, realm=realm)
+            if gid is None:
+                return None
+
+            return self.get_group_by_groupid(gid, realm=realm)
 
         except Exception as e:
             self.module.fail_json(msg="Could not fetch group %s in realm %s: %s"
                                       % (name, realm, str(e)))
 
+    def get_group_id_by_name(self, name, realm="master"):
+        """ Look up the ID of a toplevel group by its name.
+
+        Group IDs are searched with the search, exact and briefRepresentation
+        query parameters, and remembered for the rest of the run.
+
+        If the group does not exist, None is returned.
+        :param name: Name of the toplevel group.
+        :param realm: Realm in which the group resides; default 'master'
+        """
+        index = self._get_lookup_index('groups', realm)
+        if name not in index:
+            groups_url = URL_GROUPS.format(url=self.baseurl, realm=realm)
+            params = {'search': name, 'exact': 'true', 'briefRepresentation': 'true'}
+            # The search also returns the toplevel groups of matching subgroups, which are remembered as well
+            for group in self._request_paged(groups_url, params):
+                index[group['name']] = group['id']
+        return index.get(name)
+
     def _get_normed_group_parent(self, parent):
         """ Converts parent dict information into a more easy to use form.
 
@@ -1626,14 +1849,17 @@ class KeycloakAPI(object):
             return None
 
         for p in name_chain[1:]:
-            for sg in self.get_subgroups(tmp):
-                pv, is_id = self._get_normed_group_parent(p)
+            pv, is_id = self._get_normed_group_parent(p)
 
-                if is_id:
-                    cmpkey = "id"
-                else:
-                    cmpkey = "name"
+            if is_id:
+                cmpkey = "id"
+                search = None
+            else:
+                cmpkey = "name"
+                search = pv
 
+            parent, tmp = tmp, None
+            for sg in self.get_subgroups(parent, realm=realm, search=search):
                 if pv == sg[cmpkey]:
                     tmp = sg
                     break
@@ -1694,6 +1920,7 @@ class KeycloakAPI(object):
         :return: HTTPResponse object on success
         """
         groups_url = URL_GROUPS.format(url=self.baseurl, realm=realm)
+        self._clear_lookup_index('groups')
         try:
             return self._request(groups_url, method='POST', data=json.dumps(grouprep))
         except Exception as e:
@@ -1734,6 +1961,7 @@ class KeycloakAPI(object):
         :return HTTPResponse object on success
         """
         group_url = URL_GROUP.format(url=self.baseurl, realm=realm, groupid=grouprep['id'])
+        self._clear_lookup_index('groups')
 
         try:
             return self._request(group_url, method='PUT', data=json.dumps(grouprep))
@@ -1760,16 +1988,14 @@ class KeycloakAPI(object):
         # in the case that both are provided, prefer the ID, since it is one
         # less lookup.
         if groupid is None and name is not None:
-            for group in self.get_groups(realm=realm):
-                if group['name'] == name:
-                    groupid = group['id']
-                    break
+            groupid = self.get_group_id_by_name(name, realm=realm)
 
         # if the group doesn't exist - no problem, nothing to delete.
         if groupid is None:
             return None
 
         # should have a good groupid by here.
+        self._clear_lookup_index('groups')
         group_url = URL_GROUP.format(realm=realm, groupid=groupid, url=self.baseurl)
         try:
             return self._request(group_url, method='DELETE')
@@ -2018,6 +2244,7 @@ class KeycloakAPI(object):
             self.module.fail_json(msg='Could not find client %s in realm %s'
                                       % (clientid, realm))
         roles_url = URL_CLIENT_ROLES.format(url=self.baseurl, realm=realm, id=cid)
+        self._clear_lookup_index('client_roles')
         try:
             if "composites" in rolerep:
                 keycloak_compatible_composites = self.convert_role_composites(rolerep["composites"])
@@ -2055,6 +2282,7 @@ class KeycloakAPI(object):
             self.module.fail_json(msg='Could not find client %s in realm %s'
                                       % (clientid, realm))
         role_url = URL_CLIENT_ROLE.format(url=self.baseurl, realm=realm, id=cid, name=quote(rolerep['name'], safe=''))
+        self._clear_lookup_index('client_roles')
         try:
             composites = None
             if "composites" in rolerep:
@@ -2080,6 +2308,7 @@ class KeycloakAPI(object):
             self.module.fail_json(msg='Could not find client %s in realm %s'
                                       % (clientid, realm))
         role_url = URL_CLIENT_ROLE.format(url=self.baseurl, realm=realm, id=cid, name=quote(name, safe=''))
+        self._clear_lookup_index('client_roles')
         try:
             return self._request(role_url, method='DELETE')
         except Exception as e:
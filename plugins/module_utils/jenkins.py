@@ -9,9 +9,12 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 
+import json
 import os
 import time
 
+from email.utils import formatdate
+
 
 def download_updates_file(updates_expiration):
     updates_filename = 'jenkins-plugin-cache.json'
@@ -33,3 +36,45 @@ def download_updates_file(updates_expiration):
             download_updates = False
 
     return updates_file, download_updates
+
+
+def _updates_validators_file(updates_file):
+    return '%s.validators' % updates_file
+
+
+def read_updates_validators(updates_file):
+    """Return the HTTP headers revalidating the cached updates file with the server.
+
+    The ETag and Last-Modified headers of the response the file was downloaded
+    from are used if they were stored, otherwise the modification time of the file.
+    """
+    if not os.path.isfile(updates_file):
+        return {}
+
+    try:
+        with open(_updates_validators_file(updates_file)) as f:
+            validators = json.load(f)
+    except (IOError, OSError, ValueError):
+        validators = {}
+
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    elif not headers:
+        headers['If-Modified-Since'] = formatdate(os.stat(updates_file).st_mtime, usegmt=True)
+
+    return headers
+
+
+def write_updates_validators(updates_file, etag=None, last_modified=None):
+    """Store the ETag and Last-Modified headers of the response the updates file was downloaded from."""
+    validators_file = _updates_validators_file(updates_file)
+    if not etag and not last_modified:
+        if os.path.isfile(validators_file):
+            os.remove(validators_file)
+        return
+
+    with open(validators_file, 'w') as f:
+        json.dump({'etag': etag, 'last_modified': last_modified}, f)
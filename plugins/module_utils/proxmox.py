@@ -10,6 +10,12 @@ __metaclass__ = type
 import traceback
 from time import sleep
 
+try:
+    from time import monotonic
+except ImportError:
+    # Python 2
+    from time import time as monotonic
+
 PROXMOXER_IMP_ERR = None
 try:
     from proxmoxer import ProxmoxAPI
@@ -72,6 +78,12 @@ def ansible_to_proxmox_bool(value):
 class ProxmoxAnsible(object):
     """Base class for Proxmox modules"""
     TASK_TIMED_OUT = 'timeout expired'
+    # Running tasks are polled with intervals starting at TASK_POLL_INTERVAL
+    # seconds, doubling up to TASK_POLL_MAX_INTERVAL seconds
+    TASK_POLL_INTERVAL = 0.1
+    TASK_POLL_MAX_INTERVAL = 2.0
+    # Maximum number of task log lines read by a single request
+    TASK_LOG_LIMIT = 500
 
     def __init__(self, module):
         if not HAS_PROXMOXER:
@@ -187,23 +199,71 @@ class ProxmoxAnsible(object):
         :param timeout: Timeout in seconds to wait for the task to complete.
         :return: Task completion status (True/False) and ``exitstatus`` message when status=False.
         """
-        status = {}
-        while timeout:
-            try:
-                status = self.proxmox_api.nodes(node_name).tasks(task_id).status.get()
-            except Exception as e:
-                self.module.fail_json(msg='Unable to retrieve API task ID from node %s: %s' % (node_name, e))
+        return self.api_tasks_complete([(node_name, task_id)], timeout)[task_id]
+
+    def api_tasks_complete(self, tasks, timeout, task_logs=None):
+        """Wait until all tasks stop or time out.
+
+        The tasks are polled together, so operations can be started first and
+        awaited at once. Polling starts with short intervals, which grow while
+        tasks are still running.
 
-            if status['status'] == 'stopped':
-                if status['exitstatus'] == 'OK':
-                    return True, None
+        :param tasks: List of (node name, task ID) tuples.
+        :param timeout: Timeout in seconds to wait for all tasks to complete.
+        :param task_logs: Optional dict; the log lines of each task are read
+            incrementally while waiting and appended to a list stored under its task ID.
+        :return: Dict mapping each task ID to its completion status (True/False)
+            and ``exitstatus`` message when status=False.
+        """
+        deadline = monotonic() + timeout
+        interval = self.TASK_POLL_INTERVAL
+        results = {}
+        while True:
+            running = []
+            for node_name, task_id in tasks:
+                try:
+                    status = self.proxmox_api.nodes(node_name).tasks(task_id).status.get()
+                except Exception as e:
+                    self.module.fail_json(msg='Unable to retrieve API task ID from node %s: %s' % (node_name, e))
+
+                if task_logs is not None:
+                    self.api_task_read_log(node_name, task_id, task_logs.setdefault(task_id, []))
+
+                if status['status'] != 'stopped':
+                    running.append((node_name, task_id))
+                elif status['exitstatus'] == 'OK':
+                    results[task_id] = (True, None)
                 else:
-                    return False, status['exitstatus']
-            else:
-                timeout -= 1
-                if timeout <= 0:
-                    return False, ProxmoxAnsible.TASK_TIMED_OUT
-                sleep(1)
+                    results[task_id] = (False, status['exitstatus'])
+
+            tasks = running
+            if not tasks:
+                return results
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                for node_name, task_id in tasks:
+                    results[task_id] = (False, ProxmoxAnsible.TASK_TIMED_OUT)
+                return results
+            sleep(min(interval, remaining))
+            interval = min(interval * 2, self.TASK_POLL_MAX_INTERVAL)
+
+    def api_task_read_log(self, node_name, task_id, lines):
+        """Append the log lines of a task which are not yet in ``lines`` to it.
+
+        :param node_name: Proxmox node name where the task is running.
+        :param task_id: ID of the task.
+        :param lines: List of the log lines read so far.
+        :return: ``lines``.
+        """
+        while True:
+            try:
+                entries = self.proxmox_api.nodes(node_name).tasks(task_id).log.get(
+                    start=len(lines), limit=self.TASK_LOG_LIMIT)
+            except Exception as e:
+                self.module.fail_json(msg='Unable to retrieve log of API task ID from node %s: %s' % (node_name, e))
+            lines.extend(entry['t'] for entry in entries)
+            if len(entries) < self.TASK_LOG_LIMIT:
+                return lines
 
     def get_pool(self, poolid):
         """Retrieve pool information
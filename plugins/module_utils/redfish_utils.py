@@ -6,6 +6,7 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import copy
 import json
 import os
 import random
@@ -24,6 +25,13 @@ from ansible.module_utils.six.moves.urllib.parse import urlparse
 from ansible.module_utils.ansible_release import __version__ as ansible_version
 from ansible_collections.community.general.plugins.module_utils.version import LooseVersion
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+    HAS_THREAD_POOL = True
+except ImportError:
+    # Python 2 without the futures backport; fetch resources one at a time
+    HAS_THREAD_POOL = False
+
 GET_HEADERS = {'accept': 'application/json', 'OData-Version': '4.0'}
 POST_HEADERS = {'content-type': 'application/json', 'accept': 'application/json',
                 'OData-Version': '4.0'}
@@ -33,6 +41,13 @@ PUT_HEADERS = {'content-type': 'application/json', 'accept': 'application/json',
                'OData-Version': '4.0'}
 DELETE_HEADERS = {'accept': 'application/json', 'OData-Version': '4.0'}
 
+# Number of resources fetched concurrently when a service cannot expand
+# collections
+FETCH_WORKERS = 4
+
+# Expands the members of a collection, without following their links
+EXPAND_MEMBERS_QUERY = '$expand=.($levels=1)'
+
 FAIL_MSG = 'Issuing a data modification command without specifying the '\
            'ID of the target %(resource)s resource when there is more '\
            'than one %(resource)s is no longer allowed. Use the `resource_id` '\
@@ -55,6 +70,9 @@ class RedfishUtils(object):
         self.strip_etag_quotes = strip_etag_quotes
         self.ciphers = ciphers
         self._vendor = None
+        self._get_cache = None
+        self._get_cache_revalidate = False
+        self._expand_members = None
 
     def _auth_params(self, headers):
         """
@@ -132,11 +150,36 @@ class RedfishUtils(object):
             resp['msg'] = 'Properties in %s are already set' % uri
         return resp
 
+    def enable_get_cache(self, revalidate=False):
+        """
+        Cache the responses of GET requests for the lifetime of this object,
+        so that resources read by several commands are only fetched once.
+        The cache is cleared by every POST, PATCH, PUT and DELETE request.
+
+        :param revalidate: only cache responses carrying an ETag and check
+                           them with If-None-Match before reusing them
+        """
+        self._get_cache = {}
+        self._get_cache_revalidate = revalidate
+
+    def _clear_get_cache(self):
+        if self._get_cache:
+            self._get_cache.clear()
+
     # The following functions are to send GET/POST/PATCH/DELETE requests
     def get_request(self, uri, override_headers=None, allow_no_resp=False, timeout=None):
         req_headers = dict(GET_HEADERS)
         if override_headers:
             req_headers.update(override_headers)
+        # Requests with special headers or timeouts, and task monitors that
+        # may not return a body, always go to the service
+        use_cache = (self._get_cache is not None and not override_headers and
+                     not allow_no_resp and timeout is None)
+        cached = self._get_cache.get(uri) if use_cache else None
+        if cached is not None:
+            if not self._get_cache_revalidate:
+                return self._cached_response(cached)
+            req_headers['If-None-Match'] = cached['headers']['etag']
         username, password, basic_auth = self._auth_params(req_headers)
         if timeout is None:
             timeout = self.timeout
@@ -164,6 +207,9 @@ class RedfishUtils(object):
                 if not allow_no_resp:
                     raise
         except HTTPError as e:
+            if e.code == 304 and cached is not None:
+                # Not modified since it was cached
+                return self._cached_response(cached)
             msg, data = self._get_extended_message(e)
             return {'ret': False,
                     'msg': "HTTP Error %s on GET request to '%s', extended message: '%s'"
@@ -176,10 +222,19 @@ class RedfishUtils(object):
         except Exception as e:
             return {'ret': False,
                     'msg': "Failed GET request to '%s': '%s'" % (uri, to_text(e))}
+        if use_cache and (headers.get('etag') or not self._get_cache_revalidate):
+            self._get_cache[uri] = {'data': copy.deepcopy(data), 'headers': headers, 'resp': resp}
         return {'ret': True, 'data': data, 'headers': headers, 'resp': resp}
 
+    @staticmethod
+    def _cached_response(cached):
+        # Callers are free to modify the returned data
+        return {'ret': True, 'data': copy.deepcopy(cached['data']),
+                'headers': dict(cached['headers']), 'resp': cached['resp']}
+
     def post_request(self, uri, pyld, multipart=False):
         req_headers = dict(POST_HEADERS)
+        self._clear_get_cache()
         username, password, basic_auth = self._auth_params(req_headers)
         try:
             # When performing a POST to the session collection, credentials are
@@ -246,6 +301,7 @@ class RedfishUtils(object):
                 r['changed'] = False
                 return r
 
+        self._clear_get_cache()
         username, password, basic_auth = self._auth_params(req_headers)
         try:
             resp = open_url(uri, data=json.dumps(pyld),
@@ -281,6 +337,7 @@ class RedfishUtils(object):
                 if self.strip_etag_quotes:
                     etag = etag.strip('"')
                 req_headers['If-Match'] = etag
+        self._clear_get_cache()
         username, password, basic_auth = self._auth_params(req_headers)
         try:
             resp = open_url(uri, data=json.dumps(pyld),
@@ -306,6 +363,7 @@ class RedfishUtils(object):
 
     def delete_request(self, uri, pyld=None):
         req_headers = dict(DELETE_HEADERS)
+        self._clear_get_cache()
         username, password, basic_auth = self._auth_params(req_headers)
         try:
             data = json.dumps(pyld) if pyld else None
@@ -330,6 +388,73 @@ class RedfishUtils(object):
                     'msg': "Failed DELETE request to '%s': '%s'" % (uri, to_text(e))}
         return {'ret': True, 'resp': resp}
 
+    def _fetch_all(self, func, args_list):
+        """
+        Call func with each item of args_list, concurrently when possible.
+
+        :param func: function taking a single argument
+        :param args_list: list of arguments
+        :return: list of results in the order of args_list
+        """
+        if not HAS_THREAD_POOL or len(args_list) < 2:
+            return [func(args) for args in args_list]
+        executor = ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(args_list)))
+        try:
+            return list(executor.map(func, args_list))
+        finally:
+            executor.shutdown()
+
+    def _supports_expand_members(self):
+        # Expanding only the members of a collection requires both the levels
+        # and the "no links" ('.') options of $expand
+        if self._expand_members is None:
+            self._expand_members = False
+            response = self.get_request(self.root_uri + self.service_root)
+            if response['ret']:
+                expand = response['data'].get('ProtocolFeaturesSupported', {}).get('ExpandQuery', {})
+                self._expand_members = bool(expand.get('Levels') and expand.get('NoLinks'))
+        return self._expand_members
+
+    def get_resources(self, uris):
+        """
+        Get several resources, concurrently when possible.
+
+        :param uris: list of resource URIs, relative to root_uri
+        :return: dict containing the data of the resources in 'members'
+        """
+        responses = self._fetch_all(lambda uri: self.get_request(self.root_uri + uri), uris)
+        for response in responses:
+            if response['ret'] is False:
+                return response
+        return {'ret': True, 'members': [response['data'] for response in responses]}
+
+    def get_collection_members(self, collection_uri):
+        """
+        Get the members of a collection. The members are expanded by the
+        service with a single request when it supports $expand, and are
+        fetched concurrently otherwise.
+
+        :param collection_uri: URI of the collection, relative to root_uri
+        :return: dict containing the data of the members in 'members'
+        """
+        response = None
+        if self._supports_expand_members():
+            response = self.get_request(self.root_uri + collection_uri +
+                                        ('&' if '?' in collection_uri else '?') + EXPAND_MEMBERS_QUERY)
+            if response['ret']:
+                members = response['data'].get('Members', [])
+                if all(len(member) > 1 for member in members):
+                    return {'ret': True, 'members': members}
+            else:
+                # Some services advertise $expand but reject it on collections
+                response = None
+        if response is None:
+            response = self.get_request(self.root_uri + collection_uri)
+            if response['ret'] is False:
+                return response
+        members = response['data'].get('Members', [])
+        return self.get_resources([member['@odata.id'] for member in members])
+
     @staticmethod
     def _prepare_multipart(fields):
         """Prepares a multipart body based on a set of fields provided.
@@ -733,8 +858,8 @@ class RedfishUtils(object):
     def aggregate(self, func, uri_list, uri_name):
         ret = True
         entries = []
-        for uri in uri_list:
-            inventory = func(uri)
+        inventories = self._fetch_all(func, uri_list)
+        for uri, inventory in zip(uri_list, inventories):
             ret = inventory.pop('ret') and ret
             if 'entries' in inventory:
                 entries.append(({uri_name: uri},
@@ -770,44 +895,31 @@ class RedfishUtils(object):
         if 'Storage' not in data:
             return {'ret': False, 'msg': "Storage resource not found"}
 
-        # Get a list of all storage controllers and build respective URIs
+        # Get all storage subsystems
         storage_uri = data['Storage']["@odata.id"]
-        response = self.get_request(self.root_uri + storage_uri)
-        if response['ret'] is False:
-            return response
+        storage = self.get_collection_members(storage_uri)
+        if storage['ret'] is False:
+            return storage
         result['ret'] = True
-        data = response['data']
 
         # Loop through Members and their StorageControllers
         # and gather properties from each StorageController
-        if data[u'Members']:
-            for storage_member in data[u'Members']:
-                storage_member_uri = storage_member[u'@odata.id']
-                response = self.get_request(self.root_uri + storage_member_uri)
-                data = response['data']
-
+        if storage['members']:
+            for data in storage['members']:
                 if key in data:
                     controllers_uri = data[key][u'@odata.id']
 
-                    response = self.get_request(self.root_uri + controllers_uri)
-                    if response['ret'] is False:
-                        return response
+                    controllers = self.get_collection_members(controllers_uri)
+                    if controllers['ret'] is False:
+                        return controllers
                     result['ret'] = True
-                    data = response['data']
-
-                    if data[u'Members']:
-                        for controller_member in data[u'Members']:
-                            controller_member_uri = controller_member[u'@odata.id']
-                            response = self.get_request(self.root_uri + controller_member_uri)
-                            if response['ret'] is False:
-                                return response
-                            result['ret'] = True
-                            data = response['data']
 
+                    if controllers['members']:
+                        for controller in controllers['members']:
                             controller_result = {}
                             for property in properties:
-                                if property in data:
-                                    controller_result[property] = data[property]
+                                if property in controller:
+                                    controller_result[property] = controller[property]
                             controller_results.append(controller_result)
                 elif deprecated_key in data:
                     controller_list = data[deprecated_key]
@@ -827,7 +939,6 @@ class RedfishUtils(object):
 
     def get_disk_inventory(self, systems_uri):
         result = {'entries': []}
-        controller_list = []
         # Get these entries, but does not fail if not found
         properties = ['BlockSizeBytes', 'CapableSpeedGbs', 'CapacityBytes',
                       'EncryptionAbility', 'EncryptionStatus',
@@ -847,23 +958,15 @@ class RedfishUtils(object):
                      not found"}
 
         if 'Storage' in data:
-            # Get a list of all storage controllers and build respective URIs
+            # Get all storage subsystems
             storage_uri = data[u'Storage'][u'@odata.id']
-            response = self.get_request(self.root_uri + storage_uri)
-            if response['ret'] is False:
-                return response
+            storage = self.get_collection_members(storage_uri)
+            if storage['ret'] is False:
+                return storage
             result['ret'] = True
-            data = response['data']
 
-            if data[u'Members']:
-                for controller in data[u'Members']:
-                    controller_list.append(controller[u'@odata.id'])
-                for c in controller_list:
-                    uri = self.root_uri + c
-                    response = self.get_request(uri)
-                    if response['ret'] is False:
-                        return response
-                    data = response['data']
+            if storage['members']:
+                for data in storage['members']:
                     controller_name = 'Controller 1'
                     storage_id = data['Id']
                     if 'Controllers' in data:
@@ -894,46 +997,36 @@ class RedfishUtils(object):
                                 controller_name = 'Controller %s' % sc_id
                     drive_results = []
                     if 'Drives' in data:
-                        for device in data[u'Drives']:
-                            disk_uri = self.root_uri + device[u'@odata.id']
-                            response = self.get_request(disk_uri)
-                            data = response['data']
-
+                        response = self.get_resources([device[u'@odata.id'] for device in data[u'Drives']])
+                        if response['ret'] is False:
+                            return response
+                        for drive in response['members']:
                             drive_result = {}
-                            drive_result['RedfishURI'] = data['@odata.id']
+                            drive_result['RedfishURI'] = drive['@odata.id']
                             for property in properties:
-                                if property in data:
-                                    if data[property] is not None:
+                                if property in drive:
+                                    if drive[property] is not None:
                                         if property == "Links":
-                                            if "Volumes" in data["Links"].keys():
-                                                volumes = [v["@odata.id"] for v in data["Links"]["Volumes"]]
+                                            if "Volumes" in drive["Links"].keys():
+                                                volumes = [v["@odata.id"] for v in drive["Links"]["Volumes"]]
                                                 drive_result["Volumes"] = volumes
                                         else:
-                                            drive_result[property] = data[property]
+                                            drive_result[property] = drive[property]
                             drive_results.append(drive_result)
                     drives = {'Controller': controller_name,
                               'StorageId': storage_id,
                               'Drives': drive_results}
                     result["entries"].append(drives)
 
-        if 'SimpleStorage' in data:
-            # Get a list of all storage controllers and build respective URIs
+        elif 'SimpleStorage' in data:
+            # Get all storage controllers
             storage_uri = data["SimpleStorage"]["@odata.id"]
-            response = self.get_request(self.root_uri + storage_uri)
-            if response['ret'] is False:
-                return response
+            storage = self.get_collection_members(storage_uri)
+            if storage['ret'] is False:
+                return storage
             result['ret'] = True
-            data = response['data']
-
-            for controller in data[u'Members']:
-                controller_list.append(controller[u'@odata.id'])
 
-            for c in controller_list:
-                uri = self.root_uri + c
-                response = self.get_request(uri)
-                if response['ret'] is False:
-                    return response
-                data = response['data']
+            for data in storage['members']:
                 if 'Name' in data:
                     controller_name = data['Name']
                 else:
@@ -957,8 +1050,6 @@ class RedfishUtils(object):
 
     def get_volume_inventory(self, systems_uri):
         result = {'entries': []}
-        controller_list = []
-        volume_list = []
         # Get these entries, but does not fail if not found
         properties = ['Id', 'Name', 'RAIDType', 'VolumeType', 'BlockSizeBytes',
                       'Capacity', 'CapacityBytes', 'CapacitySources',
@@ -977,23 +1068,15 @@ class RedfishUtils(object):
                      not found"}
 
         if 'Storage' in data:
-            # Get a list of all storage controllers and build respective URIs
+            # Get all storage subsystems
             storage_uri = data[u'Storage'][u'@odata.id']
-            response = self.get_request(self.root_uri + storage_uri)
-            if response['ret'] is False:
-                return response
+            storage = self.get_collection_members(storage_uri)
+            if storage['ret'] is False:
+                return storage
             result['ret'] = True
-            data = response['data']
 
-            if data.get('Members'):
-                for controller in data[u'Members']:
-                    controller_list.append(controller[u'@odata.id'])
-                for idx, c in enumerate(controller_list):
-                    uri = self.root_uri + c
-                    response = self.get_request(uri)
-                    if response['ret'] is False:
-                        return response
-                    data = response['data']
+            if storage['members']:
+                for idx, data in enumerate(storage['members']):
                     controller_name = 'Controller %s' % str(idx)
                     if 'Controllers' in data:
                         response = self.get_request(self.root_uri + data['Controllers'][u'@odata.id'])
@@ -1022,23 +1105,15 @@ class RedfishUtils(object):
                                 sc_id = sc[0].get('Id', '1')
                                 controller_name = 'Controller %s' % sc_id
                     volume_results = []
-                    volume_list = []
                     if 'Volumes' in data:
-                        # Get a list of all volumes and build respective URIs
+                        # Get all volumes
                         volumes_uri = data[u'Volumes'][u'@odata.id']
-                        response = self.get_request(self.root_uri + volumes_uri)
-                        data = response['data']
-
-                        if data.get('Members'):
-                            for volume in data[u'Members']:
-                                volume_list.append(volume[u'@odata.id'])
-                            for v in volume_list:
-                                uri = self.root_uri + v
-                                response = self.get_request(uri)
-                                if response['ret'] is False:
-                                    return response
-                                data = response['data']
+                        volume_collection = self.get_collection_members(volumes_uri)
+                        if volume_collection['ret'] is False:
+                            return volume_collection
 
+                        if volume_collection['members']:
+                            for data in volume_collection['members']:
                                 volume_result = {}
                                 for property in properties:
                                     if property in data:
@@ -2557,7 +2632,6 @@ class RedfishUtils(object):
 
     def get_cpu_inventory(self, systems_uri):
         result = {}
-        cpu_list = []
         cpu_results = []
         key = "Processors"
         # Get these entries, but does not fail if not found
@@ -2576,24 +2650,14 @@ class RedfishUtils(object):
 
         processors_uri = data[key]["@odata.id"]
 
-        # Get a list of all CPUs and build respective URIs
-        response = self.get_request(self.root_uri + processors_uri)
+        # Get all CPUs
+        response = self.get_collection_members(processors_uri)
         if response['ret'] is False:
             return response
         result['ret'] = True
-        data = response['data']
-
-        for cpu in data[u'Members']:
-            cpu_list.append(cpu[u'@odata.id'])
 
-        for c in cpu_list:
+        for data in response['members']:
             cpu = {}
-            uri = self.root_uri + c
-            response = self.get_request(uri)
-            if response['ret'] is False:
-                return response
-            data = response['data']
-
             for property in properties:
                 if property in data:
                     cpu[property] = data[property]
@@ -2607,7 +2671,6 @@ class RedfishUtils(object):
 
     def get_memory_inventory(self, systems_uri):
         result = {}
-        memory_list = []
         memory_results = []
         key = "Memory"
         # Get these entries, but does not fail if not found
@@ -2626,24 +2689,14 @@ class RedfishUtils(object):
 
         memory_uri = data[key]["@odata.id"]
 
-        # Get a list of all DIMMs and build respective URIs
-        response = self.get_request(self.root_uri + memory_uri)
+        # Get all DIMMs
+        response = self.get_collection_members(memory_uri)
         if response['ret'] is False:
             return response
         result['ret'] = True
-        data = response['data']
 
-        for dimm in data[u'Members']:
-            memory_list.append(dimm[u'@odata.id'])
-
-        for m in memory_list:
+        for data in response['members']:
             dimm = {}
-            uri = self.root_uri + m
-            response = self.get_request(uri)
-            if response['ret'] is False:
-                return response
-            data = response['data']
-
             if "Status" in data:
                 if "State" in data["Status"]:
                     if data["Status"]["State"] == "Absent":
@@ -41,12 +41,22 @@ options:
     type: str
     description:
       - Plugin name.
-    required: true
+      - Exactly one of O(name) and O(plugins) is required.
   owner:
     type: str
     description:
       - UID or name of the Jenkins user on the OS.
     default: jenkins
+  plugins:
+    type: list
+    elements: str
+    description:
+      - Names of several plugins to install in one module run.
+      - If O(with_dependencies=true), the dependencies of the plugins are resolved from the C(update-center.json) file and
+        installed before the plugins depending on them. Optional dependencies are not installed.
+      - Only O(state=present) and O(state=latest) are supported with this option, and O(version) cannot be used.
+      - Exactly one of O(name) and O(plugins) is required.
+    version_added: 10.5.0
   state:
     type: str
     description:
@@ -66,6 +76,8 @@ options:
         need to download the plugin to calculate its checksum when O(state=latest) is specified.
       - Set it to V(0) if no cache file should be used. In that case, the plugin file will always be downloaded to calculate
         its checksum when O(state=latest) is specified.
+      - Once the cache file expired, it is revalidated with the server using the C(ETag) and C(Last-Modified) headers
+        of the response it was downloaded from, and only downloaded again if it changed.
     default: 86400
   updates_url:
     type: list
@@ -145,6 +157,14 @@ EXAMPLES = r"""
     name: token-macro
     state: latest
 
+- name: Install several plugins and their dependencies in one go
+  community.general.jenkins_plugin:
+    plugins:
+      - git
+      - workflow-aggregator
+      - token-macro
+    state: latest
+
 - name: Install specific version of the plugin
   community.general.jenkins_plugin:
     name: token-macro
@@ -303,6 +323,20 @@ plugin:
   returned: success
   type: str
   sample: build-pipeline-plugin
+plugins:
+  description: Names of the plugins installed with O(plugins), including their dependencies, in the order they were installed.
+  returned: success and O(plugins) is specified
+  type: list
+  elements: str
+  sample: ["workflow-api", "git"]
+  version_added: 10.5.0
+changed_plugins:
+  description: Names of the plugins installed or updated with O(plugins).
+  returned: success and O(plugins) is specified
+  type: list
+  elements: str
+  sample: ["git"]
+  version_added: 10.5.0
 state:
   description: State of the target, after execution.
   returned: success
@@ -310,6 +344,7 @@ state:
   sample: "present"
 """
 
+import base64
 import hashlib
 import io
 import json
@@ -323,7 +358,15 @@ from ansible.module_utils.urls import fetch_url, url_argument_spec
 from ansible.module_utils.six import text_type, binary_type
 from ansible.module_utils.common.text.converters import to_native
 
-from ansible_collections.community.general.plugins.module_utils.jenkins import download_updates_file
+from ansible_collections.community.general.plugins.module_utils.jenkins import (
+    download_updates_file,
+    read_updates_validators,
+    write_updates_validators,
+)
+
+
+# Size of the chunks in which plugin and updates files are downloaded and hashed
+CHUNK_SIZE = 65536
 
 
 class FailedInstallingWithPluginManager(Exception):
@@ -340,6 +383,9 @@ class JenkinsPlugin(object):
         self.url = self.params['url']
         self.timeout = self.params['timeout']
 
+        # Content of the updates file, downloaded at most once per module run
+        self.updates_data = None
+
         # Crumb
         self.crumb = {}
         # Cookie jar for crumb session
@@ -377,7 +423,7 @@ class JenkinsPlugin(object):
 
         return json_data
 
-    def _get_urls_data(self, urls, what=None, msg_status=None, msg_exception=None, **kwargs):
+    def _get_urls_data(self, urls, what=None, msg_status=None, msg_exception=None, headers=None, **kwargs):
         # Compose default messages
         if msg_status is None:
             msg_status = "Cannot get %s" % what
@@ -392,10 +438,13 @@ class JenkinsPlugin(object):
                 self.module.debug("fetching url: %s" % url)
                 response, info = fetch_url(
                     self.module, url, timeout=self.timeout, cookies=self.cookies,
-                    headers=self.crumb, **kwargs)
+                    headers=dict(self.crumb, **(headers or {})), **kwargs)
 
                 if info['status'] == 200:
                     return response
+                elif info['status'] == 304 and headers:
+                    # Not modified since the conditional request headers
+                    return None
                 else:
                     err_msg = ("%s. fetching url %s failed. response code: %s" % (msg_status, url, info['status']))
                     if info['status'] > 400:  # extend error message
@@ -463,22 +512,24 @@ class JenkinsPlugin(object):
         if 'plugins' not in plugins_data:
             self.module.fail_json(msg="No valid plugin data found.")
 
+        self.installed_plugins = dict((p['shortName'], p) for p in plugins_data['plugins'])
+        self._select_plugin(self.params['name'])
+
+    def _select_plugin(self, name):
         # Create final list of installed/pined plugins
         self.is_installed = False
         self.is_pinned = False
         self.is_enabled = False
 
-        for p in plugins_data['plugins']:
-            if p['shortName'] == self.params['name']:
-                self.is_installed = True
+        p = self.installed_plugins.get(name)
+        if p is not None:
+            self.is_installed = True
 
-                if p['pinned']:
-                    self.is_pinned = True
+            if p['pinned']:
+                self.is_pinned = True
 
-                if p['enabled']:
-                    self.is_enabled = True
-
-                break
+            if p['enabled']:
+                self.is_enabled = True
 
     def _install_with_plugin_manager(self):
         if not self.module.check_mode:
@@ -536,9 +587,8 @@ class JenkinsPlugin(object):
             checksum_old = None
             if os.path.isfile(plugin_file):
                 # Make the checksum of the currently installed plugin
-                with open(plugin_file, 'rb') as plugin_fh:
-                    plugin_content = plugin_fh.read()
-                checksum_old = hashlib.sha1(plugin_content).hexdigest()
+                sha1_old = self._get_file_sha1(plugin_file)
+                checksum_old = sha1_old.hexdigest()
 
             if self.params['version'] in [None, 'latest']:
                 # Take latest version
@@ -562,25 +612,26 @@ class JenkinsPlugin(object):
 
                     changed = True
                 else:
-                    # Get data for the MD5
-                    data = r.read()
-
-                    # Make new checksum
-                    checksum_new = hashlib.sha1(data).hexdigest()
+                    # Store the plugin in a temp file while making its checksum
+                    tmp_f, checksum_new = self._write_tmp_file(r)
 
                     # If the checksum is different from the currently installed
                     # plugin, store the new plugin
                     if checksum_old != checksum_new:
                         if not self.module.check_mode:
-                            self._write_file(plugin_file, data)
+                            self.module.atomic_move(os.path.abspath(tmp_f), os.path.abspath(plugin_file))
 
                         changed = True
+
+                    if os.path.isfile(tmp_f):
+                        os.remove(tmp_f)
             elif self.params['version'] == 'latest':
                 # Check for update from the updates JSON file
                 plugin_data = self._download_updates()
 
-                # If the latest version changed, download it
-                if checksum_old != to_bytes(plugin_data['sha1']):
+                # If the latest version changed, download it (the updates
+                # file contains the base64 encoded SHA-1 checksum)
+                if base64.b64encode(sha1_old.digest()) != to_bytes(plugin_data['sha1']):
                     if not self.module.check_mode:
                         r = self._download_plugin(plugin_urls)
                         self._write_file(plugin_file, r)
@@ -605,6 +656,56 @@ class JenkinsPlugin(object):
 
         return changed
 
+    def install_plugins(self):
+        names = self.params['plugins']
+        if self.params['with_dependencies']:
+            names = self._resolve_dependencies(names)
+
+        # The dependencies are installed explicitly, in the order they are needed
+        self.params['with_dependencies'] = False
+
+        changed_plugins = []
+        for name in names:
+            self.params['name'] = name
+            self._select_plugin(name)
+
+            if self.install():
+                changed_plugins.append(name)
+
+        self.params['name'] = None
+
+        return names, changed_plugins
+
+    def _resolve_dependencies(self, names):
+        plugins = self._get_updates_data()['plugins']
+        resolved = []
+        seen = set()
+
+        def add(name, required_by=None):
+            if name in seen:
+                return
+            seen.add(name)
+
+            if name not in plugins:
+                if required_by is None:
+                    self.module.fail_json(msg="Cannot find plugin %s in the updates file." % name)
+                elif name in self.installed_plugins:
+                    # Detached or bundled plugin which is already installed
+                    return
+                self.module.fail_json(
+                    msg="Cannot find plugin %s, which is required by %s, in the updates file." % (name, required_by))
+
+            for dependency in plugins[name].get('dependencies', []):
+                if not dependency.get('optional'):
+                    add(dependency['name'], name)
+
+            resolved.append(name)
+
+        for name in names:
+            add(name)
+
+        return resolved
+
     def _get_latest_plugin_urls(self):
         urls = []
         for base_url in self.params['updates_url']:
@@ -627,6 +728,18 @@ class JenkinsPlugin(object):
         return urls
 
     def _download_updates(self):
+        plugins = self._get_updates_data().get('plugins', {})
+
+        # Check if we have the plugin data available
+        if not plugins.get(self.params['name']):
+            self.module.fail_json(msg="Cannot find plugin data in the updates file.")
+
+        return plugins[self.params['name']]
+
+    def _get_updates_data(self):
+        if self.updates_data is not None:
+            return self.updates_data
+
         try:
             updates_file, download_updates = download_updates_file(self.params['updates_expiration'])
         except OSError as e:
@@ -634,36 +747,40 @@ class JenkinsPlugin(object):
                 msg="Cannot create temporal directory.",
                 details=to_native(e))
 
+        tmp_updates_file = updates_file
+
         # Download the updates file if needed
         if download_updates:
             urls = self._get_update_center_urls()
 
+            # Revalidate an expired updates file instead of downloading it again
+            headers = {}
+            if self.params['updates_expiration'] > 0:
+                headers = read_updates_validators(updates_file)
+
             # Get the data
             r = self._get_urls_data(
                 urls,
                 msg_status="Remote updates not found.",
-                msg_exception="Updates download failed.")
-
-            # Write the updates file
-            tmp_update_fd, tmp_updates_file = tempfile.mkstemp()
-            os.write(tmp_update_fd, r.read())
+                msg_exception="Updates download failed.",
+                headers=headers)
 
-            try:
-                os.close(tmp_update_fd)
-            except IOError as e:
-                self.module.fail_json(
-                    msg="Cannot close the tmp updates file %s." % tmp_updates_file,
-                    details=to_native(e))
-        else:
-            tmp_updates_file = updates_file
+            if r is None:
+                # The cached updates file is still current
+                os.utime(updates_file, None)
+            else:
+                # Write the updates file
+                tmp_updates_file, dummy = self._write_tmp_file(r)
+                response_headers = getattr(r, 'headers', None) or {}
+                etag = response_headers.get('ETag')
+                last_modified = response_headers.get('Last-Modified')
 
         # Open the updates file
         try:
-            f = io.open(tmp_updates_file, encoding='utf-8')
-
-            # Read only the second line
-            dummy = f.readline()
-            data = json.loads(f.readline())
+            with io.open(tmp_updates_file, encoding='utf-8') as f:
+                # Read only the second line
+                dummy = f.readline()
+                data = json.loads(f.readline())
         except IOError as e:
             self.module.fail_json(
                 msg="Cannot open%s updates file." % (" temporary" if tmp_updates_file != updates_file else ""),
@@ -676,12 +793,14 @@ class JenkinsPlugin(object):
         # Move the updates file to the right place if we could read it
         if tmp_updates_file != updates_file:
             self.module.atomic_move(os.path.abspath(tmp_updates_file), os.path.abspath(updates_file))
+            try:
+                write_updates_validators(updates_file, etag, last_modified)
+            except (IOError, OSError) as e:
+                self.module.warn("Cannot store the validators of the updates file: %s" % to_native(e))
 
-        # Check if we have the plugin data available
-        if not data.get('plugins', {}).get(self.params['name']):
-            self.module.fail_json(msg="Cannot find plugin data in the updates file.")
+        self.updates_data = data
 
-        return data['plugins'][self.params['name']]
+        return data
 
     def _download_plugin(self, plugin_urls):
         # Download the plugin
@@ -691,22 +810,41 @@ class JenkinsPlugin(object):
             msg_status="Plugin not found.",
             msg_exception="Plugin download failed.")
 
-    def _write_file(self, f, data):
-        # Store the plugin into a temp file and then move it
-        tmp_f_fd, tmp_f = tempfile.mkstemp()
+    def _get_file_sha1(self, f):
+        sha1 = hashlib.sha1()
+        with open(f, 'rb') as fh:
+            for chunk in iter(lambda: fh.read(CHUNK_SIZE), b''):
+                sha1.update(chunk)
 
-        if isinstance(data, (text_type, binary_type)):
-            os.write(tmp_f_fd, data)
-        else:
-            os.write(tmp_f_fd, data.read())
+        return sha1
+
+    def _write_tmp_file(self, data):
+        # Store the data into a temp file in chunks, return its name and
+        # the SHA-1 checksum of the data
+        tmp_f_fd, tmp_f = tempfile.mkstemp()
+        sha1 = hashlib.sha1()
 
         try:
-            os.close(tmp_f_fd)
+            with os.fdopen(tmp_f_fd, 'wb') as tmp_fh:
+                if isinstance(data, (text_type, binary_type)):
+                    chunks = [to_bytes(data)]
+                else:
+                    chunks = iter(lambda: data.read(CHUNK_SIZE), b'')
+
+                for chunk in chunks:
+                    sha1.update(chunk)
+                    tmp_fh.write(chunk)
         except IOError as e:
             self.module.fail_json(
-                msg='Cannot close the temporal plugin file %s.' % tmp_f,
+                msg='Cannot write the temporal file %s.' % tmp_f,
                 details=to_native(e))
 
+        return tmp_f, sha1.hexdigest()
+
+    def _write_file(self, f, data):
+        # Store the plugin into a temp file and then move it
+        tmp_f, dummy = self._write_tmp_file(data)
+
         # Move the file onto the right place
         self.module.atomic_move(os.path.abspath(tmp_f), os.path.abspath(f))
 
@@ -787,8 +925,9 @@ def main():
         group=dict(type='str', default='jenkins'),
         jenkins_home=dict(type='path', default='/var/lib/jenkins'),
         mode=dict(default='0644', type='raw'),
-        name=dict(type='str', required=True),
+        name=dict(type='str'),
         owner=dict(type='str', default='jenkins'),
+        plugins=dict(type='list', elements='str'),
         state=dict(
             choices=[
                 'present',
@@ -817,6 +956,8 @@ def main():
         argument_spec=argument_spec,
         add_file_common_args=True,
         supports_check_mode=True,
+        mutually_exclusive=[('name', 'plugins'), ('plugins', 'version')],
+        required_one_of=[('name', 'plugins')],
     )
 
     # Force basic authentication
@@ -839,6 +980,9 @@ def main():
     name = module.params['name']
     state = module.params['state']
 
+    if module.params['plugins'] is not None and state != 'present':
+        module.fail_json(msg="Only state=present and state=latest are supported with the plugins option.")
+
     # Initial change state of the task
     changed = False
 
@@ -846,7 +990,11 @@ def main():
     jp = JenkinsPlugin(module)
 
     # Perform action depending on the requested state
-    if state == 'present':
+    if module.params['plugins'] is not None:
+        plugins, changed_plugins = jp.install_plugins()
+        module.exit_json(
+            changed=bool(changed_plugins), plugins=plugins, changed_plugins=changed_plugins, state=state)
+    elif state == 'present':
         changed = jp.install()
     elif state == 'absent':
         changed = jp.uninstall()
@@ -49,8 +49,21 @@ options:
   conn_name:
     description:
       - The name used to call the connection. Pattern is V(<type>[-<ifname>][-<num>]).
+      - Exactly one of O(conn_name) and O(connections) is required.
     type: str
-    required: true
+  connections:
+    description:
+      - A list of connections to manage in one module run, instead of the single connection named by O(conn_name).
+      - Every element is a dictionary with the options of this module for one connection, except O(connections).
+        O(conn_name) is required in every element, and must be unique.
+      - Options set at the top level, like O(state), apply to all connections, unless an element sets them.
+      - The names of all connections and the settings of the listed connections which exist are read with two C(nmcli) calls
+        before any connection is changed. The properties supported by a connection type are only read once for all connections.
+      - The connections are managed in the order of the list. The module fails on the first connection which cannot be managed,
+        leaving the following connections unchanged. The results of the connections managed before are returned in RV(connections).
+    type: list
+    elements: dict
+    version_added: 10.5.0
   conn_reload:
     description:
       - Whether the connection should be reloaded if it was modified.
@@ -1630,6 +1643,37 @@ EXAMPLES = r"""
     type: ovs-port
     state: present
 
+## Managing several connections in one task
+- name: Create a bond with two ports and two VLANs on top of it
+  community.general.nmcli:
+    state: present
+    connections:
+      - conn_name: bond0
+        type: bond
+        mode: 802.3ad
+        method4: disabled
+        method6: disabled
+      - conn_name: bond0-port1
+        type: ethernet
+        ifname: eno1
+        master: bond0
+        slave_type: bond
+      - conn_name: bond0-port2
+        type: ethernet
+        ifname: eno2
+        master: bond0
+        slave_type: bond
+      - conn_name: bond0.10
+        type: vlan
+        vlandev: bond0
+        vlanid: 10
+        ip4: 192.168.10.5/24
+      - conn_name: bond0.20
+        type: vlan
+        vlandev: bond0
+        vlanid: 20
+        ip4: 192.168.20.5/24
+
 ## Adding an ethernet interface to an OVS bridge port
 - name: Add Ethernet Interface to OVS Port
   community.general.nmcli:
@@ -1641,10 +1685,30 @@ EXAMPLES = r"""
     state: present
 """
 
-RETURN = r"""#
+RETURN = r"""
+connections:
+  description:
+    - The result of every connection of O(connections), in the same order.
+    - When the module fails, the results of the connections managed before the failing one.
+    - Every element contains at least the keys RV(connections[].conn_name) and RV(connections[].changed).
+  returned: when O(connections) is specified
+  type: list
+  elements: dict
+  sample: [{"conn_name": "bond0", "state": "present", "changed": false, "Exists": "Connections already exist and no changes made"}]
+  version_added: 10.5.0
+  contains:
+    conn_name:
+      description: The name of the connection.
+      type: str
+      returned: success
+    changed:
+      description: Whether the connection was changed.
+      type: bool
+      returned: success
 """
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
 from ansible.module_utils.common.text.converters import to_text
 import re
 
@@ -1679,7 +1743,7 @@ class Nmcli(object):
         '802-11-wireless-security.wep-key3'
     )
 
-    def __init__(self, module):
+    def __init__(self, module, supported_properties=None):
         self.module = module
         self.state = module.params['state']
         self.ignore_unsupported_suboptions = module.params['ignore_unsupported_suboptions']
@@ -1789,6 +1853,12 @@ class Nmcli(object):
 
         self.edit_commands = []
 
+        # Supported properties of each setting per connection type, may be shared between connections
+        self.supported_properties = {} if supported_properties is None else supported_properties
+        # Snapshot of the connection names and of the connection info, set by load_snapshot()
+        self._connection_names = None
+        self._conn_info = None
+
         self.extra_options_validation()
 
     def extra_options_validation(self):
@@ -2272,6 +2342,9 @@ class Nmcli(object):
         return [self.route_to_string(route_params) for route_params in routes_params]
 
     def list_connection_info(self):
+        if self._connection_names is not None:
+            return self._connection_names
+
         cmd = [self.nmcli_bin, '--fields', 'name', '--terse', 'con', 'show']
         (rc, out, err) = self.execute_command(cmd)
         if rc != 0:
@@ -2372,7 +2445,15 @@ class Nmcli(object):
         commands = self.edit_commands + ['save', 'quit']
         return self.execute_edit_commands(commands, arguments=[self.conn_name])
 
+    def load_snapshot(self, connection_names, conn_info):
+        """ Use the connection names and connection info read by show_connections() instead of running nmcli again. """
+        self._connection_names = connection_names
+        self._conn_info = conn_info
+
     def show_connection(self):
+        if self._conn_info is not None:
+            return dict(self._conn_info)
+
         cmd = [self.nmcli_bin, '--show-secrets', 'con', 'show', self.conn_name]
 
         (rc, out, err) = self.execute_command(cmd)
@@ -2380,10 +2461,40 @@ class Nmcli(object):
         if rc != 0:
             raise NmcliModuleError(err)
 
+        return self.parse_connection_info(out.splitlines())
+
+    def show_connections(self, conn_names):
+        """ Read the info of several connections with a single nmcli call, return it by connection name. """
+        if not conn_names:
+            return {}
+
+        cmd = [self.nmcli_bin, '--show-secrets', 'con', 'show']
+        for conn_name in conn_names:
+            cmd += ['id', conn_name]
+
+        (rc, out, err) = self.execute_command(cmd)
+
+        if rc != 0:
+            raise NmcliModuleError(err)
+
+        # The info of every connection starts with its connection.id property
+        blocks = []
+        for line in out.splitlines():
+            if line.startswith('connection.id:') or not blocks:
+                blocks.append([])
+            blocks[-1].append(line)
+
+        conn_infos = {}
+        for block in blocks:
+            conn_info = self.parse_connection_info(block)
+            conn_infos.setdefault(conn_info.get('connection.id'), conn_info)
+        return conn_infos
+
+    def parse_connection_info(self, lines):
         p_enum_value = re.compile(r'^([-]?\d+) \((\w+)\)$')
 
         conn_info = dict()
-        for line in out.splitlines():
+        for line in lines:
             pair = line.split(':', 1)
             key = pair[0].strip()
             key_type = self.settings_type(key)
@@ -2418,6 +2529,9 @@ class Nmcli(object):
         return conn_info
 
     def get_supported_properties(self, setting):
+        if (self.type, setting) in self.supported_properties:
+            return self.supported_properties[(self.type, setting)]
+
         properties = []
 
         if setting == '802-11-wireless-security':
@@ -2441,6 +2555,7 @@ class Nmcli(object):
                 property = pair[0].strip().replace(prefix, '')
                 properties.append(property)
 
+        self.supported_properties[(self.type, setting)] = properties
         return properties
 
     def check_for_unsupported_properties(self, setting):
@@ -2556,170 +2671,28 @@ class Nmcli(object):
         return self._compare_conn_params(self.show_connection(), options)
 
 
-def main():
-    # Parsing argument file
-    module = AnsibleModule(
-        argument_spec=dict(
-            ignore_unsupported_suboptions=dict(type='bool', default=False),
-            autoconnect=dict(type='bool', default=True),
-            state=dict(type='str', required=True, choices=['absent', 'present', 'up', 'down']),
-            conn_name=dict(type='str', required=True),
-            conn_reload=dict(type='bool', default=False),
-            master=dict(type='str'),
-            slave_type=dict(type='str', choices=['bond', 'bridge', 'team', 'ovs-port', 'vrf']),
-            ifname=dict(type='str'),
-            type=dict(type='str',
-                      choices=[
-                          'bond',
-                          'bond-slave',
-                          'bridge',
-                          'bridge-slave',
-                          'dummy',
-                          'ethernet',
-                          'generic',
-                          'gre',
-                          'infiniband',
-                          'ipip',
-                          'sit',
-                          'team',
-                          'team-slave',
-                          'vlan',
-                          'vxlan',
-                          'wifi',
-                          'gsm',
-                          'macvlan',
-                          'wireguard',
-                          'vpn',
-                          'loopback',
-                          'ovs-interface',
-                          'ovs-bridge',
-                          'ovs-port',
-                          'vrf',
-                      ]),
-            ip4=dict(type='list', elements='str'),
-            gw4=dict(type='str'),
-            gw4_ignore_auto=dict(type='bool', default=False),
-            routes4=dict(type='list', elements='str'),
-            routes4_extended=dict(type='list',
-                                  elements='dict',
-                                  options=dict(
-                                      ip=dict(type='str', required=True),
-                                      next_hop=dict(type='str'),
-                                      metric=dict(type='int'),
-                                      table=dict(type='int'),
-                                      tos=dict(type='int'),
-                                      cwnd=dict(type='int'),
-                                      mtu=dict(type='int'),
-                                      onlink=dict(type='bool')
-                                  )),
-            route_metric4=dict(type='int'),
-            routing_rules4=dict(type='list', elements='str'),
-            never_default4=dict(type='bool', default=False),
-            dns4=dict(type='list', elements='str'),
-            dns4_search=dict(type='list', elements='str'),
-            dns4_options=dict(type='list', elements='str'),
-            dns4_ignore_auto=dict(type='bool', default=False),
-            method4=dict(type='str', choices=['auto', 'link-local', 'manual', 'shared', 'disabled']),
-            may_fail4=dict(type='bool', default=True),
-            dhcp_client_id=dict(type='str'),
-            ip6=dict(type='list', elements='str'),
-            gw6=dict(type='str'),
-            gw6_ignore_auto=dict(type='bool', default=False),
-            dns6=dict(type='list', elements='str'),
-            dns6_search=dict(type='list', elements='str'),
-            dns6_options=dict(type='list', elements='str'),
-            dns6_ignore_auto=dict(type='bool', default=False),
-            routes6=dict(type='list', elements='str'),
-            routes6_extended=dict(type='list',
-                                  elements='dict',
-                                  options=dict(
-                                      ip=dict(type='str', required=True),
-                                      next_hop=dict(type='str'),
-                                      metric=dict(type='int'),
-                                      table=dict(type='int'),
-                                      cwnd=dict(type='int'),
-                                      mtu=dict(type='int'),
-                                      onlink=dict(type='bool')
-                                  )),
-            route_metric6=dict(type='int'),
-            method6=dict(type='str', choices=['ignore', 'auto', 'dhcp', 'link-local', 'manual', 'shared', 'disabled']),
-            ip_privacy6=dict(type='str', choices=['disabled', 'prefer-public-addr', 'prefer-temp-addr', 'unknown']),
-            addr_gen_mode6=dict(type='str', choices=['default', 'default-or-eui64', 'eui64', 'stable-privacy']),
-            # Bond Specific vars
-            mode=dict(type='str', default='balance-rr',
-                      choices=['802.3ad', 'active-backup', 'balance-alb', 'balance-rr', 'balance-tlb', 'balance-xor', 'broadcast']),
-            miimon=dict(type='int'),
-            downdelay=dict(type='int'),
-            updelay=dict(type='int'),
-            xmit_hash_policy=dict(type='str'),
-            fail_over_mac=dict(type='str', choices=['none', 'active', 'follow']),
-            arp_interval=dict(type='int'),
-            arp_ip_target=dict(type='str'),
-            primary=dict(type='str'),
-            # general usage
-            mtu=dict(type='int'),
-            mac=dict(type='str'),
-            zone=dict(type='str'),
-            # bridge specific vars
-            stp=dict(type='bool', default=True),
-            priority=dict(type='int', default=128),
-            slavepriority=dict(type='int', default=32),
-            forwarddelay=dict(type='int', default=15),
-            hellotime=dict(type='int', default=2),
-            maxage=dict(type='int', default=20),
-            ageingtime=dict(type='int', default=300),
-            hairpin=dict(type='bool', default=False),
-            path_cost=dict(type='int', default=100),
-            # team specific vars
-            runner=dict(type='str', default='roundrobin',
-                             choices=['broadcast', 'roundrobin', 'activebackup', 'loadbalance', 'lacp']),
-            # team active-backup runner specific options
-            runner_hwaddr_policy=dict(type='str', choices=['same_all', 'by_active', 'only_active']),
-            # team lacp runner specific options
-            runner_fast_rate=dict(type='bool'),
-            # vlan specific vars
-            vlanid=dict(type='int'),
-            vlandev=dict(type='str'),
-            flags=dict(type='str'),
-            ingress=dict(type='str'),
-            egress=dict(type='str'),
-            # vxlan specific vars
-            vxlan_id=dict(type='int'),
-            vxlan_local=dict(type='str'),
-            vxlan_remote=dict(type='str'),
-            # ip-tunnel specific vars
-            ip_tunnel_dev=dict(type='str'),
-            ip_tunnel_local=dict(type='str'),
-            ip_tunnel_remote=dict(type='str'),
-            # ip-tunnel type gre specific vars
-            ip_tunnel_input_key=dict(type='str', no_log=True),
-            ip_tunnel_output_key=dict(type='str', no_log=True),
-            # 802-11-wireless* specific vars
-            ssid=dict(type='str'),
-            wifi=dict(type='dict'),
-            wifi_sec=dict(type='dict', no_log=True),
-            gsm=dict(type='dict'),
-            macvlan=dict(type='dict', options=dict(
-                              mode=dict(type='int', choices=[1, 2, 3, 4, 5], required=True),
-                              parent=dict(type='str', required=True),
-                              promiscuous=dict(type='bool'),
-                              tap=dict(type='bool'))),
-            wireguard=dict(type='dict'),
-            vpn=dict(type='dict'),
-            transport_mode=dict(type='str', choices=['datagram', 'connected']),
-            sriov=dict(type='dict'),
-            table=dict(type='int'),
-        ),
-        mutually_exclusive=[['never_default4', 'gw4'],
-                            ['routes4_extended', 'routes4'],
-                            ['routes6_extended', 'routes6']],
-        required_if=[("type", "wifi", [("ssid")])],
-        supports_check_mode=True,
-    )
-    module.run_command_environ_update = dict(LANG='C', LC_ALL='C', LC_MESSAGES='C', LC_CTYPE='C')
+class NmcliConnectionModule(object):
+    """ Give an Nmcli object the parameters of one element of the connections option.
+
+    A failure also reports the results of the connections managed before, given by results.
+    """
+
+    def __init__(self, module, params, results):
+        self._module = module
+        self.params = params
+        self._results = results
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+    def fail_json(self, **kwargs):
+        kwargs.setdefault('name', self.params['conn_name'])
+        kwargs.setdefault('changed', any(result['changed'] for result in self._results))
+        kwargs.setdefault('connections', self._results)
+        self._module.fail_json(**kwargs)
 
-    nmcli = Nmcli(module)
 
+def manage_connection(module, nmcli):
     (rc, out, err) = (None, '', '')
     result = {'conn_name': nmcli.conn_name, 'state': nmcli.state}
 
@@ -2756,7 +2729,7 @@ def main():
         if nmcli.state == 'absent':
             if nmcli.connection_exists():
                 if module.check_mode:
-                    module.exit_json(changed=True)
+                    return dict(changed=True)
                 (rc, out, err) = nmcli.down_connection()
                 (rc, out, err) = nmcli.remove_connection()
                 if rc != 0:
@@ -2773,18 +2746,18 @@ def main():
                     # result['Connection']=('Connection %s of Type %s is not being added' % (nmcli.conn_name, nmcli.type))
                     result['Exists'] = 'Connections do exist so we are modifying them'
                     if module.check_mode:
-                        module.exit_json(changed=True, **result)
+                        return dict(changed=True, **result)
                     (rc, out, err) = nmcli.modify_connection()
                     if nmcli.conn_reload:
                         (rc, out, err) = nmcli.reload_connection()
                 else:
                     result['Exists'] = 'Connections already exist and no changes made'
                     if module.check_mode:
-                        module.exit_json(changed=False, **result)
+                        return dict(changed=False, **result)
             if not nmcli.connection_exists():
                 result['Connection'] = ('Connection %s of Type %s is being added' % (nmcli.conn_name, nmcli.type))
                 if module.check_mode:
-                    module.exit_json(changed=True, **result)
+                    return dict(changed=True, **result)
                 (rc, out, err) = nmcli.create_connection()
             if rc is not None and rc != 0:
                 module.fail_json(name=nmcli.conn_name, msg=err, rc=rc)
@@ -2792,7 +2765,7 @@ def main():
         elif nmcli.state == 'up':
             if nmcli.connection_exists():
                 if module.check_mode:
-                    module.exit_json(changed=True)
+                    return dict(changed=True)
                 if nmcli.conn_reload:
                     (rc, out, err) = nmcli.reload_connection()
                 (rc, out, err) = nmcli.up_connection()
@@ -2802,7 +2775,7 @@ def main():
         elif nmcli.state == 'down':
             if nmcli.connection_exists():
                 if module.check_mode:
-                    module.exit_json(changed=True)
+                    return dict(changed=True)
                 if nmcli.conn_reload:
                     (rc, out, err) = nmcli.reload_connection()
                 (rc, out, err) = nmcli.down_connection()
@@ -2821,7 +2794,239 @@ def main():
     if err:
         result['stderr'] = err
 
-    module.exit_json(**result)
+    return result
+
+
+def manage_connections(module, argument_spec, mutually_exclusive, required_if):
+    element_spec = dict(argument_spec)
+    element_spec['conn_name'] = dict(argument_spec['conn_name'], required=True)
+    validator = ArgumentSpecValidator(element_spec, mutually_exclusive=mutually_exclusive, required_if=required_if)
+
+    # Options set at the top level apply to all connections
+    defaults = dict(
+        (key, value) for key, value in module.params.items()
+        if key in argument_spec and key != 'conn_name' and value is not None and value != argument_spec[key].get('default'))
+
+    supported_properties = {}
+    nmclis = []
+    results = []
+    for index, connection in enumerate(module.params['connections']):
+        connection = dict((key, value) for key, value in connection.items() if value is not None)
+        validation = validator.validate(dict(defaults, **connection))
+        if validation.error_messages:
+            module.fail_json(msg='connections[%d]: %s' % (index, ', '.join(validation.error_messages)))
+
+        nmcli = Nmcli(NmcliConnectionModule(module, validation.validated_parameters, results), supported_properties)
+        if nmcli.conn_name in [other.conn_name for other in nmclis]:
+            module.fail_json(msg='Connection %s is specified more than once in connections' % nmcli.conn_name)
+        nmclis.append(nmcli)
+
+    # Read the state of all connections up front
+    try:
+        connection_names = nmclis[0].list_connection_info() if nmclis else []
+        conn_infos = nmclis[0].show_connections([nmcli.conn_name for nmcli in nmclis if nmcli.conn_name in connection_names]) if nmclis else {}
+    except NmcliModuleError as e:
+        module.fail_json(msg=str(e))
+
+    for nmcli in nmclis:
+        nmcli.load_snapshot(connection_names, conn_infos.get(nmcli.conn_name))
+        conn_result = manage_connection(nmcli.module, nmcli)
+        conn_result.setdefault('conn_name', nmcli.conn_name)
+        results.append(conn_result)
+
+    result = {
+        'changed': any(conn_result['changed'] for conn_result in results),
+        'state': module.params['state'],
+        'connections': results,
+    }
+    if module._diff:
+        result['diff'] = [
+            dict(conn_result['diff'], before_header=conn_result['conn_name'], after_header=conn_result['conn_name'])
+            for conn_result in results if 'diff' in conn_result]
+    return result
+
+
+def main():
+    argument_spec = dict(
+        ignore_unsupported_suboptions=dict(type='bool', default=False),
+        autoconnect=dict(type='bool', default=True),
+        state=dict(type='str', required=True, choices=['absent', 'present', 'up', 'down']),
+        conn_name=dict(type='str'),
+        conn_reload=dict(type='bool', default=False),
+        master=dict(type='str'),
+        slave_type=dict(type='str', choices=['bond', 'bridge', 'team', 'ovs-port', 'vrf']),
+        ifname=dict(type='str'),
+        type=dict(type='str',
+                  choices=[
+                      'bond',
+                      'bond-slave',
+                      'bridge',
+                      'bridge-slave',
+                      'dummy',
+                      'ethernet',
+                      'generic',
+                      'gre',
+                      'infiniband',
+                      'ipip',
+                      'sit',
+                      'team',
+                      'team-slave',
+                      'vlan',
+                      'vxlan',
+                      'wifi',
+                      'gsm',
+                      'macvlan',
+                      'wireguard',
+                      'vpn',
+                      'loopback',
+                      'ovs-interface',
+                      'ovs-bridge',
+                      'ovs-port',
+                      'vrf',
+                  ]),
+        ip4=dict(type='list', elements='str'),
+        gw4=dict(type='str'),
+        gw4_ignore_auto=dict(type='bool', default=False),
+        routes4=dict(type='list', elements='str'),
+        routes4_extended=dict(type='list',
+                              elements='dict',
+                              options=dict(
+                                  ip=dict(type='str', required=True),
+                                  next_hop=dict(type='str'),
+                                  metric=dict(type='int'),
+                                  table=dict(type='int'),
+                                  tos=dict(type='int'),
+                                  cwnd=dict(type='int'),
+                                  mtu=dict(type='int'),
+                                  onlink=dict(type='bool')
+                              )),
+        route_metric4=dict(type='int'),
+        routing_rules4=dict(type='list', elements='str'),
+        never_default4=dict(type='bool', default=False),
+        dns4=dict(type='list', elements='str'),
+        dns4_search=dict(type='list', elements='str'),
+        dns4_options=dict(type='list', elements='str'),
+        dns4_ignore_auto=dict(type='bool', default=False),
+        method4=dict(type='str', choices=['auto', 'link-local', 'manual', 'shared', 'disabled']),
+        may_fail4=dict(type='bool', default=True),
+        dhcp_client_id=dict(type='str'),
+        ip6=dict(type='list', elements='str'),
+        gw6=dict(type='str'),
+        gw6_ignore_auto=dict(type='bool', default=False),
+        dns6=dict(type='list', elements='str'),
+        dns6_search=dict(type='list', elements='str'),
+        dns6_options=dict(type='list', elements='str'),
+        dns6_ignore_auto=dict(type='bool', default=False),
+        routes6=dict(type='list', elements='str'),
+        routes6_extended=dict(type='list',
+                              elements='dict',
+                              options=dict(
+                                  ip=dict(type='str', required=True),
+                                  next_hop=dict(type='str'),
+                                  metric=dict(type='int'),
+                                  table=dict(type='int'),
+                                  cwnd=dict(type='int'),
+                                  mtu=dict(type='int'),
+                                  onlink=dict(type='bool')
+                              )),
+        route_metric6=dict(type='int'),
+        method6=dict(type='str', choices=['ignore', 'auto', 'dhcp', 'link-local', 'manual', 'shared', 'disabled']),
+        ip_privacy6=dict(type='str', choices=['disabled', 'prefer-public-addr', 'prefer-temp-addr', 'unknown']),
+        addr_gen_mode6=dict(type='str', choices=['default', 'default-or-eui64', 'eui64', 'stable-privacy']),
+        # Bond Specific vars
+        mode=dict(type='str', default='balance-rr',
+                  choices=['802.3ad', 'active-backup', 'balance-alb', 'balance-rr', 'balance-tlb', 'balance-xor', 'broadcast']),
+        miimon=dict(type='int'),
+        downdelay=dict(type='int'),
+        updelay=dict(type='int'),
+        xmit_hash_policy=dict(type='str'),
+        fail_over_mac=dict(type='str', choices=['none', 'active', 'follow']),
+        arp_interval=dict(type='int'),
+        arp_ip_target=dict(type='str'),
+        primary=dict(type='str'),
+        # general usage
+        mtu=dict(type='int'),
+        mac=dict(type='str'),
+        zone=dict(type='str'),
+        # bridge specific vars
+        stp=dict(type='bool', default=True),
+        priority=dict(type='int', default=128),
+        slavepriority=dict(type='int', default=32),
+        forwarddelay=dict(type='int', default=15),
+        hellotime=dict(type='int', default=2),
+        maxage=dict(type='int', default=20),
+        ageingtime=dict(type='int', default=300),
+        hairpin=dict(type='bool', default=False),
+        path_cost=dict(type='int', default=100),
+        # team specific vars
+        runner=dict(type='str', default='roundrobin',
+                         choices=['broadcast', 'roundrobin', 'activebackup', 'loadbalance', 'lacp']),
+        # team active-backup runner specific options
+        runner_hwaddr_policy=dict(type='str', choices=['same_all', 'by_active', 'only_active']),
+        # team lacp runner specific options
+        runner_fast_rate=dict(type='bool'),
+        # vlan specific vars
+        vlanid=dict(type='int'),
+        vlandev=dict(type='str'),
+        flags=dict(type='str'),
+        ingress=dict(type='str'),
+        egress=dict(type='str'),
+        # vxlan specific vars
+        vxlan_id=dict(type='int'),
+        vxlan_local=dict(type='str'),
+        vxlan_remote=dict(type='str'),
+        # ip-tunnel specific vars
+        ip_tunnel_dev=dict(type='str'),
+        ip_tunnel_local=dict(type='str'),
+        ip_tunnel_remote=dict(type='str'),
+        # ip-tunnel type gre specific vars
+        ip_tunnel_input_key=dict(type='str', no_log=True),
+        ip_tunnel_output_key=dict(type='str', no_log=True),
+        # 802-11-wireless* specific vars
+        ssid=dict(type='str'),
+        wifi=dict(type='dict'),
+        wifi_sec=dict(type='dict', no_log=True),
+        gsm=dict(type='dict'),
+        macvlan=dict(type='dict', options=dict(
+                          mode=dict(type='int', choices=[1, 2, 3, 4, 5], required=True),
+                          parent=dict(type='str', required=True),
+                          promiscuous=dict(type='bool'),
+                          tap=dict(type='bool'))),
+        wireguard=dict(type='dict'),
+        vpn=dict(type='dict'),
+        transport_mode=dict(type='str', choices=['datagram', 'connected']),
+        sriov=dict(type='dict'),
+        table=dict(type='int'),
+    )
+    mutually_exclusive = [['never_default4', 'gw4'],
+                          ['routes4_extended', 'routes4'],
+                          ['routes6_extended', 'routes6']]
+    required_if = [("type", "wifi", [("ssid")])]
+
+    # The elements of connections take the same options, without defaults so that top-level values apply.
+    # They are completed and validated in manage_connections(), declaring them here registers their no_log values.
+    connection_spec = dict(
+        (key, dict((k, v) for k, v in spec.items() if k not in ('default', 'required')))
+        for key, spec in argument_spec.items())
+    connection_spec['conn_name']['required'] = True
+
+    # Parsing argument file
+    module = AnsibleModule(
+        argument_spec=dict(argument_spec, connections=dict(type='list', elements='dict', options=connection_spec,
+                                                           mutually_exclusive=mutually_exclusive)),
+        mutually_exclusive=mutually_exclusive + [['conn_name', 'connections']],
+        required_one_of=[['conn_name', 'connections']],
+        # The elements of connections are checked against required_if in manage_connections()
+        required_if=[("type", "wifi", ["ssid", "connections"], True)],
+        supports_check_mode=True,
+    )
+    module.run_command_environ_update = dict(LANG='C', LC_ALL='C', LC_MESSAGES='C', LC_CTYPE='C')
+
+    if module.params['connections'] is not None:
+        module.exit_json(**manage_connections(module, argument_spec, mutually_exclusive, required_if))
+
+    nmcli = Nmcli(module)
+    module.exit_json(**manage_connection(module, nmcli))
 
 
 if __name__ == '__main__':
@@ -606,7 +606,6 @@ EXAMPLES = r"""
 """
 
 import re
-import time
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.common.text.converters import to_native
@@ -1669,11 +1668,8 @@ class ProxmoxLxcAnsible(ProxmoxAnsible):
         if timeout_msg != "":
             timeout_msg = "%s " % timeout_msg
 
-        while timeout > 0:
-            if self.api_task_ok(node, taskid):
-                return
-            timeout -= 1
-            time.sleep(1)
+        if timeout > 0 and self.api_task_complete(node, taskid, timeout)[0]:
+            return
 
         self.module.fail_json(
             vmid=vmid,
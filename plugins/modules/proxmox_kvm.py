@@ -980,15 +980,10 @@ class ProxmoxKvmAnsible(ProxmoxAnsible):
             # Increase task timeout in case of stopped state to be sure it waits longer than VM stop operation itself
             timeout += 10
 
-        while timeout:
-            if self.api_task_ok(node, taskid):
-                # Wait an extra second as the API can be a ahead of the hypervisor
-                time.sleep(1)
-                return True
-            timeout = timeout - 1
-            if timeout == 0:
-                break
+        if timeout and self.api_task_complete(node, taskid, timeout)[0]:
+            # Wait an extra second as the API can be a ahead of the hypervisor
             time.sleep(1)
+            return True
         return False
 
     def create_vm(self, vmid, newid, node, name, memory, cpu, cores, sockets, update, update_unsafe, **kwargs):
@@ -190,27 +190,21 @@ class ProxmoxSnapAnsible(ProxmoxAnsible):
 
     def start_instance(self, vm, vmid, timeout):
         taskid = self.vmstatus(vm, vmid).start.post()
-        while timeout:
-            if self.api_task_ok(vm['node'], taskid):
-                return True
-            timeout -= 1
-            if timeout == 0:
-                self.module.fail_json(msg='Reached timeout while waiting for VM to start. Last line in task before timeout: %s' %
-                                      self.proxmox_api.nodes(vm['node']).tasks(taskid).log.get()[:1])
-            time.sleep(1)
-        return False
+        if not timeout:
+            return False
+        if not self.api_task_complete(vm['node'], taskid, timeout)[0]:
+            self.module.fail_json(msg='Reached timeout while waiting for VM to start. Last line in task before timeout: %s' %
+                                  self.proxmox_api.nodes(vm['node']).tasks(taskid).log.get()[:1])
+        return True
 
     def shutdown_instance(self, vm, vmid, timeout):
         taskid = self.vmstatus(vm, vmid).shutdown.post()
-        while timeout:
-            if self.api_task_ok(vm['node'], taskid):
-                return True
-            timeout -= 1
-            if timeout == 0:
-                self.module.fail_json(msg='Reached timeout while waiting for VM to stop. Last line in task before timeout: %s' %
-                                      self.proxmox_api.nodes(vm['node']).tasks(taskid).log.get()[:1])
-            time.sleep(1)
-        return False
+        if not timeout:
+            return False
+        if not self.api_task_complete(vm['node'], taskid, timeout)[0]:
+            self.module.fail_json(msg='Reached timeout while waiting for VM to stop. Last line in task before timeout: %s' %
+                                  self.proxmox_api.nodes(vm['node']).tasks(taskid).log.get()[:1])
+        return True
 
     def snapshot_retention(self, vm, vmid, retention):
         # ignore the last snapshot, which is the current state
@@ -245,52 +239,28 @@ class ProxmoxSnapAnsible(ProxmoxAnsible):
         else:
             taskid = self.snapshot(vm, vmid).post(snapname=snapname, description=description, vmstate=int(vmstate))
 
-        while timeout:
-            if self.api_task_ok(vm['node'], taskid):
-                break
-            if timeout == 0:
-                self.module.fail_json(msg='Reached timeout while waiting for creating VM snapshot. Last line in task before timeout: %s' %
-                                      self.proxmox_api.nodes(vm['node']).tasks(taskid).log.get()[:1])
-
-            time.sleep(1)
-            timeout -= 1
+        deadline = time.time() + timeout
+        success = timeout > 0 and self.api_task_complete(vm['node'], taskid, timeout)[0]
         if vm['type'] == 'lxc' and unbind is True and mountpoints:
-            self._container_mp_restore(vm, vmid, timeout, unbind, mountpoints, vmstatus)
+            # Restoring the container gets the rest of the timeout
+            self._container_mp_restore(vm, vmid, max(int(deadline - time.time()), 0), unbind, mountpoints, vmstatus)
 
         self.snapshot_retention(vm, vmid, retention)
-        return timeout > 0
+        return success
 
     def snapshot_remove(self, vm, vmid, timeout, snapname, force):
         if self.module.check_mode:
             return True
 
         taskid = self.snapshot(vm, vmid).delete(snapname, force=int(force))
-        while timeout:
-            if self.api_task_ok(vm['node'], taskid):
-                return True
-            if timeout == 0:
-                self.module.fail_json(msg='Reached timeout while waiting for removing VM snapshot. Last line in task before timeout: %s' %
-                                      self.proxmox_api.nodes(vm['node']).tasks(taskid).log.get()[:1])
-
-            time.sleep(1)
-            timeout -= 1
-        return False
+        return timeout > 0 and self.api_task_complete(vm['node'], taskid, timeout)[0]
 
     def snapshot_rollback(self, vm, vmid, timeout, snapname):
         if self.module.check_mode:
             return True
 
         taskid = self.snapshot(vm, vmid)(snapname).post("rollback")
-        while timeout:
-            if self.api_task_ok(vm['node'], taskid):
-                return True
-            if timeout == 0:
-                self.module.fail_json(msg='Reached timeout while waiting for rolling back VM snapshot. Last line in task before timeout: %s' %
-                                      self.proxmox_api.nodes(vm['node']).tasks(taskid).log.get()[:1])
-
-            time.sleep(1)
-            timeout -= 1
-        return False
+        return timeout > 0 and self.api_task_complete(vm['node'], taskid, timeout)[0]
 
 
 def main():
@@ -482,6 +482,9 @@ def main():
     # Build root URI
     root_uri = "https://" + module.params['baseuri']
     rf_utils = RedfishUtils(creds, root_uri, timeout, module, ciphers=ciphers)
+    # Nothing is modified by this module; the discovery of the resources and
+    # the commands of the different categories can share fetched resources
+    rf_utils.enable_get_cache()
 
     # Build Category list
     if "all" in module.params['category']:
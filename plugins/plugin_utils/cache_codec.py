@@ -0,0 +1,67 @@
+# Copyright (c) 2026 Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import zlib
+
+from ansible.errors import AnsibleError
+from ansible.module_utils.six import text_type
+from ansible.parsing.ajson import AnsibleJSONEncoder, AnsibleJSONDecoder
+
+try:
+    import lzma
+    HAS_LZMA = True
+except ImportError:
+    HAS_LZMA = False
+
+
+# The first byte of an encoded value marks the codec that was used. None of
+# these bytes can start a JSON document, so values written without a header
+# (by older versions of the cache plugins) are still decoded as plain JSON.
+_HEADER_JSON = b'\x01'
+_HEADER_ZLIB = b'\x02'
+_HEADER_LZMA = b'\x03'
+
+COMPRESSIONS = ('none', 'zlib', 'lzma')
+
+
+def check_compression(compression):
+    """Raise an AnsibleError if the compression cannot be used."""
+    if compression not in COMPRESSIONS:
+        raise AnsibleError("Unknown cache compression '%s', expected one of: %s" % (compression, ', '.join(COMPRESSIONS)))
+    if compression == 'lzma' and not HAS_LZMA:
+        raise AnsibleError("The 'lzma' python module is required to use the lzma cache compression")
+
+
+def encode_value(value, compression='none', compression_threshold=0):
+    """Serialize value to compact JSON, compressed with the given compression
+    if the JSON is at least compression_threshold bytes long, and prefixed
+    with the header byte of the codec."""
+    data = json.dumps(value, cls=AnsibleJSONEncoder, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    if compression == 'none' or len(data) < compression_threshold:
+        return _HEADER_JSON + data
+    if compression == 'zlib':
+        return _HEADER_ZLIB + zlib.compress(data)
+    if compression == 'lzma':
+        return _HEADER_LZMA + lzma.compress(data)
+    raise AnsibleError("Unknown cache compression '%s'" % compression)
+
+
+def decode_value(data):
+    """Deserialize a value written by encode_value, or a plain JSON document."""
+    if isinstance(data, text_type):
+        data = data.encode('utf-8')
+    header, payload = data[:1], data[1:]
+    if header == _HEADER_JSON:
+        data = payload
+    elif header == _HEADER_ZLIB:
+        data = zlib.decompress(payload)
+    elif header == _HEADER_LZMA:
+        if not HAS_LZMA:
+            raise AnsibleError("The 'lzma' python module is required to read this cache entry")
+        data = lzma.decompress(payload)
+    return json.loads(data.decode('utf-8'), cls=AnsibleJSONDecoder)
@@ -0,0 +1,145 @@
+# Copyright (c) 2026 Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import gzip
+import queue
+import threading
+import time
+
+
+_STOP = object()
+
+
+def gzip_payload(data):
+    """Compress a request body for a service accepting C(Content-Encoding: gzip)."""
+    if not isinstance(data, bytes):
+        data = data.encode('utf-8')
+    return gzip.compress(data)
+
+
+class EventShipper(object):
+    """Deliver serialized events to a remote service from a background thread.
+
+    Events queued with put() are collected into batches, which are handed to
+    send_batch (a callable taking a list of events) once max_events events or
+    max_bytes bytes have been collected, or flush_interval seconds after the
+    first event of the batch was queued. Failing batches are retried with an
+    exponential backoff. When the queue is full, events are dropped instead of
+    blocking the caller. close() sends all queued events before returning.
+    """
+
+    def __init__(self, send_batch, max_events=100, max_bytes=1048576, flush_interval=2.0,
+                 queue_size=10000, retries=3, retry_delay=1.0, display=None):
+        self._send_batch = send_batch
+        self._max_events = max(max_events, 1)
+        self._max_bytes = max_bytes
+        self._flush_interval = flush_interval
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._display = display
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.sent = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_options(cls, plugin, send_batch):
+        """Create a shipper configured by the batch_max_events, batch_max_bytes,
+        flush_interval, queue_size and retries options of a callback plugin."""
+        return cls(
+            send_batch,
+            max_events=plugin.get_option('batch_max_events'),
+            max_bytes=plugin.get_option('batch_max_bytes'),
+            flush_interval=plugin.get_option('flush_interval'),
+            queue_size=plugin.get_option('queue_size'),
+            retries=plugin.get_option('retries'),
+            display=plugin._display,
+        )
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='event-shipper')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def put(self, event, size=None):
+        """Queue an event. size is used to limit the size of a batch and
+        defaults to the length of the event."""
+        self.start()
+        try:
+            self._queue.put_nowait((event, len(event) if size is None else size))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def close(self, timeout=None):
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def report(self, name):
+        """Close the shipper and display how many events were sent and dropped."""
+        self.close()
+        if self._display is None:
+            return
+        msg = f'{name}: {self.sent} events sent, {self.dropped} events dropped'
+        if self.dropped:
+            self._display.warning(msg)
+        else:
+            self._display.display(msg)
+
+    def _run(self):
+        batch = []
+        size = 0
+        deadline = None
+        while True:
+            try:
+                if deadline is None:
+                    event = self._queue.get()
+                else:
+                    event = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                event = None
+
+            if event is not None and event is not _STOP:
+                event, event_size = event
+                if batch and size + event_size > self._max_bytes:
+                    self._flush(batch)
+                    batch, size, deadline = [], 0, None
+                batch.append(event)
+                size += event_size
+                if deadline is None:
+                    deadline = time.monotonic() + self._flush_interval
+                if len(batch) < self._max_events and size < self._max_bytes:
+                    continue
+
+            if batch:
+                self._flush(batch)
+                batch, size, deadline = [], 0, None
+            if event is _STOP:
+                return
+
+    def _flush(self, batch):
+        for attempt in range(self._retries + 1):
+            try:
+                self._send_batch(batch)
+            except Exception as e:
+                error = e
+                if attempt < self._retries:
+                    time.sleep(self._retry_delay * 2 ** attempt)
+            else:
+                with self._lock:
+                    self.sent += len(batch)
+                return
+
+        with self._lock:
+            self.dropped += len(batch)
+        if self._display is not None:
+            self._display.warning(f'Could not send {len(batch)} events after {self._retries + 1} attempts: {error}')
@@ -0,0 +1,114 @@
+# Copyright (c) 2026 Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import selectors
+import shlex
+import subprocess
+import uuid
+
+from ansible.module_utils.common.text.converters import to_bytes, to_text
+
+
+class PersistentShell(object):
+    """Run several commands through one long-lived shell process.
+
+    command is the argument list starting a POSIX shell that reads its script
+    from stdin, for example C(lxc exec instance -- /bin/sh). Each command given
+    to run() is executed by executable in a child process of that shell, with
+    stdin redirected from /dev/null, followed by markers on stdout and stderr
+    that frame its output and carry its exit status. The shell is started on
+    the first command, and again after it exited.
+    """
+
+    def __init__(self, command, executable='/bin/sh'):
+        self._command = command
+        self._executable = executable
+        self._process = None
+        self._buffers = {}
+
+    @property
+    def running(self):
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        self.close()
+        self._process = subprocess.Popen(self._command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self._buffers = {self._process.stdout: b'', self._process.stderr: b''}
+
+    def run(self, cmd):
+        """Run cmd and return its exit status, stdout and stderr as bytes.
+
+        If the shell exits before the command is finished, for example because
+        it could not be started, the exit status of the shell and everything it
+        wrote are returned instead, and the next command starts a new shell.
+        """
+        if not self.running:
+            self.start()
+
+        marker = uuid.uuid4().hex
+        script = (f'{self._executable} -c {shlex.quote(to_text(cmd, errors="surrogate_or_strict"))} </dev/null; '
+                  f'printf "\\n%d %s\\n" $? {marker}; printf "\\n%s\\n" {marker} >&2\n')
+
+        stdout_end = to_bytes(f' {marker}\n')
+        stderr_end = to_bytes(f'\n{marker}\n')
+        try:
+            self._process.stdin.write(to_bytes(script, errors='surrogate_or_strict'))
+            self._process.stdin.flush()
+            if self._read_until(stdout_end, stderr_end):
+                stdout, stderr = self._buffers[self._process.stdout], self._buffers[self._process.stderr]
+                stdout, self._buffers[self._process.stdout] = stdout.split(stdout_end, 1)
+                stdout, rc = stdout.rsplit(b'\n', 1)
+                stderr, self._buffers[self._process.stderr] = stderr.split(stderr_end, 1)
+                return int(rc), stdout, stderr
+        except (IOError, OSError):
+            # The shell exited, its output tells why
+            self._read_until(stdout_end, stderr_end)
+
+        stdout, stderr = self._buffers[self._process.stdout], self._buffers[self._process.stderr]
+        returncode = self._process.wait()
+        self.close()
+        return returncode, stdout, stderr
+
+    def _read_until(self, stdout_end, stderr_end):
+        """Read the output of the shell until both markers were received,
+        return False if the shell closed its output before."""
+        ends = {self._process.stdout: stdout_end, self._process.stderr: stderr_end}
+        complete = True
+        with selectors.DefaultSelector() as selector:
+            for stream, end in ends.items():
+                if end not in self._buffers[stream]:
+                    selector.register(stream, selectors.EVENT_READ)
+            while selector.get_map():
+                for key, dummy in selector.select():
+                    stream = key.fileobj
+                    chunk = os.read(stream.fileno(), 65536)
+                    if not chunk:
+                        selector.unregister(stream)
+                        complete = False
+                        continue
+                    self._buffers[stream] += chunk
+                    if ends[stream] in self._buffers[stream]:
+                        selector.unregister(stream)
+        return complete
+
+    def close(self):
+        """Stop the shell by closing its stdin."""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except (IOError, OSError):
+            pass
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
@@ -24,3 +24,141 @@ def test_redis_cachemodule():
     # The _uri option is required for the redis plugin
     connection = '[::1]:6379:1'
     assert isinstance(cache_loader.get('community.general.redis', **{'_uri': connection}), RedisCache)
+
+
+class FakeRedis(object):
+    def __init__(self, *args, **kwargs):
+        self.data = {}
+        self.zset = {}
+        self.commands = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def get(self, key):
+        self.commands.append('get')
+        return self.data.get(key)
+
+    def mget(self, keys):
+        self.commands.append('mget')
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value):
+        self.commands.append('set')
+        self.data[key] = value
+
+    def setex(self, key, timeout, value):
+        self.commands.append('setex')
+        self.data[key] = value
+
+    def delete(self, key):
+        self.commands.append('delete')
+        self.data.pop(key, None)
+
+    def zadd(self, name, mapping):
+        self.commands.append('zadd')
+        self.zset.update(mapping)
+
+    def zrem(self, name, key):
+        self.commands.append('zrem')
+        self.zset.pop(key, None)
+
+    def zrange(self, name, start, end):
+        self.commands.append('zrange')
+        return sorted(self.zset, key=self.zset.get)
+
+    def zrank(self, name, key):
+        self.commands.append('zrank')
+        return 0 if key in self.zset else None
+
+    def zremrangebyscore(self, name, min_score, max_score):
+        self.commands.append('zremrangebyscore')
+        for key, score in list(self.zset.items()):
+            if min_score <= score <= max_score:
+                del self.zset[key]
+
+
+class FakePipeline(object):
+    def __init__(self, db):
+        self.db = db
+        self.queued = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.queued.append((name, args))
+        return queue
+
+    def execute(self):
+        self.db.commands.append('execute')
+        return [getattr(self.db, name)(*args) for name, args in self.queued]
+
+
+@pytest.fixture
+def redis_cache(mocker):
+    mocker.patch('ansible_collections.community.general.plugins.cache.redis.StrictRedis', FakeRedis)
+
+    def get_cache(**kwargs):
+        kwargs.setdefault('_uri', '127.0.0.1:6379:1')
+        return cache_loader.get('community.general.redis', **kwargs)
+
+    return get_cache
+
+
+def test_redis_copy_uses_mget(redis_cache):
+    cache = redis_cache(_batch_size=2)
+    for host in ('host1', 'host2', 'host3'):
+        cache.set(host, {'name': host})
+
+    # read everything back from redis, not from the local cache
+    cache._cache.clear()
+    cache._db.commands = []
+    assert cache.copy() == {'host1': {'name': 'host1'}, 'host2': {'name': 'host2'}, 'host3': {'name': 'host3'}}
+    assert cache._db.commands.count('mget') == 2
+    assert 'get' not in cache._db.commands
+
+
+def test_redis_local_cache_size(redis_cache):
+    cache = redis_cache(_local_cache_size=2)
+    for host in ('host1', 'host2', 'host3'):
+        cache.set(host, {'name': host})
+    assert list(cache._cache) == ['host2', 'host3']
+
+    # evicted records are read again from redis
+    cache._db.commands = []
+    assert cache.get('host1') == {'name': 'host1'}
+    assert cache._db.commands == ['get']
+    assert list(cache._cache) == ['host3', 'host1']
+
+
+def test_redis_local_cache_size_default(redis_cache):
+    cache = redis_cache()
+    assert cache._local_cache_size == 5000
+
+    cache = redis_cache(_local_cache_size=0)
+    for index in range(10):
+        cache.set('host%d' % index, {'name': index})
+    assert len(cache._cache) == 10
+
+
+def test_redis_expire_interval(redis_cache):
+    cache = redis_cache(_expire_interval=3600)
+    cache.set('host1', {'name': 'host1'})
+    assert cache.contains('host1')
+    assert cache.contains('host1')
+    assert list(cache.keys()) == ['host1']
+    assert cache._db.commands.count('zremrangebyscore') == 1
+
+
+def test_redis_compression(redis_cache):
+    cache = redis_cache(_compression='zlib', _compression_threshold=0)
+    cache.set('host1', {'name': 'host1'})
+    assert cache._db.data['ansible_factshost1'].startswith(b'\x02')
+
+    cache._cache.clear()
+    assert cache.get('host1') == {'name': 'host1'}
+
+
+def test_redis_legacy_value(redis_cache):
+    cache = redis_cache()
+    cache._db.data['ansible_factshost1'] = b'{\n    "name": "host1"\n}'
+    assert cache.get('host1') == {'name': 'host1'}
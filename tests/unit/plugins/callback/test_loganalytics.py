@@ -9,6 +9,7 @@ from ansible.executor.task_result import TaskResult
 from ansible_collections.community.general.tests.unit.compat import unittest
 from ansible_collections.community.general.tests.unit.compat.mock import patch, Mock
 from ansible_collections.community.general.plugins.callback.loganalytics import AzureLogAnalyticsSource
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper
 
 from datetime import datetime
 import json
@@ -64,3 +65,25 @@ class TestAzureLogAnalytics(unittest.TestCase):
 
         self.assertRegex(headers['Authorization'], r'^SharedKey 01234567-0123-0123-0123-01234567890a:.*=$')
         self.assertEqual(headers['Log-Type'], 'ansible_playbook')
+
+    @patch('ansible_collections.community.general.plugins.callback.loganalytics.now')
+    @patch('ansible_collections.community.general.plugins.callback.loganalytics.open_url')
+    def test_async_delivery(self, open_url_mock, mock_now):
+        mock_now.return_value = datetime(2020, 12, 1)
+        workspace_id = '01234567-0123-0123-0123-01234567890a'
+        shared_key = 'dZD0kCbKl3ehZG6LHFMuhtE0yHiFCmetzFMc2u+roXIUQuatqU924SsAAAAPemhjbGlAemhjbGktTUJQAQIDBA=='
+        self.loganalytics.shipper = EventShipper(
+            lambda events: self.loganalytics.post(workspace_id, shared_key, '[%s]' % ','.join(events)),
+            flush_interval=60)
+
+        for state in ('OK', 'FAILED'):
+            result = TaskResult(host=self.mock_host, task=self.mock_task, return_data={}, task_fields={'args': {}})
+            self.loganalytics.send_event(workspace_id=workspace_id, shared_key=shared_key, state=state, result=result, runtime=100)
+        self.loganalytics.shipper.close()
+
+        self.assertEqual(open_url_mock.call_count, 1)
+        args, kwargs = open_url_mock.call_args
+        sent_data = json.loads(args[1])
+        self.assertEqual([record['event']['status'] for record in sent_data], ['OK', 'FAILED'])
+        self.assertRegex(kwargs['headers']['Authorization'], r'^SharedKey 01234567-0123-0123-0123-01234567890a:.*=$')
+        self.assertEqual(self.loganalytics.shipper.sent, 2)
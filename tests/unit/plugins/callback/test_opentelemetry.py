@@ -14,6 +14,11 @@ from ansible_collections.community.general.plugins.callback.opentelemetry import
 from collections import OrderedDict
 import sys
 
+try:
+    from opentelemetry.trace.status import Status, StatusCode
+except ImportError:
+    pass
+
 OPENTELEMETRY_MINIMUM_PYTHON_VERSION = (3, 7)
 
 
@@ -112,6 +117,31 @@ class TestOpentelemetry(unittest.TestCase):
 
         self.assertEqual(self.opentelemetry.ansible_version, '1.2.3')
 
+    def test_export_task(self):
+        task = TaskData('myuuid', 'mytask', '/mypath', 'myplay', 'myaction', {})
+        tasks_data = OrderedDict()
+        tasks_data['myuuid'] = task
+        self.opentelemetry.finish_task(
+            tasks_data,
+            'ok',
+            self.my_task_result,
+            ""
+        )
+
+        self.opentelemetry.start_trace('ansible', 'myplaybook', task.start, None, 'grpc', '/tmp/spans.json')
+        self.opentelemetry.export_task(task, False, False)
+
+        # the host data is released as soon as the spans are created
+        self.assertEqual(task.host_data, OrderedDict())
+        spans = self.opentelemetry.otel_exporter.get_finished_spans()
+        self.assertEqual([span.name for span in spans], ['mytask'])
+        self.assertEqual(spans[0].attributes['ansible.task.host.name'], 'myhost')
+
+        self.opentelemetry.end_trace(Status(status_code=StatusCode.OK))
+        spans = self.opentelemetry.otel_exporter.get_finished_spans()
+        self.assertEqual([span.name for span in spans], ['mytask', 'myplaybook'])
+        self.assertEqual(spans[0].parent.span_id, spans[1].context.span_id)
+
     def test_get_error_message(self):
         test_cases = (
             ('my-exception', 'my-msg', None, 'my-exception'),
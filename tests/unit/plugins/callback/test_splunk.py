@@ -9,9 +9,24 @@ from ansible.executor.task_result import TaskResult
 from ansible_collections.community.general.tests.unit.compat import unittest
 from ansible_collections.community.general.tests.unit.compat.mock import patch, Mock
 from ansible_collections.community.general.plugins.callback.splunk import SplunkHTTPCollectorSource
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
 
 import json
+import threading
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.requests.append((self.headers['Authorization'], body.decode('utf-8')))
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'{"text":"Success","code":0}')
+
+    def log_message(self, format, *args):
+        pass
 
 
 class TestSplunkClient(unittest.TestCase):
@@ -62,3 +77,49 @@ class TestSplunkClient(unittest.TestCase):
         self.assertEqual(sent_data['event']['timestamp'], '2020-12-01 00:00:00 +0000')
         self.assertEqual(sent_data['event']['host'], 'my-host')
         self.assertEqual(sent_data['event']['ip_address'], '1.2.3.4')
+
+
+class TestSplunkAsyncDelivery(unittest.TestCase):
+    @patch('ansible_collections.community.general.plugins.callback.splunk.socket')
+    def setUp(self, mock_socket):
+        mock_socket.gethostname.return_value = 'my-host'
+        mock_socket.gethostbyname.return_value = '1.2.3.4'
+        self.splunk = SplunkHTTPCollectorSource()
+        self.mock_task = Mock('MockTask')
+        self.mock_task._role = 'myrole'
+        self.mock_task._uuid = 'myuuid'
+        self.mock_host = Mock('MockHost')
+        self.mock_host.name = 'myhost'
+
+        self.server = HTTPServer(('127.0.0.1', 0), CollectorHandler)
+        self.server.requests = []
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.start()
+        self.url = 'http://127.0.0.1:%d/services/collector/event' % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server_thread.join()
+        self.server.server_close()
+
+    def test_events_are_batched(self):
+        self.splunk.shipper = EventShipper(
+            lambda events: self.splunk.post(self.url, 'token', False, '\n'.join(events)),
+            max_events=2, flush_interval=60,
+        )
+        for i in range(5):
+            result = TaskResult(host=self.mock_host, task=self.mock_task, return_data={'index': i}, task_fields={'args': {}})
+            self.splunk.send_event(
+                url=self.url, authtoken='token', validate_certs=False, include_milliseconds=False,
+                batch=None, state='OK', result=result, runtime=100
+            )
+        self.splunk.shipper.close()
+
+        self.assertEqual(len(self.server.requests), 3)
+        events = []
+        for authorization, body in self.server.requests:
+            self.assertEqual(authorization, 'Splunk token')
+            events.extend(json.loads(line) for line in body.split('\n'))
+        self.assertEqual([event['event']['ansible_result']['index'] for event in events], [0, 1, 2, 3, 4])
+        self.assertEqual(self.splunk.shipper.sent, 5)
+        self.assertEqual(self.splunk.shipper.dropped, 0)
@@ -0,0 +1,87 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+
+import pytest
+
+from io import StringIO
+
+from ansible.playbook.play_context import PlayContext
+from ansible.plugins.loader import connection_loader
+from ansible_collections.community.general.tests.unit.compat import mock
+
+
+@pytest.fixture
+def chroot(tmp_path):
+    root = tmp_path / 'root'
+    (root / 'bin').mkdir(parents=True)
+    (root / 'bin' / 'sh').write_bytes(b'')
+    (root / 'bin' / 'sh').chmod(0o755)
+    (root / 'tmp').mkdir()
+    return root
+
+
+@pytest.fixture
+def conn(chroot):
+    play_context = PlayContext()
+    play_context.remote_addr = str(chroot)
+    conn = connection_loader.get('community.general.chroot', play_context, StringIO())
+    conn.set_options(direct={'disable_root_check': True, 'direct_transfer': True})
+    conn._connected = True
+    conn.chroot_cmd = 'chroot'
+    return conn
+
+
+@pytest.fixture
+def dd(conn):
+    process = mock.MagicMock(returncode=0)
+    process.communicate.return_value = (b'', b'')
+    process.stdout.read.return_value = b''
+    with mock.patch.object(conn, '_buffered_exec_command', return_value=process) as exec_command:
+        yield exec_command
+
+
+def test_put_and_fetch_direct(conn, dd, chroot, tmp_path):
+    src = tmp_path / 'payload'
+    src.write_bytes(b'x' * 100000)
+    (chroot / 'tmp' / 'module.py').write_bytes(b'y' * 200000)
+
+    conn.put_file(str(src), '/tmp/module.py')
+    assert (chroot / 'tmp' / 'module.py').read_bytes() == b'x' * 100000
+
+    conn.fetch_file('tmp/module.py', str(tmp_path / 'fetched'))
+    assert (tmp_path / 'fetched').read_bytes() == b'x' * 100000
+    dd.assert_not_called()
+
+
+def test_symlinks_use_dd(conn, dd, chroot, tmp_path):
+    outside = tmp_path / 'outside'
+    outside.mkdir()
+    (outside / 'secret').write_bytes(b'secret')
+    os.symlink(str(outside), str(chroot / 'escape'))
+    os.symlink(str(outside / 'secret'), str(chroot / 'tmp' / 'link'))
+    src = tmp_path / 'payload'
+    src.write_bytes(b'payload')
+
+    conn.put_file(str(src), '/escape/secret')
+    conn.put_file(str(src), '/tmp/link')
+    conn.fetch_file('/escape/secret', str(tmp_path / 'fetched'))
+    conn.fetch_file('/tmp/../escape/secret', str(tmp_path / 'fetched'))
+
+    assert (outside / 'secret').read_bytes() == b'secret'
+    assert [call[0][0].split()[1] for call in dd.call_args_list] == ['of=/escape/secret', 'of=/tmp/link', 'if=/escape/secret', 'if=/escape/secret']
+
+
+def test_direct_transfer_disabled(conn, dd, chroot, tmp_path):
+    conn.set_option('direct_transfer', False)
+    src = tmp_path / 'payload'
+    src.write_bytes(b'payload')
+
+    conn.put_file(str(src), '/tmp/module.py')
+    assert not (chroot / 'tmp' / 'module.py').exists()
+    assert dd.call_count == 1
@@ -0,0 +1,75 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+
+from io import StringIO
+
+from ansible.playbook.play_context import PlayContext
+from ansible.plugins.loader import connection_loader
+from ansible_collections.community.general.plugins.connection import incus
+from ansible_collections.community.general.tests.unit.compat import mock
+
+
+@pytest.fixture
+def conn():
+    play_context = PlayContext()
+    play_context.remote_addr = 'instance'
+    with mock.patch.object(incus, 'get_bin_path', return_value='/usr/bin/incus'):
+        conn = connection_loader.get('community.general.incus', play_context, StringIO())
+    conn.set_options(direct={'persistent_shell': True})
+    conn._connected = True
+    return conn
+
+
+@pytest.fixture
+def shell():
+    with mock.patch.object(incus, 'PersistentShell') as persistent_shell:
+        persistent_shell.return_value.run.return_value = (0, b'out', b'')
+        yield persistent_shell
+
+
+@pytest.fixture
+def popen():
+    with mock.patch.object(incus, 'Popen') as popen:
+        popen.return_value.communicate.return_value = (b'piped', b'')
+        popen.return_value.returncode = 0
+        yield popen
+
+
+def test_persistent_shell(conn, shell, popen):
+    assert conn.exec_command('echo one') == (0, 'out', '')
+    assert conn.exec_command('echo two') == (0, 'out', '')
+    assert shell.call_count == 1
+    assert shell.call_args[0][0][-1] == b'/bin/sh'
+    assert shell.return_value.run.call_args_list == [mock.call('echo one'), mock.call('echo two')]
+    assert not popen.called
+
+    # commands with input data get their own exec
+    assert conn.exec_command('/usr/bin/python', in_data=b'module') == (0, 'piped', '')
+    assert popen.call_count == 1
+    assert popen.call_args[0][0][-3:] == [b'/bin/sh', b'-c', b'/usr/bin/python']
+    popen.return_value.communicate.assert_called_once_with(b'module')
+    assert shell.return_value.run.call_count == 2
+
+    conn.close()
+    shell.return_value.close.assert_called_once_with()
+    assert conn._shell_process is None
+
+
+def test_without_persistent_shell(conn, shell, popen):
+    conn.set_options(direct={'persistent_shell': False})
+    assert conn.exec_command('echo one') == (0, 'piped', '')
+    assert popen.call_args[0][0][-3:] == [b'/bin/sh', b'-c', b'echo one']
+    assert not shell.called
+
+
+def test_remote_uid_gid_cached(conn):
+    with mock.patch.object(conn, 'exec_command', return_value=(0, '1000\n1001\n', '')) as exec_command:
+        assert conn._get_remote_uid_gid() == (1000, 1001)
+        assert conn._get_remote_uid_gid() == (1000, 1001)
+    exec_command.assert_called_once_with('/bin/id -u && /bin/id -g')
@@ -7,6 +7,7 @@
 from __future__ import (annotations, absolute_import, division, print_function)
 __metaclass__ = type
 
+import gzip
 import os
 import pytest
 
@@ -304,16 +305,85 @@ def test_exec_command_with_privilege_escalation(mock_ssh, connection):
     mock_channel.sendall.assert_called_once_with(b'sudo_password\n')
 
 
-def test_put_file(connection):
+class FakeChannel:
+    """ Channel running the command of a transfer against in memory data """
+
+    def __init__(self, stdout=b'', returncode=0):
+        self.sent = b''
+        self.stdout = stdout
+        self.returncode = returncode
+        self.write_shutdown = False
+        self.exec_command = MagicMock()
+
+    def sendall(self, data):
+        self.sent += data
+
+    def shutdown_write(self):
+        self.write_shutdown = True
+
+    def recv(self, size):
+        chunk, self.stdout = self.stdout[:size], self.stdout[size:]
+        return chunk
+
+    def makefile(self, mode, bufsize):
+        return [self.recv(len(self.stdout))]
+
+    def makefile_stderr(self, mode, bufsize):
+        return [b'']
+
+    def recv_exit_status(self):
+        return self.returncode
+
+
+@pytest.fixture
+def transfer_channel(connection):
+    channel = FakeChannel()
+    connection._connected = True
+    connection.ssh = MagicMock()
+    connection.ssh.get_transport.return_value.open_session.return_value = channel
+    connection.set_option('vmid', 100)
+    return channel
+
+
+def test_put_file(connection, transfer_channel, tmp_path):
     """ Test putting a file to the remote system """
-    connection.exec_command = MagicMock()
-    connection.exec_command.return_value = (0, b"", b"")
+    content = os.urandom(200000)
+    (tmp_path / 'local').write_bytes(content)
 
-    with patch('builtins.open', create=True) as mock_open:
-        mock_open.return_value.__enter__.return_value.read.return_value = b'test content'
-        connection.put_file('/local/path', '/remote/path')
+    connection.put_file(str(tmp_path / 'local'), '/remote/path')
 
-    connection.exec_command.assert_called_once_with("/bin/sh -c 'cat > /remote/path'", in_data=b'test content', sudoable=False)
+    transfer_channel.exec_command.assert_called_once_with(b"/usr/sbin/pct exec 100 -- /bin/sh -c 'cat > /remote/path'")
+    assert transfer_channel.sent == content
+    assert transfer_channel.write_shutdown
+
+
+def test_put_file_compressed(connection, transfer_channel, tmp_path):
+    """ Test putting a file compressed with gzip """
+    content = b'test content\n' * 10000
+    (tmp_path / 'local').write_bytes(content)
+    connection.set_option('transfer_compression', 'gzip')
+
+    connection.put_file(str(tmp_path / 'local'), '/remote/path')
+
+    transfer_channel.exec_command.assert_called_once_with(b"/usr/sbin/pct exec 100 -- /bin/sh -c 'gzip -dc > /remote/path'")
+    assert len(transfer_channel.sent) < len(content) / 10
+    assert gzip.decompress(transfer_channel.sent) == content
+
+
+def test_put_file_pct_push(connection, transfer_channel, tmp_path):
+    """ Test putting a file through a temporary file on the Proxmox host """
+    (tmp_path / 'small').write_bytes(b'x' * 10)
+    (tmp_path / 'large').write_bytes(b'x' * 100)
+    connection.set_option('pct_transfer_threshold', 100)
+    connection.set_option('remote_user', 'ansible')
+
+    connection.put_file(str(tmp_path / 'small'), '/remote/path')
+    connection.put_file(str(tmp_path / 'large'), '/remote/path')
+
+    commands = [call.args[0] for call in transfer_channel.exec_command.call_args_list]
+    assert commands[0] == b"sudo /usr/sbin/pct exec 100 -- /bin/sh -c 'cat > /remote/path'"
+    assert commands[1] == b"/bin/sh -c 'tmp=$(mktemp) || exit 1; trap '\"'\"'rm -f \"$tmp\"'\"'\"' EXIT; " \
+                          b"cat > \"$tmp\" && sudo /usr/sbin/pct push 100 \"$tmp\" /remote/path'"
 
 
 @patch('paramiko.SSHClient')
@@ -350,6 +420,7 @@ def test_put_file_cat_not_found(mock_ssh, connection):
     mock_channel.recv_exit_status.return_value = 1
     mock_channel.makefile.return_value = [to_bytes("")]
     mock_channel.makefile_stderr.return_value = [to_bytes('cat: not found')]
+    mock_channel.recv.return_value = b''
 
     connection._connected = True
     connection.ssh = mock_client
@@ -358,16 +429,30 @@ def test_put_file_cat_not_found(mock_ssh, connection):
         connection.fetch_file('/remote/path', '/local/path')
 
 
-def test_fetch_file(connection):
+def test_fetch_file(connection, transfer_channel, tmp_path):
     """ Test fetching a file from the remote system """
-    connection.exec_command = MagicMock()
-    connection.exec_command.return_value = (0, b'test content', b"")
+    content = os.urandom(200000)
+    transfer_channel.stdout = content
 
-    with patch('builtins.open', create=True) as mock_open:
-        connection.fetch_file('/remote/path', '/local/path')
+    connection.fetch_file('/remote/path', str(tmp_path / 'local'))
+
+    transfer_channel.exec_command.assert_called_once_with(b"/usr/sbin/pct exec 100 -- /bin/sh -c 'cat /remote/path'")
+    assert (tmp_path / 'local').read_bytes() == content
+
+
+def test_fetch_file_pct_pull_compressed(connection, transfer_channel, tmp_path):
+    """ Test fetching a compressed file through a temporary file on the Proxmox host """
+    content = b'test content\n' * 10000
+    transfer_channel.stdout = gzip.compress(content)
+    connection.set_option('transfer_compression', 'gzip')
+    connection.set_option('pct_transfer_threshold', 1048576)
+
+    connection.fetch_file('/remote/path', str(tmp_path / 'local'))
 
-    connection.exec_command.assert_called_once_with("/bin/sh -c 'cat /remote/path'", sudoable=False)
-    mock_open.assert_called_with('/local/path', 'wb')
+    command = transfer_channel.exec_command.call_args.args[0]
+    assert command == b"/bin/sh -c 'tmp=$(mktemp) || exit 1; trap '\"'\"'rm -f \"$tmp\"'\"'\"' EXIT; " \
+                      b"/usr/sbin/pct pull 100 /remote/path \"$tmp\" && gzip -c \"$tmp\"'"
+    assert (tmp_path / 'local').read_bytes() == content
 
 
 @patch('paramiko.SSHClient')
@@ -404,6 +489,7 @@ def test_fetch_file_cat_not_found(mock_ssh, connection):
     mock_channel.recv_exit_status.return_value = 1
     mock_channel.makefile.return_value = [to_bytes("")]
     mock_channel.makefile_stderr.return_value = [to_bytes('cat: not found')]
+    mock_channel.recv.return_value = b''
 
     connection._connected = True
     connection.ssh = mock_client
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import time
+
+from ansible_collections.community.general.tests.unit.compat import unittest
+from ansible_collections.community.general.tests.unit.compat.mock import patch
+from ansible_collections.community.general.plugins.filter import lists
+from ansible_collections.community.general.plugins.filter.lists import (
+    lists_difference,
+    lists_intersect,
+    lists_symmetric_difference,
+    lists_union,
+    remove_duplicates,
+)
+
+
+class Unfreezable(object):
+    __hash__ = None
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Unfreezable) and self.value == other.value
+
+
+class CountingDict(dict):
+    comparisons = 0
+
+    def __eq__(self, other):
+        CountingDict.comparisons += 1
+        return dict.__eq__(self, other)
+
+    __hash__ = None
+
+
+class TestFilterLists(unittest.TestCase):
+
+    a = [{'name': 'a', 'ports': [22, 80]}, {'name': 'b', 'tags': {'x': 1}}, [1, 2], {'name': 'a', 'ports': [22, 80]}]
+    b = [{'tags': {'x': True}, 'name': 'b'}, (1, 2), [1, 2], {'name': 'c'}]
+
+    def test_remove_duplicates(self):
+        self.assertEqual(remove_duplicates([3, 1, 3, {'a': [1]}, 2, {'a': [1]}, 1]), [3, 1, {'a': [1]}, 2])
+
+    def test_unhashable_elements(self):
+        self.assertEqual(lists_union(self.a, self.b),
+                         [{'name': 'a', 'ports': [22, 80]}, {'name': 'b', 'tags': {'x': 1}}, [1, 2], (1, 2), {'name': 'c'}])
+        self.assertEqual(lists_intersect(self.a, self.b), [{'name': 'b', 'tags': {'x': 1}}, [1, 2]])
+        self.assertEqual(lists_difference(self.a, self.b), [{'name': 'a', 'ports': [22, 80]}])
+        self.assertEqual(lists_symmetric_difference(self.a, self.b), [{'name': 'a', 'ports': [22, 80]}, (1, 2), {'name': 'c'}])
+
+    def test_unfreezable_elements(self):
+        a = [Unfreezable(1), Unfreezable(2), Unfreezable(1)]
+        b = [Unfreezable(2), Unfreezable(3)]
+        self.assertEqual(lists_union(a, b), [Unfreezable(1), Unfreezable(2), Unfreezable(3)])
+        self.assertEqual(lists_intersect(a, b), [Unfreezable(2)])
+        self.assertEqual(lists_difference(a, b), [Unfreezable(1)])
+        self.assertEqual(lists_symmetric_difference(a, b), [Unfreezable(1), Unfreezable(3)])
+
+    def test_large_lists_of_dicts(self):
+        # Comparing the elements pairwise would take about 10^9 dict comparisons
+        a = [{'host': 'host%d' % i, 'rules': [{'port': i % 1000}]} for i in range(20000)]
+        b = [{'host': 'host%d' % i, 'rules': [{'port': i % 1000}]} for i in range(10000, 30000)]
+
+        self.assertEqual(len(lists_union(a, b)), 30000)
+        self.assertEqual(len(lists_intersect(a, b)), 10000)
+        self.assertEqual(len(lists_difference(a, b)), 10000)
+        self.assertEqual(len(lists_symmetric_difference(a, b)), 20000)
+
+    def test_frozen_values_are_not_compared_pairwise(self):
+        # A value that cannot be frozen makes the filters fall back to comparing the elements pairwise
+        a = [CountingDict(host='host%d' % i) for i in range(10)]
+        b = [CountingDict(host='host%d' % i) for i in range(5, 15)]
+        for extra, pairwise in (([], False), ([Unfreezable(0)], True)):
+            CountingDict.comparisons = 0
+            lists_union(a + extra, b)
+            lists_intersect(a + extra, b)
+            lists_difference(a + extra, b)
+            lists_symmetric_difference(a + extra, b)
+            self.assertEqual(CountingDict.comparisons > 0, pairwise)
+
+    @unittest.skipUnless(os.environ.get('COMMUNITY_GENERAL_BENCHMARK'), 'set COMMUNITY_GENERAL_BENCHMARK=1 to run benchmarks')
+    def test_benchmark(self):
+        """Print the time the four filters take on lists of dicts, with and without freezing the elements.
+
+        Run with 'COMMUNITY_GENERAL_BENCHMARK=1 pytest -s'. Without freezing, the filters compare the elements
+        pairwise as before, which is skipped for the largest size as it would take hours.
+        """
+        def run(a, b):
+            start = time.time()
+            lists_union(a, b)
+            lists_intersect(a, b)
+            lists_difference(a, b)
+            lists_symmetric_difference(a, b)
+            return time.time() - start
+
+        def unfreezable(item):
+            raise TypeError('unhashable')
+
+        for size in (1000, 5000, 100000):
+            a = [{'host': 'host%d' % i, 'rules': [{'port': i % 1000}]} for i in range(size)]
+            b = [{'host': 'host%d' % i, 'rules': [{'port': i % 1000}]} for i in range(size // 2, size + size // 2)]
+            frozen = run(a, b)
+            if size > 5000:
+                print('%d dicts: frozen %.3fs, pairwise skipped' % (size, frozen))
+                continue
+            with patch.object(lists, '_freeze', side_effect=unfreezable):
+                pairwise = run(a, b)
+            print('%d dicts: frozen %.3fs, pairwise %.3fs' % (size, frozen, pairwise))
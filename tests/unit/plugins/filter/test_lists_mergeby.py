@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import random
+from collections import defaultdict
+from operator import itemgetter
+
+from ansible.utils.vars import merge_hash
+from ansible_collections.community.general.tests.unit.compat import unittest
+from ansible_collections.community.general.plugins.filter.lists_mergeby import lists_mergeby
+
+
+LIST_MERGE = ('replace', 'keep', 'append', 'prepend', 'append_rp', 'prepend_rp')
+
+
+def pairwise_list_mergeby(x, y, index, recursive, list_merge):
+    # Copy of the former list_mergeby, merging two lists at a time
+    d = defaultdict(dict)
+    for lst in (x, y):
+        for elem in lst:
+            if index in elem.keys():
+                d[elem[index]].update(merge_hash(d[elem[index]], elem, recursive, list_merge))
+    return sorted(d.values(), key=itemgetter(index))
+
+
+def pairwise_mergeby(lists, index, recursive, list_merge):
+    # The former lists_mergeby, folding the lists from the one with the highest priority
+    result = lists[-1]
+    for lst in reversed(lists[:-1]):
+        result = pairwise_list_mergeby(lst, result, index, recursive, list_merge)
+    return result
+
+
+class TestFilterListsMergeby(unittest.TestCase):
+
+    def random_value(self, rng, depth=0):
+        choice = rng.random()
+        if choice < 0.3:
+            return rng.choice([1, 2, 'x'])
+        if choice < 0.6 or depth > 2:
+            return [rng.choice([1, 2, 3]) for dummy in range(rng.randint(0, 2))]
+        return dict((rng.choice('pqr'), self.random_value(rng, depth + 1)) for dummy in range(rng.randint(0, 2)))
+
+    def random_list(self, rng):
+        result = []
+        for dummy in range(rng.randint(0, 4)):
+            elem = {'index': rng.choice('abcd')}
+            for dummy in range(rng.randint(0, 3)):
+                elem[rng.choice('fgh')] = self.random_value(rng)
+            result.append(elem)
+        return result
+
+    def test_equal_lists(self):
+        # merge_hash does not append lists that are equal, so the grouping of the merges matters
+        list1 = [{'index': 'a', 'foo': [1]}]
+        list2 = [{'index': 'a', 'foo': [1]}]
+        list3 = [{'index': 'a', 'foo': [2]}]
+        self.assertEqual(lists_mergeby([list1, list2, list3], 'index', list_merge='append'),
+                         [{'index': 'a', 'foo': [1, 1, 2]}])
+
+    def test_same_result_as_pairwise_merge(self):
+        rng = random.Random(42)
+        for dummy in range(500):
+            lists = [self.random_list(rng) for dummy in range(rng.randint(2, 5))]
+            for recursive in (False, True):
+                for list_merge in LIST_MERGE:
+                    expected = pairwise_mergeby(lists, 'index', recursive, list_merge)
+                    result = lists_mergeby(lists, 'index', recursive=recursive, list_merge=list_merge)
+                    # Also compare the order of the keys
+                    self.assertEqual(json.dumps(result), json.dumps(expected))
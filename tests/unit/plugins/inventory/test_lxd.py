@@ -104,3 +104,46 @@ def test_build_inventory_groups_with_no_groupselection(inventory):
         if generated_data[key] != value:
             eq = False
     assert eq
+
+
+class FakeLXDSocket(object):
+    """Serve the instances of the test data like the LXD API."""
+
+    def __init__(self, data):
+        self.instances = data['instances']
+        self.requests = []
+
+    def do(self, method, url):
+        self.requests.append(url)
+        path = url.split('?')[0]
+        if path == '/1.0/instances':
+            metadata = []
+            for instance in self.instances.values():
+                full = dict(instance['instances']['metadata'], state=instance['state']['metadata'], snapshots=None, backups=None)
+                metadata.append(full)
+            return {'type': 'sync', 'status': 'Success', 'status_code': 200, 'metadata': metadata}
+        name, dummy, branch = path[len('/1.0/instances/'):].partition('/')
+        return {'type': 'sync', 'status': 'Success', 'status_code': 200,
+                'metadata': self.instances[name]['state' if branch else 'instances']['metadata']}
+
+
+def test_get_instance_data_recursive(inventory):
+    """Fetching all instances with recursion=2 creates the same data as fetching them one by one."""
+    expected = inventory.data['instances']
+    socket = FakeLXDSocket(inventory.data)
+    inventory.project = 'default'
+
+    inventory.data = {}
+    inventory.socket = socket
+    inventory.get_instance_data(list(expected))
+    one_by_one = inventory.data['instances']
+    assert len(socket.requests) == 2 * len(expected)
+
+    socket.requests = []
+    inventory.data = {}
+    inventory.get_instance_data_recursive()
+    assert socket.requests == ['/1.0/instances?recursion=2&project=default']
+    assert inventory.data['instances'] == one_by_one
+    for name, instance in expected.items():
+        assert inventory.data['instances'][name]['instances']['metadata'] == instance['instances']['metadata']
+        assert inventory.data['instances'][name]['state']['metadata'] == instance['state']['metadata']
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import threading
+import time
+
+import pytest
+
+from ansible_collections.community.general.plugins.inventory.nmap import InventoryModule
+
+
+XML_OUTPUT = b'''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE nmaprun>
+<nmaprun scanner="nmap" args="nmap -oX - 192.168.0.0/24" start="1700000000" version="7.94">
+<scaninfo type="connect" protocol="tcp" numservices="1000" services="1-1000"/>
+<host starttime="1700000000" endtime="1700000001"><status state="up" reason="conn-refused" reason_ttl="0"/>
+<address addr="192.168.0.1" addrtype="ipv4"/>
+<hostnames><hostname name="router.example.com" type="PTR"/></hostnames>
+<ports><extraports state="closed" count="998"/>
+<port protocol="tcp" portid="22"><state state="open" reason="syn-ack" reason_ttl="0"/><service name="ssh" method="table" conf="3"/></port>
+<port protocol="tcp" portid="8443"><state state="open" reason="syn-ack" reason_ttl="0"/></port>
+</ports>
+</host>
+<host starttime="1700000000" endtime="1700000001"><status state="up" reason="conn-refused" reason_ttl="0"/>
+<address addr="192.168.0.2" addrtype="ipv4"/>
+<address addr="00:11:22:33:44:55" addrtype="mac"/>
+<hostnames><hostname name="2.0.168.192.in-addr.arpa" type="PTR"/></hostnames>
+</host>
+<host><status state="down" reason="no-response" reason_ttl="0"/>
+<address addr="192.168.0.3" addrtype="ipv4"/>
+</host>
+<runstats><finished time="1700000002" elapsed="2.00" exit="success"/><hosts up="2" down="1" total="3"/></runstats>
+</nmaprun>
+'''
+
+
+@pytest.fixture
+def inventory():
+    inv = InventoryModule()
+    inv._options = {
+        'shard_prefix_length': None,
+        'max_parallel_scans': 2,
+        'xml_output': True,
+    }
+    return inv
+
+
+def test_parse_xml_output(inventory):
+    assert inventory._parse_xml_output(io.BytesIO(XML_OUTPUT)) == [
+        {
+            'name': 'router.example.com',
+            'ip': '192.168.0.1',
+            'ports': [
+                {'port': '22', 'protocol': 'tcp', 'state': 'open', 'service': 'ssh'},
+                {'port': '8443', 'protocol': 'tcp', 'state': 'open', 'service': 'unknown'},
+            ],
+        },
+        {'name': '192.168.0.2', 'ip': '192.168.0.2'},
+    ]
+
+
+@pytest.mark.parametrize('address, prefix_length, expected', [
+    ('10.0.0.0/22', None, ['10.0.0.0/22']),
+    ('10.0.0.0/22', 24, ['10.0.0.0/24', '10.0.1.0/24', '10.0.2.0/24', '10.0.3.0/24']),
+    ('10.0.0.1/22', 24, ['10.0.0.0/24', '10.0.1.0/24', '10.0.2.0/24', '10.0.3.0/24']),
+    ('10.0.0.0/24', 24, ['10.0.0.0/24']),
+    ('10.0.0.0/24', 40, ['10.0.0.0/24']),
+    ('fd00::/63', 64, ['fd00::/64', 'fd00:0:0:1::/64']),
+    ('10.2.2.15-25', 24, ['10.2.2.15-25']),
+    ('example.com', 24, ['example.com']),
+])
+def test_get_shards(inventory, address, prefix_length, expected):
+    inventory._options['shard_prefix_length'] = prefix_length
+    assert inventory._get_shards(address) == expected
+
+
+def test_scan_shards(inventory, mocker):
+    shards = ['10.0.0.0/24', '10.0.1.0/24', '10.0.2.0/24', '10.0.3.0/24']
+    cache = {'key_10_0_1_0_24': [{'name': 'cached', 'ip': '10.0.1.1'}]}
+    lock = threading.Lock()
+    running = []
+    scanned = []
+
+    def scan(cmd, address):
+        with lock:
+            running.append(address)
+            assert len(running) <= 2
+        time.sleep(0.01)
+        with lock:
+            running.remove(address)
+            scanned.append(address)
+        return [{'name': address, 'ip': address.split('/')[0]}]
+
+    mocker.patch.object(inventory, '_scan', side_effect=scan)
+    inventory._cache = cache
+    results = inventory._scan_shards(['nmap'], shards, 'key', True, True)
+
+    assert [host['name'] for host in results] == ['10.0.0.0/24', 'cached', '10.0.2.0/24', '10.0.3.0/24']
+    assert sorted(scanned) == ['10.0.0.0/24', '10.0.2.0/24', '10.0.3.0/24']
+    assert sorted(cache) == ['key_10_0_0_0_24', 'key_10_0_1_0_24', 'key_10_0_2_0_24', 'key_10_0_3_0_24']
@@ -8,6 +8,8 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from ansible.inventory.data import InventoryData
@@ -149,6 +151,51 @@ def get_json(url, ignore_errors=None):
                  "uptime": 0,
                  "disk": 0,
                  "status": "stopped"}]
+    elif url == "https://localhost:8006/api2/json/cluster/resources?type=vm":
+        # _get_cluster_resources
+        return [{"id": "qemu/101",
+                 "type": "qemu",
+                 "node": "testnode",
+                 "name": "test-qemu",
+                 "vmid": "101",
+                 "template": 0,
+                 "pool": "test",
+                 "status": "running"},
+                {"id": "lxc/100",
+                 "type": "lxc",
+                 "node": "testnode",
+                 "name": "test-lxc",
+                 "vmid": "100",
+                 "template": 0,
+                 "status": "running"},
+                {"id": "qemu/102",
+                 "type": "qemu",
+                 "node": "testnode",
+                 "name": "test-qemu-windows",
+                 "vmid": "102",
+                 "template": 0,
+                 "status": "running"},
+                {"id": "qemu/103",
+                 "type": "qemu",
+                 "node": "testnode",
+                 "name": "test-qemu-multi-nic",
+                 "vmid": "103",
+                 "template": 0,
+                 "status": "running"},
+                {"id": "qemu/9001",
+                 "type": "qemu",
+                 "node": "testnode",
+                 "name": "test-qemu-template",
+                 "vmid": "9001",
+                 "template": 1,
+                 "status": "stopped"},
+                {"id": "qemu/104",
+                 "type": "qemu",
+                 "node": "testnode2",
+                 "name": "test-qemu-offline-node",
+                 "vmid": "104",
+                 "template": 0,
+                 "status": "unknown"}]
     elif url == "https://localhost:8006/api2/json/pools/test":
         # _get_members_per_pool
         return {"members": [{"uptime": 1000,
@@ -784,3 +831,96 @@ def test_populate_exclude_nodes(inventory, mocker):
     # make sure that nodes are not in the "ungrouped" group
     for node in ['testnode', 'testnode2']:
         assert node not in inventory.inventory.get_groups_dict()["ungrouped"]
+
+
+def test_populate_fetch_workers(mocker):
+    opts = {
+        'group_prefix': 'proxmox_',
+        'facts_prefix': 'proxmox_',
+        'want_facts': True,
+        'want_proxmox_nodes_ansible_host': True,
+        'qemu_extended_statuses': True,
+        'exclude_nodes': False,
+        'fetch_workers': 4,
+    }
+
+    def populate(executor):
+        inventory = InventoryModule()
+        inventory.inventory = InventoryData()
+        inventory.proxmox_user = 'root@pam'
+        inventory.proxmox_password = 'password'
+        inventory.proxmox_url = 'https://localhost:8006'
+        inventory.group_prefix = 'proxmox_'
+        inventory.facts_prefix = 'proxmox_'
+        inventory.strict = False
+        inventory.exclude_nodes = False
+
+        # bypass authentication and API fetch calls
+        inventory._get_auth = mocker.MagicMock(side_effect=get_auth)
+        inventory._get_json = mocker.MagicMock(side_effect=get_json)
+        inventory._get_vm_snapshots = mocker.MagicMock(side_effect=get_vm_snapshots)
+        inventory.get_option = mocker.MagicMock(side_effect=get_option(opts))
+        inventory._can_add_host = mocker.MagicMock(return_value=True)
+        inventory._executor = executor
+        inventory._populate()
+        return inventory.inventory
+
+    serial = populate(None)
+    with ThreadPoolExecutor(max_workers=opts['fetch_workers']) as executor:
+        concurrent = populate(executor)
+
+    # hosts, groups and variables must not depend on the order the requests completed in
+    assert list(concurrent.hosts) == list(serial.hosts)
+    assert concurrent.get_groups_dict() == serial.get_groups_dict()
+    for name, host in serial.hosts.items():
+        assert concurrent.get_host(name).get_vars() == host.get_vars()
+
+
+def test_populate_use_cluster_resources(mocker):
+    opts = {
+        'group_prefix': 'proxmox_',
+        'facts_prefix': 'proxmox_',
+        'want_facts': True,
+        'want_proxmox_nodes_ansible_host': True,
+        'qemu_extended_statuses': True,
+        'exclude_nodes': False,
+    }
+
+    def populate(use_cluster_resources):
+        inventory = InventoryModule()
+        inventory.inventory = InventoryData()
+        inventory.proxmox_user = 'root@pam'
+        inventory.proxmox_password = 'password'
+        inventory.proxmox_url = 'https://localhost:8006'
+        inventory.group_prefix = 'proxmox_'
+        inventory.facts_prefix = 'proxmox_'
+        inventory.strict = False
+        inventory.exclude_nodes = False
+
+        # bypass authentication and API fetch calls
+        inventory._get_auth = mocker.MagicMock(side_effect=get_auth)
+        inventory._get_json = mocker.MagicMock(side_effect=get_json)
+        inventory._get_vm_snapshots = mocker.MagicMock(side_effect=get_vm_snapshots)
+        inventory.get_option = mocker.MagicMock(side_effect=get_option(dict(opts, use_cluster_resources=use_cluster_resources)))
+        inventory._can_add_host = mocker.MagicMock(return_value=True)
+        inventory._populate()
+        return inventory
+
+    per_node = populate(False)
+    cluster = populate(True)
+
+    # the guest list and the pool membership come from a single request
+    requested_urls = [call.args[0] for call in cluster._get_json.call_args_list]
+    assert "https://localhost:8006/api2/json/cluster/resources?type=vm" in requested_urls
+    for url in ("https://localhost:8006/api2/json/nodes/testnode/lxc",
+                "https://localhost:8006/api2/json/nodes/testnode/qemu",
+                "https://localhost:8006/api2/json/pools/test"):
+        assert url not in requested_urls
+
+    # guests of offline nodes are skipped, like with per-node queries
+    assert cluster.inventory.get_host('test-qemu-offline-node') is None
+
+    assert sorted(cluster.inventory.hosts) == sorted(per_node.inventory.hosts)
+    assert cluster.inventory.get_groups_dict() == per_node.inventory.get_groups_dict()
+    for name, host in per_node.inventory.hosts.items():
+        assert cluster.inventory.get_host(name).get_vars() == host.get_vars()
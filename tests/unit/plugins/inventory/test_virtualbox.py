@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import stat
+
+import pytest
+
+from ansible.inventory.data import InventoryData
+from ansible.template import Templar
+from ansible_collections.community.general.plugins.inventory.virtualbox import InventoryModule
+
+
+FAKE_VBOXMANAGE = r'''#!/bin/sh
+echo "$*" >> "$(dirname "$0")/calls.log"
+if [ "$1 $2" = "guestproperty get" ]; then
+    case "$3 $4" in
+        "vm01 /VirtualBox/GuestInfo/Net/0/V4/IP") echo "Value: 10.0.0.1" ;;
+        "vm01 /VirtualBox/GuestInfo/OS/Product") echo "Value: Linux" ;;
+        "vm02 /VirtualBox/GuestInfo/Net/0/V4/IP") echo "Value: 10.0.0.2" ;;
+        *) echo "No value set!" ;;
+    esac
+elif [ "$1 $2" = "guestproperty enumerate" ]; then
+    case "$3" in
+        vm01)
+            echo "Name: /VirtualBox/GuestInfo/Net/0/V4/IP, value: 10.0.0.1, timestamp: 1700000000000000000, flags: "
+            echo "Name: /VirtualBox/GuestInfo/OS/Product, value: Linux, timestamp: 1700000000000000000, flags: "
+            ;;
+        vm02)
+            echo "/VirtualBox/GuestInfo/Net/0/V4/IP      = '10.0.0.2' @ 2024-01-01T00:00:00.000000000Z"
+            echo "/VirtualBox/GuestInfo/OS/LoggedInUsers = '0' @ 2024-01-01T00:00:00.000000000Z [TRANSIENT, RDONLYGUEST]"
+            echo "/VirtualBox/HostInfo/GUI/LanguageId    = 'en_US' [RDONLYGUEST]"
+            ;;
+        *) exit 1 ;;
+    esac
+fi
+'''
+
+LIST_VMS = [
+    'Name:                        vm01',
+    'Groups:                      /',
+    'Guest OS:                    Ubuntu (64-bit)',
+    'Name:                        vm02',
+    'Groups:                      /',
+    'Guest OS:                    Ubuntu (64-bit)',
+    'Name:                        vm03',
+    'Groups:                      /',
+    'Guest OS:                    Ubuntu (64-bit)',
+]
+
+
+@pytest.fixture
+def vboxmanage(tmp_path):
+    path = tmp_path / 'VBoxManage'
+    path.write_text(FAKE_VBOXMANAGE)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return path
+
+
+def get_calls(vboxmanage):
+    log = vboxmanage.parent / 'calls.log'
+    if not log.exists():
+        return []
+    return log.read_text().splitlines()
+
+
+@pytest.fixture
+def inventory(vboxmanage):
+    inv = InventoryModule()
+    inv.inventory = InventoryData()
+    inv.templar = Templar(None)
+    inv._vbox_path = str(vboxmanage).encode()
+    inv._options = {
+        'network_info_path': '/VirtualBox/GuestInfo/Net/0/V4/IP',
+        'query': {'os_product': '/VirtualBox/GuestInfo/OS/Product'},
+        'compose': {},
+        'groups': {},
+        'keyed_groups': [],
+        'strict': False,
+        'enable_advanced_group_parsing': False,
+        'enumerate_properties': False,
+        'enumerate_workers': 2,
+    }
+    return inv
+
+
+def check_hosts(inventory):
+    vm01 = inventory.inventory.get_host('vm01').vars
+    vm02 = inventory.inventory.get_host('vm02').vars
+    vm03 = inventory.inventory.get_host('vm03').vars
+    assert vm01['ansible_host'] == '10.0.0.1'
+    assert vm01['os_product'] == 'Linux'
+    assert vm02['ansible_host'] == '10.0.0.2'
+    assert vm02['os_product'] is None
+    assert 'ansible_host' not in vm03
+    assert vm03['os_product'] is None
+    assert vm03['vbox_Guest_OS'] == 'Ubuntu (64-bit)'
+
+
+def test_query_properties(inventory, vboxmanage):
+    inventory._populate_from_source(LIST_VMS)
+    check_hosts(inventory)
+    assert len(get_calls(vboxmanage)) == 6
+    assert all(call.startswith('guestproperty get') for call in get_calls(vboxmanage))
+
+
+def test_enumerate_properties(inventory, vboxmanage):
+    inventory._options['enumerate_properties'] = True
+    inventory._populate_from_source(LIST_VMS)
+    check_hosts(inventory)
+    calls = get_calls(vboxmanage)
+    assert sorted(call for call in calls if 'enumerate' in call) == [
+        'guestproperty enumerate vm01',
+        'guestproperty enumerate vm02',
+        'guestproperty enumerate vm03',
+    ]
+    # vm03 could not be enumerated and falls back to single queries
+    assert sorted(call for call in calls if 'enumerate' not in call) == [
+        'guestproperty get vm03 /VirtualBox/GuestInfo/Net/0/V4/IP',
+        'guestproperty get vm03 /VirtualBox/GuestInfo/OS/Product',
+    ]
+
+
+def test_enumerate_padded_names(inventory):
+    assert inventory._enumerate_vbox_data('vm02') == {
+        '/VirtualBox/GuestInfo/Net/0/V4/IP': '10.0.0.2',
+        '/VirtualBox/GuestInfo/OS/LoggedInUsers': '0',
+        '/VirtualBox/HostInfo/GUI/LanguageId': 'en_US',
+    }
@@ -222,6 +222,17 @@ class MockBitwarden(Bitwarden):
         return '[]', ''
 
 
+class CountingMockBitwarden(MockBitwarden):
+
+    def __init__(self):
+        super(CountingMockBitwarden, self).__init__()
+        self.calls = []
+
+    def _run(self, args, stdin=None, expected_rc=0):
+        self.calls.append(args)
+        return super(CountingMockBitwarden, self)._run(args, stdin, expected_rc)
+
+
 class LoggedOutMockBitwarden(MockBitwarden):
 
     unlocked = False
@@ -330,3 +341,31 @@ class TestLookupModule(unittest.TestCase):
         self.lookup.run(None, organization_id=MOCK_ORGANIZATION_ID, result_count=3)
         with self.assertRaises(BitwardenException):
             self.lookup.run(None, organization_id=MOCK_ORGANIZATION_ID, result_count=0)
+
+    def test_bitwarden_plugin_cache(self):
+        mock_bitwarden = CountingMockBitwarden()
+        with patch("ansible_collections.community.general.plugins.lookup.bitwarden._bitwarden", mock_bitwarden):
+            self.assertEqual([['b', 'd'], [MOCK_RECORDS[0]['login']['password']]],
+                             self.lookup.run(['dupe_name', 'a_test'], field='password', cache=True))
+            self.assertEqual([[MOCK_RECORDS[0]]], self.lookup.run([MOCK_RECORDS[0]['id']], search='id', cache=True))
+            self.assertEqual([[]], self.lookup.run(['not_here'], cache=True))
+            self.assertEqual([MOCK_RECORDS[0], MOCK_RECORDS[2]], self.lookup.run(None, collection_id=MOCK_COLLECTION_ID, cache=True)[0])
+            self.assertEqual([['list', 'items'], ['list', 'items', '--collectionid', MOCK_COLLECTION_ID]], mock_bitwarden.calls)
+
+            # Results can be modified without changing the cache
+            self.lookup.run(['a_test'], cache=True)[0][0]['name'] = 'modified'
+            self.assertEqual('a_test', self.lookup.run(['a_test'], cache=True)[0][0]['name'])
+
+    def test_bitwarden_plugin_cache_ttl(self):
+        mock_bitwarden = CountingMockBitwarden()
+        with patch("ansible_collections.community.general.plugins.lookup.bitwarden._bitwarden", mock_bitwarden):
+            with patch("ansible_collections.community.general.plugins.lookup.bitwarden.time.time", return_value=1000):
+                self.lookup.run(['a_test'], cache=True, cache_ttl=60)
+                self.lookup.run(['a_test'], cache=True, cache_ttl=60)
+            with patch("ansible_collections.community.general.plugins.lookup.bitwarden.time.time", return_value=1060):
+                self.lookup.run(['a_test'], cache=True, cache_ttl=60)
+            self.assertEqual(2, len(mock_bitwarden.calls))
+
+            # Without cache, bw is run for every term
+            self.lookup.run(['a_test', 'dupe_name'])
+            self.assertEqual(4, len(mock_bitwarden.calls))
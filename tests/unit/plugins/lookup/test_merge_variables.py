@@ -35,7 +35,7 @@ class TestMergeVariablesLookup(unittest.TestCase):
         self.merge_vars_lookup = merge_variables.LookupModule(loader=self.loader, templar=self.templar)
 
     @patch.object(AnsiblePlugin, 'set_options')
-    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', None])
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', None, False])
     @patch.object(Templar, 'template', side_effect=[['item1'], ['item3']])
     def test_merge_list(self, mock_set_options, mock_get_option, mock_template):
         results = self.merge_vars_lookup.run(['__merge_list'], {
@@ -47,7 +47,7 @@ class TestMergeVariablesLookup(unittest.TestCase):
         self.assertEqual(results, [['item1', 'item3']])
 
     @patch.object(AnsiblePlugin, 'set_options')
-    @patch.object(AnsiblePlugin, 'get_option', side_effect=[['initial_item'], 'ignore', 'suffix', None])
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[['initial_item'], 'ignore', 'suffix', None, False])
     @patch.object(Templar, 'template', side_effect=[['item1'], ['item3']])
     def test_merge_list_with_initial_value(self, mock_set_options, mock_get_option, mock_template):
         results = self.merge_vars_lookup.run(['__merge_list'], {
@@ -59,7 +59,7 @@ class TestMergeVariablesLookup(unittest.TestCase):
         self.assertEqual(results, [['initial_item', 'item1', 'item3']])
 
     @patch.object(AnsiblePlugin, 'set_options')
-    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', None])
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', None, False])
     @patch.object(Templar, 'template', side_effect=[{'item1': 'test', 'list_item': ['test1']},
                                                     {'item2': 'test', 'list_item': ['test2']}])
     def test_merge_dict(self, mock_set_options, mock_get_option, mock_template):
@@ -84,7 +84,7 @@ class TestMergeVariablesLookup(unittest.TestCase):
 
     @patch.object(AnsiblePlugin, 'set_options')
     @patch.object(AnsiblePlugin, 'get_option', side_effect=[{'initial_item': 'random value', 'list_item': ['test0']},
-                                                            'ignore', 'suffix', None])
+                                                            'ignore', 'suffix', None, False])
     @patch.object(Templar, 'template', side_effect=[{'item1': 'test', 'list_item': ['test1']},
                                                     {'item2': 'test', 'list_item': ['test2']}])
     def test_merge_dict_with_initial_value(self, mock_set_options, mock_get_option, mock_template):
@@ -109,7 +109,7 @@ class TestMergeVariablesLookup(unittest.TestCase):
         ])
 
     @patch.object(AnsiblePlugin, 'set_options')
-    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'warn', 'suffix', None])
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'warn', 'suffix', None, False])
     @patch.object(Templar, 'template', side_effect=[{'item': 'value1'}, {'item': 'value2'}])
     @patch.object(Display, 'warning')
     def test_merge_dict_non_unique_warning(self, mock_set_options, mock_get_option, mock_template, mock_display):
@@ -122,7 +122,7 @@ class TestMergeVariablesLookup(unittest.TestCase):
         self.assertEqual(results, [{'item': 'value2'}])
 
     @patch.object(AnsiblePlugin, 'set_options')
-    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'error', 'suffix', None])
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'error', 'suffix', None, False])
     @patch.object(Templar, 'template', side_effect=[{'item': 'value1'}, {'item': 'value2'}])
     def test_merge_dict_non_unique_error(self, mock_set_options, mock_get_option, mock_template):
         with self.assertRaises(AnsibleError):
@@ -132,7 +132,7 @@ class TestMergeVariablesLookup(unittest.TestCase):
             })
 
     @patch.object(AnsiblePlugin, 'set_options')
-    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', None])
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', None, False])
     @patch.object(Templar, 'template', side_effect=[{'item1': 'test', 'list_item': ['test1']},
                                                     ['item2', 'item3']])
     def test_merge_list_and_dict(self, mock_set_options, mock_get_option, mock_template):
@@ -146,7 +146,7 @@ class TestMergeVariablesLookup(unittest.TestCase):
             })
 
     @patch.object(AnsiblePlugin, 'set_options')
-    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', ['all']])
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', ['all'], False])
     @patch.object(Templar, 'template', side_effect=[
         {'var': [{'item1': 'value1', 'item2': 'value2'}]},
         {'var': [{'item5': 'value5', 'item6': 'value6'}]},
@@ -183,7 +183,7 @@ class TestMergeVariablesLookup(unittest.TestCase):
         ])
 
     @patch.object(AnsiblePlugin, 'set_options')
-    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', ['dummy1']])
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', ['dummy1'], False])
     @patch.object(Templar, 'template', side_effect=[
         {'var': [{'item1': 'value1', 'item2': 'value2'}]},
         {'var': [{'item5': 'value5', 'item6': 'value6'}]},
@@ -227,7 +227,7 @@ class TestMergeVariablesLookup(unittest.TestCase):
         ])
 
     @patch.object(AnsiblePlugin, 'set_options')
-    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', ['dummy1', 'dummy2']])
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', ['dummy1', 'dummy2'], False])
     @patch.object(Templar, 'template', side_effect=[
         {'var': [{'item1': 'value1', 'item2': 'value2'}]},
         {'var': [{'item5': 'value5', 'item6': 'value6'}]},
@@ -270,7 +270,7 @@ class TestMergeVariablesLookup(unittest.TestCase):
         ])
 
     @patch.object(AnsiblePlugin, 'set_options')
-    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', ['dummy1', 'dummy2']])
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'suffix', ['dummy1', 'dummy2'], False])
     @patch.object(Templar, 'template', side_effect=[
         ['item1'],
         ['item5'],
@@ -300,3 +300,42 @@ class TestMergeVariablesLookup(unittest.TestCase):
         results = self.merge_vars_lookup.run(['__merge_var'], variables)
 
         self.assertEqual(results, [['item1', 'item5']])
+
+    @patch.object(AnsiblePlugin, 'set_options')
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'regex', ['dummy1'], False])
+    @patch.object(Templar, 'template', side_effect=[['item1'], ['item5'], ['item1'], ['item6']])
+    def test_merge_list_group_multiple_terms(self, mock_template, mock_get_option, mock_set_options):
+        hostvars = self.HostVarsMock({
+            'host1': {
+                'group_names': ['dummy1'],
+                'inventory_hostname': 'host1',
+                '1testlist__merge_var': ['item1']
+            },
+            'host2': {
+                'group_names': ['dummy1'],
+                'inventory_hostname': 'host2',
+                '2otherlist__merge_var': ['item5'],
+                '2otherlist__other_var': ['item6']
+            }
+        })
+        variables = {
+            'inventory_hostname': 'host1',
+            'hostvars': hostvars
+        }
+        with patch.object(self.HostVarsMock, 'raw_get', side_effect=hostvars.get) as mock_raw_get:
+            results = self.merge_vars_lookup.run(['__merge_var$', '^1testlist|__other_var$'], variables)
+
+        self.assertEqual(results, [['item1', 'item5'], ['item1', 'item6']])
+        self.assertEqual(mock_raw_get.call_count, 2)
+
+    @patch.object(AnsiblePlugin, 'set_options')
+    @patch.object(AnsiblePlugin, 'get_option', side_effect=[None, 'ignore', 'prefix', None, True])
+    @patch.object(Templar, 'template', side_effect=[{'item1': ['value1']}, {'item2': ['value2']}])
+    def test_merge_dict_memoize_values(self, mock_template, mock_get_option, mock_set_options):
+        results = self.merge_vars_lookup.run(['testdict', 'testdict1'], {
+            'testdict1': {'item1': ['value1']},
+            'testdict2': {'item2': ['value2']},
+        })
+
+        self.assertEqual(results, [{'item1': ['value1'], 'item2': ['value2']}, {'item1': ['value1']}])
+        self.assertEqual(mock_template.call_count, 2)
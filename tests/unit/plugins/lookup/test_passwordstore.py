@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import subprocess
+import threading
+
+from ansible_collections.community.general.tests.unit.compat import unittest
+from ansible_collections.community.general.tests.unit.compat.mock import patch
+
+from ansible.plugins.loader import lookup_loader
+from ansible_collections.community.general.plugins.lookup import passwordstore
+
+
+class MockPass(object):
+    """Fake pass command line, storing the password files in a dict."""
+
+    def __init__(self, files):
+        self.files = files
+        self.shown = []
+        self.lock = threading.Lock()
+
+    def __call__(self, args, env=None, input=None):
+        if args[1] == '--version':
+            return b'fake pass'
+        if args[1] == 'show':
+            with self.lock:
+                self.shown.append(args[2])
+            if args[2] not in self.files:
+                raise subprocess.CalledProcessError(1, args, 'Error: %s is not in the password store.' % args[2])
+            return self.files[args[2]].encode('utf-8')
+        if args[1] == 'insert':
+            self.files[args[4]] = input
+            return b''
+        raise AssertionError('Unexpected command %s' % args)
+
+
+class TestLookupModule(unittest.TestCase):
+
+    def setUp(self):
+        self.lookup = lookup_loader.get('community.general.passwordstore')
+        passwordstore._pass_cache.clear()
+        self.mock_pass = MockPass({'a': 'passa\nuser: usera', 'b': 'passb', 'c': 'passc'})
+        patcher = patch.object(passwordstore, 'check_output2', side_effect=self.mock_pass)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(passwordstore._pass_cache.clear)
+
+    def test_without_cache(self):
+        self.assertEqual(['passa', 'passa'], self.lookup.run(['a', 'a'], {}, directory='/nonexistent'))
+        self.assertEqual(['a', 'a'], self.mock_pass.shown)
+
+    def test_cache(self):
+        self.assertEqual(['passa', 'usera'], self.lookup.run(['a', 'a subkey=user'], {}, directory='/nonexistent', cache=True))
+        self.assertEqual(['passb'], self.lookup.run(['b'], {}, directory='/nonexistent', cache=True))
+        self.assertEqual(['passa'], self.lookup.run(['a'], {}, directory='/nonexistent', cache=True))
+        self.assertEqual(['a', 'b'], self.mock_pass.shown)
+
+        # Another store is cached separately
+        self.lookup.run(['a'], {}, directory='/other', cache=True)
+        self.assertEqual(['a', 'b', 'a'], self.mock_pass.shown)
+
+    def test_cache_overwrite(self):
+        self.lookup.run(['a'], {}, directory='/nonexistent', cache=True)
+        newpass = self.lookup.run(['a'], {}, directory='/nonexistent', cache=True, overwrite=True, userpass='newpass')
+        self.assertEqual(['newpass'], newpass)
+        self.assertEqual(['newpass'], self.lookup.run(['a'], {}, directory='/nonexistent', cache=True))
+
+    def test_workers(self):
+        result = self.lookup.run(['a', 'b', 'c', 'b', 'missing'], {}, directory='/nonexistent', workers=3, missing='empty')
+        self.assertEqual(['passa', 'passb', 'passc', 'passb', None], result)
+        self.assertEqual(['a', 'b', 'c', 'missing'], sorted(self.mock_pass.shown))
+
+    def test_workers_create(self):
+        result = self.lookup.run(['a', 'new'], {}, directory='/nonexistent', workers=2, create=True, userpass='created')
+        self.assertEqual(['passa', 'created'], result)
+        self.assertTrue(self.mock_pass.files['new'].startswith('created'))
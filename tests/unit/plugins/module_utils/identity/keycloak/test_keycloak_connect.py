@@ -6,6 +6,7 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import pytest
+import time
 from itertools import count
 
 from ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak import (
@@ -163,3 +164,46 @@ def test_json_without_token_returned(mock_json_without_token_returned):
         'API did not include access_token field in response from '
         'http://keycloak.url/auth/realms/master/protocol/openid-connect/token'
     )
+
+
+@pytest.fixture()
+def mock_token_cache_connection(mocker):
+    responses = [
+        '{"access_token": "firsttoken", "expires_in": 300, "refresh_token": "refreshtoken", "refresh_expires_in": 1800}',
+        '{"access_token": "secondtoken", "expires_in": 300, "refresh_token": "refreshtoken", "refresh_expires_in": 1800}',
+    ]
+
+    def _mocked_requests(*args, **kwargs):
+        return StringIO(responses.pop(0))
+
+    return mocker.patch(
+        'ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.open_url',
+        side_effect=_mocked_requests,
+        autospec=True
+    )
+
+
+def test_connect_to_keycloak_with_token_cache(mock_token_cache_connection, tmp_path):
+    module_params = dict(module_params_creds, token_cache=True, token_cache_dir=str(tmp_path))
+    assert get_token(module_params)['Authorization'] == 'Bearer firsttoken'
+    assert get_token(module_params)['Authorization'] == 'Bearer firsttoken'
+    assert mock_token_cache_connection.call_count == 1
+
+    # Other credentials do not share the cached token
+    assert get_token(dict(module_params, auth_username='other'))['Authorization'] == 'Bearer secondtoken'
+    assert mock_token_cache_connection.call_count == 2
+
+
+def test_connect_to_keycloak_with_expired_token_cache(mock_token_cache_connection, mocker, tmp_path):
+    module_params = dict(module_params_creds, token_cache=True, token_cache_dir=str(tmp_path))
+    assert get_token(module_params)['Authorization'] == 'Bearer firsttoken'
+
+    # The access token expired, but the refresh token is still valid
+    now = time.time()
+    mocker.patch(
+        'ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak.time.time',
+        return_value=now + 600)
+    assert get_token(module_params)['Authorization'] == 'Bearer secondtoken'
+    payload = mock_token_cache_connection.call_args[1]['data']
+    assert 'grant_type=refresh_token' in payload
+    assert 'refresh_token=refreshtoken' in payload
@@ -0,0 +1,112 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible_collections.community.general.plugins.module_utils.identity.keycloak import keycloak
+from ansible_collections.community.general.plugins.module_utils.identity.keycloak.keycloak import KeycloakAPI
+from ansible.module_utils.six import StringIO
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible.module_utils.six.moves.urllib.parse import parse_qs, urlparse
+
+
+BASE_URL = 'http://keycloak.url/auth/admin/realms/master'
+
+
+class FakeModule(object):
+    def __init__(self):
+        self.params = {
+            'auth_keycloak_url': 'http://keycloak.url/auth',
+            'validate_certs': True,
+            'connection_timeout': 10,
+            'http_agent': 'Ansible',
+        }
+
+    def fail_json(self, **kwargs):
+        raise AssertionError(kwargs['msg'])
+
+
+class FakeKeycloak(object):
+    """Answers requests of the groups, group children and client role resources."""
+
+    def __init__(self, groups, children=None, roles=None):
+        self.groups = groups
+        self.children = children or {}
+        self.roles = roles or {}
+        self.requests = []
+
+    def __call__(self, url, method='GET', **kwargs):
+        self.requests.append(url)
+        parsed = urlparse(url)
+        path = parsed.path[len(urlparse(BASE_URL).path):]
+        query = dict((k, v[0]) for k, v in parse_qs(parsed.query).items())
+
+        if path == '/groups':
+            items = [g for g in self.groups if g['name'] == query['search']]
+        elif path.endswith('/children'):
+            items = self.children[path.split('/')[2]]
+            if 'search' in query:
+                items = [g for g in items if g['name'] == query['search']]
+        elif path.startswith('/groups/'):
+            group = [g for g in self.groups if g['id'] == path.split('/')[2]]
+            if not group:
+                raise HTTPError(url, 404, 'Not Found', {}, None)
+            return StringIO(json.dumps(group[0]))
+        elif path.startswith('/clients/'):
+            name = path.split('/')[-1]
+            if name not in self.roles:
+                raise HTTPError(url, 404, 'Not Found', {}, None)
+            return StringIO(json.dumps({'id': self.roles[name], 'name': name}))
+        else:
+            raise AssertionError('Unexpected request %s' % url)
+
+        first = int(query.get('first', 0))
+        return StringIO(json.dumps(items[first:first + int(query.get('max', len(items)))]))
+
+
+@pytest.fixture
+def kc():
+    return KeycloakAPI(FakeModule(), {})
+
+
+def test_get_group_by_name_searches_server_side(kc, mocker):
+    fake = FakeKeycloak([{'id': 'g1', 'name': 'one', 'subGroupCount': 0}, {'id': 'g2', 'name': 'two', 'subGroupCount': 0}])
+    mocker.patch.object(keycloak, 'open_url', side_effect=fake)
+
+    assert kc.get_group_by_name('two')['id'] == 'g2'
+    assert kc.get_group_by_name('two')['id'] == 'g2'
+    assert kc.get_group_by_name('three') is None
+    search = [url for url in fake.requests if '?' in url]
+    assert len(search) == 2
+    assert 'search=two' in search[0]
+    assert 'exact=true' in search[0]
+    assert 'briefRepresentation=true' in search[0]
+
+
+def test_subgroups_are_paginated(kc, mocker):
+    children = [{'id': 'c%d' % i, 'name': 'child%d' % i, 'subGroupCount': 0} for i in range(250)]
+    fake = FakeKeycloak([{'id': 'g1', 'name': 'one', 'subGroupCount': 250}], children={'g1': children})
+    mocker.patch.object(keycloak, 'open_url', side_effect=fake)
+
+    assert kc.get_subgroups({'id': 'g1', 'subGroupCount': 250}) == children
+    assert len(fake.requests) == 3
+
+    group = kc.get_subgroup_by_chain([{'id': None, 'name': 'one'}, {'id': None, 'name': 'child242'}])
+    assert group['id'] == 'c242'
+    assert kc.get_subgroup_by_chain([{'id': None, 'name': 'one'}, {'id': None, 'name': 'missing'}]) is None
+
+
+def test_get_client_role_id_by_name_is_memoized(kc, mocker):
+    fake = FakeKeycloak([], roles={'admin': 'r1'})
+    mocker.patch.object(keycloak, 'open_url', side_effect=fake)
+
+    assert kc.get_client_role_id_by_name('c1', 'admin') == 'r1'
+    assert kc.get_client_role_id_by_name('c1', 'admin') == 'r1'
+    assert kc.get_client_role_id_by_name('c1', 'missing') is None
+    assert len(fake.requests) == 2
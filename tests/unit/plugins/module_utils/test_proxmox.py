@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.community.general.tests.unit.compat.mock import MagicMock
+from ansible_collections.community.general.plugins.module_utils import proxmox as proxmox_utils
+from ansible_collections.community.general.plugins.module_utils.proxmox import ProxmoxAnsible
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(proxmox_utils, 'monotonic', clock.monotonic)
+    monkeypatch.setattr(proxmox_utils, 'sleep', clock.sleep)
+    return clock
+
+
+def make_proxmox(task_statuses, task_log=None):
+    """task_statuses maps task IDs to lists of statuses returned by consecutive polls."""
+    proxmox = ProxmoxAnsible.__new__(ProxmoxAnsible)
+    proxmox.module = MagicMock()
+    proxmox.proxmox_api = MagicMock()
+
+    def tasks(task_id):
+        task = MagicMock()
+        statuses = task_statuses[task_id]
+        task.status.get.side_effect = lambda: statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        task.log.get.side_effect = lambda start, limit: [{'n': n + 1, 't': line} for n, line in enumerate(task_log)][start:start + limit]
+        return task
+
+    proxmox.proxmox_api.nodes.return_value.tasks.side_effect = tasks
+    return proxmox
+
+
+RUNNING = {'status': 'running'}
+OK = {'status': 'stopped', 'exitstatus': 'OK'}
+FAILED = {'status': 'stopped', 'exitstatus': 'command failed'}
+
+
+def test_api_task_complete_backoff(clock):
+    proxmox = make_proxmox({'UPID:1': [RUNNING] * 5 + [OK]})
+    assert proxmox.api_task_complete('node1', 'UPID:1', 30) == (True, None)
+    assert clock.sleeps == [0.1, 0.2, 0.4, 0.8, 1.6]
+
+
+def test_api_task_complete_timeout(clock):
+    proxmox = make_proxmox({'UPID:1': [RUNNING]})
+    assert proxmox.api_task_complete('node1', 'UPID:1', 10) == (False, ProxmoxAnsible.TASK_TIMED_OUT)
+    assert clock.now == pytest.approx(10)
+    assert max(clock.sleeps) == ProxmoxAnsible.TASK_POLL_MAX_INTERVAL
+
+
+def test_api_tasks_complete(clock):
+    proxmox = make_proxmox({
+        'UPID:1': [RUNNING, OK],
+        'UPID:2': [RUNNING, RUNNING, FAILED],
+        'UPID:3': [RUNNING],
+    }, task_log=['line 1', 'line 2'])
+    task_logs = {}
+    results = proxmox.api_tasks_complete([('node1', 'UPID:1'), ('node2', 'UPID:2'), ('node2', 'UPID:3')], 1, task_logs=task_logs)
+    assert results == {
+        'UPID:1': (True, None),
+        'UPID:2': (False, 'command failed'),
+        'UPID:3': (False, ProxmoxAnsible.TASK_TIMED_OUT),
+    }
+    assert task_logs == {'UPID:1': ['line 1', 'line 2'], 'UPID:2': ['line 1', 'line 2'], 'UPID:3': ['line 1', 'line 2']}
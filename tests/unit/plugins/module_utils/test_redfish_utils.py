@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Ansible project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+
+from ansible_collections.community.general.tests.unit.compat import unittest
+from ansible_collections.community.general.tests.unit.compat.mock import patch
+from ansible_collections.community.general.plugins.module_utils.redfish_utils import RedfishUtils
+
+
+class FakeResponse(object):
+    def __init__(self, data, headers=None):
+        self.status = 200
+        self._body = json.dumps(data).encode('utf-8')
+        self._headers = headers or {}
+
+    def info(self):
+        return self._headers
+
+    def read(self):
+        return self._body
+
+
+class FakeService(object):
+    def __init__(self, resources):
+        self.resources = resources
+        self.requests = []
+
+    def open_url(self, uri, method='GET', headers=None, **kwargs):
+        self.requests.append((method, uri, headers))
+        data, etag = self.resources[uri]
+        if headers.get('If-None-Match') == etag:
+            raise HTTPError(uri, 304, 'Not Modified', {}, None)
+        return FakeResponse(data, {'ETag': etag})
+
+
+class TestRedfishUtilsGetCache(unittest.TestCase):
+    def setUp(self):
+        self.service = FakeService({
+            'https://bmc/redfish/v1/Systems/1': ({'Id': '1', 'Status': {'State': 'Enabled'}}, '"1"'),
+        })
+        patcher = patch('ansible_collections.community.general.plugins.module_utils.redfish_utils.open_url',
+                        side_effect=self.service.open_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.utils = RedfishUtils({'user': 'a_user', 'pswd': 'a_password'}, 'https://bmc', 10, None)
+        self.uri = 'https://bmc/redfish/v1/Systems/1'
+
+    def test_no_cache_by_default(self):
+        self.utils.get_request(self.uri)
+        self.utils.get_request(self.uri)
+        self.assertEqual(len(self.service.requests), 2)
+
+    def test_cache(self):
+        self.utils.enable_get_cache()
+        first = self.utils.get_request(self.uri)
+        first['data']['Status']['State'] = 'Modified by caller'
+        second = self.utils.get_request(self.uri)
+        self.assertEqual(len(self.service.requests), 1)
+        self.assertTrue(second['ret'])
+        self.assertEqual(second['data'], {'Id': '1', 'Status': {'State': 'Enabled'}})
+        self.assertEqual(second['headers']['etag'], '"1"')
+
+    def test_cache_revalidate(self):
+        self.utils.enable_get_cache(revalidate=True)
+        self.utils.get_request(self.uri)
+        second = self.utils.get_request(self.uri)
+        self.assertEqual(len(self.service.requests), 2)
+        self.assertEqual(self.service.requests[1][2]['If-None-Match'], '"1"')
+        self.assertTrue(second['ret'])
+        self.assertEqual(second['data']['Id'], '1')
+
+    def test_cache_bypass(self):
+        self.utils.enable_get_cache()
+        self.utils.get_request(self.uri)
+        self.utils.get_request(self.uri, timeout=5)
+        self.utils.get_request(self.uri, override_headers={'accept': 'application/json'})
+        self.assertEqual(len(self.service.requests), 3)
+
+    def test_cache_cleared_by_modification(self):
+        self.utils.enable_get_cache()
+        self.utils.get_request(self.uri)
+        self.service.resources['https://bmc/redfish/v1/Systems/1/Actions/Reset'] = ({}, None)
+        self.utils.post_request('https://bmc/redfish/v1/Systems/1/Actions/Reset', {})
+        self.utils.get_request(self.uri)
+        self.assertEqual([r[0] for r in self.service.requests], ['GET', 'POST', 'GET'])
+
+
+class FakeExpandService(object):
+    def __init__(self, resources, expand=False):
+        self.resources = resources
+        self.expand = expand
+        self.requests = []
+
+    def open_url(self, uri, method='GET', headers=None, **kwargs):
+        self.requests.append(uri)
+        path, dummy, query = uri.partition('?')
+        data = dict(self.resources[path])
+        if query:
+            if not self.expand:
+                raise HTTPError(uri, 400, 'Bad Request', {}, None)
+            data['Members'] = [self.resources['https://bmc' + m['@odata.id']] for m in data['Members']]
+        return FakeResponse(data)
+
+
+def storage_resources(expand):
+    resources = {
+        '/redfish/v1/': {'ProtocolFeaturesSupported': {'ExpandQuery': {'Levels': expand, 'NoLinks': expand}}},
+        '/redfish/v1/Systems/1': {'Storage': {'@odata.id': '/redfish/v1/Systems/1/Storage'}},
+        '/redfish/v1/Systems/1/Storage': {'Members': [{'@odata.id': '/redfish/v1/Systems/1/Storage/1'}]},
+        '/redfish/v1/Systems/1/Storage/1': {
+            '@odata.id': '/redfish/v1/Systems/1/Storage/1',
+            'Id': '1',
+            'StorageControllers': [{'Name': 'RAID'}],
+            'Drives': [{'@odata.id': '/redfish/v1/Systems/1/Storage/1/Drives/%d' % i} for i in range(6)],
+        },
+    }
+    for i in range(6):
+        uri = '/redfish/v1/Systems/1/Storage/1/Drives/%d' % i
+        resources[uri] = {'@odata.id': uri, 'Id': str(i), 'CapacityBytes': i * 1000}
+    return dict(('https://bmc' + uri, data) for uri, data in resources.items())
+
+
+class TestRedfishUtilsCollections(unittest.TestCase):
+    def get_disks(self, service):
+        with patch('ansible_collections.community.general.plugins.module_utils.redfish_utils.open_url',
+                   side_effect=service.open_url):
+            utils = RedfishUtils({'user': 'a_user', 'pswd': 'a_password'}, 'https://bmc', 10, None)
+            return utils.get_disk_inventory('/redfish/v1/Systems/1')
+
+    def check_disks(self, result):
+        self.assertTrue(result['ret'])
+        self.assertEqual(len(result['entries']), 1)
+        self.assertEqual(result['entries'][0]['Controller'], 'RAID')
+        self.assertEqual([d['Id'] for d in result['entries'][0]['Drives']], [str(i) for i in range(6)])
+
+    def test_expand_members(self):
+        service = FakeExpandService(storage_resources(True), expand=True)
+        self.check_disks(self.get_disks(service))
+        self.assertIn('https://bmc/redfish/v1/Systems/1/Storage?$expand=.($levels=1)', service.requests)
+        self.assertNotIn('https://bmc/redfish/v1/Systems/1/Storage/1', service.requests)
+
+    def test_expand_rejected(self):
+        service = FakeExpandService(storage_resources(True), expand=False)
+        self.check_disks(self.get_disks(service))
+        self.assertIn('https://bmc/redfish/v1/Systems/1/Storage/1', service.requests)
+
+    def test_concurrent_fetch(self):
+        service = FakeExpandService(storage_resources(False))
+        self.check_disks(self.get_disks(service))
+        self.assertFalse([uri for uri in service.requests if '?' in uri])
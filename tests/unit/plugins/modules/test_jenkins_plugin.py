@@ -5,6 +5,10 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import hashlib
+import json
+import os
+
 from io import BytesIO
 
 from ansible_collections.community.general.plugins.modules.jenkins_plugin import JenkinsPlugin
@@ -190,3 +194,88 @@ def isInList(l, i):
         if item == i:
             return True
     return False
+
+
+UPDATES_DATA = {
+    'plugins': {
+        'git': {'sha1': 'x', 'dependencies': [
+            {'name': 'scm-api', 'optional': False},
+            {'name': 'credentials', 'optional': False},
+            {'name': 'promoted-builds', 'optional': True},
+        ]},
+        'scm-api': {'sha1': 'x', 'dependencies': [{'name': 'structs', 'optional': False}]},
+        'credentials': {'sha1': 'x', 'dependencies': [{'name': 'structs', 'optional': False}, {'name': 'bundled', 'optional': False}]},
+        'structs': {'sha1': 'x', 'dependencies': []},
+        'promoted-builds': {'sha1': 'x', 'dependencies': []},
+    }
+}
+
+
+def get_plugin(mocker, tmp_path, **params):
+    module = mocker.Mock()
+    module.params = dict({
+        'url': 'http://fake.jenkins.server',
+        'timeout': 30,
+        'name': None,
+        'updates_expiration': 86400,
+        'updates_url': ['https://some.base.url'],
+        'update_json_url_segment': ['update-center.json'],
+    }, **params)
+    module.atomic_move.side_effect = os.rename
+
+    def get_installed_plugins(self):
+        self.installed_plugins = {'bundled': {'pinned': False, 'enabled': True}}
+        self._select_plugin(self.params['name'])
+
+    mocker.patch.object(JenkinsPlugin, '_csrf_enabled', return_value=False)
+    mocker.patch.object(JenkinsPlugin, '_get_installed_plugins', get_installed_plugins)
+    mocker.patch('ansible_collections.community.general.plugins.module_utils.jenkins.os.path.expanduser', return_value=str(tmp_path))
+    return JenkinsPlugin(module)
+
+
+def test__resolve_dependencies(mocker, tmp_path):
+    "test the resolution of the plugin dependencies"
+
+    jenkins_plugin = get_plugin(mocker, tmp_path)
+    jenkins_plugin.updates_data = UPDATES_DATA
+
+    assert jenkins_plugin._resolve_dependencies(['git', 'structs']) == ['structs', 'scm-api', 'credentials', 'git']
+
+
+def test__get_updates_data_revalidated(mocker, tmp_path):
+    "test that an expired updates file is revalidated, and downloaded once per module run"
+
+    updates = b'updateCenter.post(\n' + json.dumps(UPDATES_DATA).encode() + b'\n);'
+    response = BytesIO(updates)
+    response.headers = {'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    get_urls_data = mocker.patch.object(JenkinsPlugin, '_get_urls_data', return_value=response)
+
+    jenkins_plugin = get_plugin(mocker, tmp_path, updates_expiration=0, name='git')
+    assert jenkins_plugin._download_updates() == UPDATES_DATA['plugins']['git']
+    assert jenkins_plugin._get_updates_data() == UPDATES_DATA
+    assert get_urls_data.call_count == 1
+    assert get_urls_data.call_args[1]['headers'] == {}
+
+    # Once expired, the cached file is used if the server reports that it was not modified
+    get_urls_data.return_value = None
+    jenkins_plugin = get_plugin(mocker, tmp_path, updates_expiration=1)
+    os.utime(str(tmp_path / 'jenkins-plugin-cache.json'), (0, 0))
+    assert jenkins_plugin._get_updates_data() == UPDATES_DATA
+    assert get_urls_data.call_args[1]['headers'] == {'If-None-Match': '"abc"', 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    assert os.stat(str(tmp_path / 'jenkins-plugin-cache.json')).st_mtime > 0
+
+
+def test__write_tmp_file(mocker, tmp_path):
+    "test that files are written and hashed in chunks"
+
+    data = os.urandom(1000000)
+    jenkins_plugin = get_plugin(mocker, tmp_path)
+
+    tmp_f, checksum = jenkins_plugin._write_tmp_file(BytesIO(data))
+    try:
+        assert checksum == hashlib.sha1(data).hexdigest()
+        assert jenkins_plugin._get_file_sha1(tmp_f).hexdigest() == checksum
+        with open(tmp_f, 'rb') as f:
+            assert f.read() == data
+    finally:
+        os.remove(tmp_f)
@@ -5022,3 +5022,172 @@ def test_vrf_connection_unchanged(mocked_vrf_connection_unchanged, capfd):
     results = json.loads(out)
     assert not results.get('failed')
     assert not results['changed']
+
+
+TESTCASE_CONNECTIONS = [
+    {
+        'state': 'present',
+        'connections': [
+            dict((k, v) for k, v in TESTCASE_BOND[0].items() if k not in ('state', '_ansible_check_mode')),
+            {
+                'type': 'ethernet',
+                'conn_name': 'new_nw_device',
+                'ifname': 'ethernet_non_existant',
+                'ip4': '10.10.10.11/24',
+            },
+        ],
+        '_ansible_check_mode': False,
+        '_ansible_diff': True,
+    }
+]
+
+
+@pytest.fixture
+def mocked_connections(mocker):
+    def execute_command(cmd, **kwargs):
+        if cmd[1:] == ['--fields', 'name', '--terse', 'con', 'show']:
+            return 0, 'non_existent_nw_device\nother_nw_device\n', ''
+        if cmd[1:4] == ['--show-secrets', 'con', 'show']:
+            return 0, TESTCASE_BOND_SHOW_OUTPUT + '802-3-ethernet.mtu:                     auto\n', ''
+        return 0, '', ''
+
+    get_bin_path = mocker.patch('ansible.module_utils.basic.AnsibleModule.get_bin_path')
+    get_bin_path.return_value = '/usr/bin/nmcli'
+    mocker.patch.object(nmcli.Nmcli, 'execute_command', side_effect=execute_command)
+
+
+@pytest.mark.parametrize('patch_ansible_module', TESTCASE_CONNECTIONS, indirect=['patch_ansible_module'])
+def test_connections(mocked_connections, capfd):
+    """
+    Test : Several connections managed from one snapshot
+    """
+    with pytest.raises(SystemExit):
+        nmcli.main()
+
+    arg_list = nmcli.Nmcli.execute_command.call_args_list
+    assert len(arg_list) == 3
+    assert arg_list[0][0][0] == ['/usr/bin/nmcli', '--fields', 'name', '--terse', 'con', 'show']
+    assert arg_list[1][0][0] == ['/usr/bin/nmcli', '--show-secrets', 'con', 'show', 'id', 'non_existent_nw_device']
+    assert arg_list[2][0][0][:7] == ['/usr/bin/nmcli', 'con', 'add', 'type', 'ethernet', 'con-name', 'new_nw_device']
+
+    out, err = capfd.readouterr()
+    results = json.loads(out)
+    assert not results.get('failed')
+    assert results['changed']
+    assert [(result['conn_name'], result['changed']) for result in results['connections']] == [
+        ('non_existent_nw_device', False),
+        ('new_nw_device', True),
+    ]
+
+
+@pytest.mark.parametrize('patch_ansible_module', [{
+    'state': 'present',
+    'connections': [{'conn_name': 'device', 'type': 'ethernet'}, {'conn_name': 'device', 'type': 'bond'}],
+    '_ansible_check_mode': False,
+}], indirect=['patch_ansible_module'])
+def test_connections_duplicate_name(mocked_connections, capfd):
+    """
+    Test : A connection listed twice in connections fails
+    """
+    with pytest.raises(SystemExit):
+        nmcli.main()
+
+    out, err = capfd.readouterr()
+    results = json.loads(out)
+    assert results['failed']
+    assert 'more than once' in results['msg']
+    assert not nmcli.Nmcli.execute_command.called
+
+
+@pytest.mark.parametrize('patch_ansible_module', [{
+    'state': 'present',
+    'type': 'wifi',
+    'wifi': {'hidden': True},
+    'connections': [
+        {'conn_name': 'wifi1', 'ifname': 'wlan0', 'ssid': 'ssid1'},
+        {'conn_name': 'wifi2', 'ifname': 'wlan1', 'ssid': 'ssid2'},
+    ],
+    '_ansible_check_mode': False,
+}], indirect=['patch_ansible_module'])
+def test_connections_supported_properties_cached(mocked_connections, mocker, capfd):
+    """
+    Test : The properties supported by a connection type are read once for all connections
+    """
+    execute_edit_commands = mocker.patch.object(
+        nmcli.Nmcli, 'execute_edit_commands', return_value=(0, '802-11-wireless.hidden:  no\n', ''))
+
+    with pytest.raises(SystemExit):
+        nmcli.main()
+
+    assert execute_edit_commands.call_count == 1
+
+    out, err = capfd.readouterr()
+    results = json.loads(out)
+    assert not results.get('failed')
+    assert [result['changed'] for result in results['connections']] == [True, True]
+
+
+@pytest.mark.parametrize('patch_ansible_module', [{
+    'state': 'present',
+    'connections': [
+        {'conn_name': 'wifi1', 'type': 'wifi', 'ifname': 'wlan0', 'ssid': 'ssid1', 'wifi_sec': {'key-mgmt': 'wpa-psk', 'psk': 'wifi1_secret'}},
+        {'conn_name': 'gre1', 'type': 'gre', 'ip_tunnel_dev': 'eth0', 'ip_tunnel_local': '192.168.1.1', 'ip_tunnel_remote': '192.168.1.2',
+         'ip_tunnel_input_key': 'gre1_input_secret', 'ip_tunnel_output_key': 'gre1_output_secret'},
+    ],
+    '_ansible_check_mode': True,
+}], indirect=['patch_ansible_module'])
+def test_connections_no_log(mocked_connections, mocker, capfd):
+    """
+    Test : The secrets of the elements of connections are not logged
+    """
+    mocker.patch.object(nmcli.Nmcli, 'execute_edit_commands',
+                        return_value=(0, '802-11-wireless-security.key-mgmt:  --\n802-11-wireless-security.psk:  --\n', ''))
+    log = mocker.patch('ansible.module_utils.basic.AnsibleModule.log')
+
+    with pytest.raises(SystemExit):
+        nmcli.main()
+
+    out, err = capfd.readouterr()
+    results = json.loads(out)
+    assert not results.get('failed')
+
+    assert log.call_count > 0
+    logged = ' '.join(str(call) for call in log.call_args_list)
+    for secret in ('wifi1_secret', 'gre1_input_secret', 'gre1_output_secret'):
+        assert secret not in logged
+        assert secret not in out
+
+
+@pytest.mark.parametrize('patch_ansible_module', [{
+    'state': 'present',
+    'type': 'ethernet',
+    'connections': [
+        {'conn_name': 'new_nw_device', 'ifname': 'eth1'},
+        {'conn_name': 'failing_nw_device', 'ifname': 'eth2'},
+        {'conn_name': 'third_nw_device', 'ifname': 'eth3'},
+    ],
+    '_ansible_check_mode': False,
+}], indirect=['patch_ansible_module'])
+def test_connections_failure_reports_previous_results(mocked_connections, capfd):
+    """
+    Test : A failing connection reports the connections changed before
+    """
+    execute_command = nmcli.Nmcli.execute_command.side_effect
+
+    def fail_second(cmd, **kwargs):
+        if 'failing_nw_device' in cmd:
+            return 1, '', 'failed to add'
+        return execute_command(cmd, **kwargs)
+
+    nmcli.Nmcli.execute_command.side_effect = fail_second
+
+    with pytest.raises(SystemExit):
+        nmcli.main()
+
+    out, err = capfd.readouterr()
+    results = json.loads(out)
+    assert results['failed']
+    assert results['name'] == 'failing_nw_device'
+    assert results['changed']
+    assert [(result['conn_name'], result['changed']) for result in results['connections']] == [('new_nw_device', True)]
+    assert not any('third_nw_device' in call[0][0] for call in nmcli.Nmcli.execute_command.call_args_list)
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+import json
+
+import pytest
+
+from ansible.errors import AnsibleError
+
+from ansible_collections.community.general.plugins.plugin_utils.cache_codec import (
+    HAS_LZMA,
+    check_compression,
+    decode_value,
+    encode_value,
+)
+
+
+FACTS = {
+    'ansible_hostname': 'host1',
+    'ansible_mounts': [{'mount': '/mnt/%d' % i, 'size_total': i * 1024} for i in range(100)],
+}
+
+
+@pytest.mark.parametrize('compression', ['none', 'zlib', 'lzma'])
+def test_roundtrip(compression):
+    if compression == 'lzma' and not HAS_LZMA:
+        pytest.skip('lzma is not available')
+    data = encode_value(FACTS, compression)
+    assert decode_value(data) == FACTS
+    if compression != 'none':
+        assert len(data) < len(encode_value(FACTS))
+
+
+def test_compact_json():
+    data = encode_value({'b': [1, 2], 'a': 'x'})
+    assert data == b'\x01{"a":"x","b":[1,2]}'
+
+
+def test_compression_threshold():
+    data = encode_value({'a': 'x'}, 'zlib', compression_threshold=1024)
+    assert data == b'\x01{"a":"x"}'
+
+
+@pytest.mark.parametrize('data', [
+    json.dumps(FACTS, sort_keys=True, indent=4),
+    json.dumps(FACTS, sort_keys=True, indent=4).encode('utf-8'),
+])
+def test_decode_legacy(data):
+    assert decode_value(data) == FACTS
+
+
+def test_check_compression():
+    check_compression('none')
+    with pytest.raises(AnsibleError):
+        check_compression('bzip2')
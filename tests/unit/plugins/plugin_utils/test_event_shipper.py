@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+from ansible_collections.community.general.plugins.plugin_utils.event_shipper import EventShipper
+
+
+def test_batches_by_size():
+    batches = []
+    shipper = EventShipper(batches.append, max_events=100, max_bytes=10, flush_interval=60)
+    for event in ('aaaa', 'bbbb', 'cccc', 'dddd'):
+        shipper.put(event)
+    shipper.close()
+    assert batches == [['aaaa', 'bbbb'], ['cccc', 'dddd']]
+    assert shipper.sent == 4
+
+
+def test_flush_interval():
+    batches = []
+    shipper = EventShipper(batches.append, flush_interval=0)
+    shipper.put('a')
+    shipper.close()
+    shipper.put('b')
+    shipper.close()
+    assert batches == [['a'], ['b']]
+
+
+def test_retry():
+    attempts = []
+
+    def send_batch(events):
+        attempts.append(events)
+        if len(attempts) < 3:
+            raise ConnectionError('unavailable')
+
+    shipper = EventShipper(send_batch, retries=2, retry_delay=0)
+    shipper.put('a')
+    shipper.close()
+    assert attempts == [['a'], ['a'], ['a']]
+    assert shipper.sent == 1
+    assert shipper.dropped == 0
+
+
+def test_drop_after_retries():
+    def send_batch(events):
+        raise ConnectionError('unavailable')
+
+    shipper = EventShipper(send_batch, retries=1, retry_delay=0)
+    shipper.put('a')
+    shipper.put('b')
+    shipper.close()
+    assert shipper.sent == 0
+    assert shipper.dropped == 2
+
+
+def test_event_size():
+    batches = []
+    shipper = EventShipper(batches.append, max_bytes=10, flush_interval=60)
+    shipper.put(('a', {'meta': 1}), size=6)
+    shipper.put(('b', {'meta': 2}), size=6)
+    shipper.close()
+    assert batches == [[('a', {'meta': 1})], [('b', {'meta': 2})]]
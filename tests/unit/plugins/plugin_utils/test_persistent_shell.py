@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2026 Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+# Make coding more python3-ish
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+
+from ansible_collections.community.general.plugins.plugin_utils.persistent_shell import PersistentShell
+
+
+def test_run_commands():
+    shell = PersistentShell(['/bin/sh'])
+    try:
+        assert shell.run('echo out; echo err >&2') == (0, b'out\n', b'err\n')
+        process = shell._process
+        assert shell.run('printf "no newline"; exit 3') == (3, b'no newline', b'')
+        assert shell.run("cd /tmp && echo 'a b' && cat") == (0, b'a b\n', b'')
+        # Exiting or changing the directory in a command does not affect the shell
+        assert shell.run('cd / && pwd') == (0, b'/\n', b'')
+        assert shell.run('pwd') == (0, os.getcwd().encode() + b'\n', b'')
+        assert shell._process is process
+    finally:
+        shell.close()
+
+
+def test_large_output():
+    shell = PersistentShell(['/bin/sh'])
+    try:
+        rc, stdout, stderr = shell.run('i=0; while [ $i -lt 20000 ]; do echo "line $i"; echo "error $i" >&2; i=$((i+1)); done')
+        assert rc == 0
+        assert stdout.count(b'\n') == 20000
+        assert stderr.count(b'\n') == 20000
+    finally:
+        shell.close()
+
+
+def test_shell_exits():
+    shell = PersistentShell(['/bin/sh', '-c', 'echo failed to start >&2; exit 1'])
+    assert shell.run('echo out') == (1, b'', b'failed to start\n')
+    assert not shell.running